@@ -0,0 +1,265 @@
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+
+
+def normalizar_numero(valor):
+    """
+    Devuelve una representación textual única de un número (1, 1.0 y -0.0 + 1 coinciden).
+
+    :param valor: Número entero o flotante.
+    :return: Cadena con la representación normalizada.
+    """
+    return repr(float(valor) + 0.0)
+
+
+def normalizar_fila(coeficientes, signo):
+    """
+    Representa los coeficientes de una restricción como pares (índice, valor) no nulos, de
+    modo que una fila densa y su equivalente dispersa {índice: valor} coincidan.
+
+    :param coeficientes: Lista densa de coeficientes o diccionario {índice: coeficiente}.
+    :param signo: Signo por el que se multiplican los coeficientes.
+    :return: Lista de pares [índice, valor normalizado].
+    """
+    if isinstance(coeficientes, dict):
+        pares = sorted((int(k), v) for k, v in coeficientes.items())
+    else:
+        pares = enumerate(coeficientes)
+    return [[i, normalizar_numero(signo * v)] for i, v in pares if v != 0]
+
+
+def normalizar_monomios(monomios, signo):
+    """
+    Representa una lista de monomios {'coeficiente', 'exponentes'} de forma independiente
+    del orden de los monomios y de las variables.
+
+    :param monomios: Lista de monomios del formato de 'npl.polinomios_npl'.
+    :param signo: Signo por el que se multiplican los coeficientes.
+    :return: Lista ordenada de pares [coeficiente normalizado, [[índice, exponente], ...]].
+    """
+    normalizados = []
+    for monomio in monomios:
+        exponentes = sorted((int(i), normalizar_numero(e)) for i, e in monomio["exponentes"].items() if e != 0)
+        normalizados.append([normalizar_numero(signo * monomio["coeficiente"]), exponentes])
+    return sorted(normalizados, key=lambda m: (m[1], m[0]))
+
+
+def canonizar_datos(clase, datos_optimizacion):
+    """
+    Convierte los datos del problema a una forma canónica. Las restricciones '>=' se
+    multiplican por -1 para convertirlas en '<=', igual que en optimizacion_pl.
+
+    :param clase: 'pl' o 'npl'.
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :return: Tupla (estructura canónica serializable, signos aplicados a cada restricción).
+    """
+    if clase == "pl":
+        objetivo = [normalizar_numero(v) for v in datos_optimizacion["variables"]]
+    elif clase == "npl" and "monomios_objetivo" in datos_optimizacion:
+        objetivo = ["monomios", int(datos_optimizacion["num_variables"]),
+                    normalizar_monomios(datos_optimizacion["monomios_objetivo"], 1)]
+    elif clase == "npl":
+        objetivo = [[normalizar_numero(v) for v in datos_optimizacion["coeficientes_objetivo"]],
+                    [normalizar_numero(v) for v in datos_optimizacion["exponentes_objetivo"]]]
+    else:
+        raise ValueError(f"Clase de problema no válida: {clase}")
+
+    filas = []
+    signos = []
+    for restriccion in datos_optimizacion["restricciones"]:
+        operador = restriccion["operador"]
+        signo = -1 if operador == ">=" else 1
+        if "monomios" in restriccion:
+            filas.append(["<=", ["monomios", normalizar_monomios(restriccion["monomios"], signo)],
+                          normalizar_numero(signo * restriccion["resultado"])])
+            signos.append(signo)
+            continue
+        fila = [
+            "=" if operador == "=" else "<=",
+            normalizar_fila(restriccion["coeficientes"], signo),
+            normalizar_numero(signo * restriccion["resultado"]),
+        ]
+        if "exponentes" in restriccion:
+            fila.append([normalizar_numero(v) for v in restriccion["exponentes"]])
+        filas.append(fila)
+        signos.append(signo)
+
+    canonico = [clase, datos_optimizacion["tipo_problema"], objetivo, filas]
+    # Solo se añade si hay enteras, para conservar las claves ya guardadas de los continuos
+    enteras = [i for i, entera in enumerate(datos_optimizacion.get("enteras") or []) if entera]
+    if enteras:
+        canonico.append(["enteras", enteras])
+    return canonico, signos
+
+
+def clave_problema(clase, datos_optimizacion, **opciones):
+    """
+    Calcula la clave de caché de un problema como el hash de su forma canónica.
+
+    :param clase: 'pl' o 'npl'.
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param opciones: Parámetros adicionales del resolvedor que afectan al resultado.
+    :return: Tupla (clave hexadecimal, signos aplicados a cada restricción).
+    """
+    canonico, signos = canonizar_datos(clase, datos_optimizacion)
+    opciones_normalizadas = sorted((k, repr(v)) for k, v in opciones.items())
+    texto = json.dumps([canonico, opciones_normalizadas], separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest(), signos
+
+
+def ajustar_duales(resultado, signos):
+    """
+    Cambia el signo de los duales de las restricciones volteadas. La misma función sirve
+    para pasar a la forma canónica y para deshacerlo, porque los signos son ±1.
+
+    :param resultado: Diccionario de resultado (se modifica en el lugar).
+    :param signos: Signos aplicados a cada restricción.
+    :return: El mismo diccionario de resultado.
+    """
+    if resultado.get("duales") is not None:
+        resultado["duales"] = resultado["duales"] * signos
+    return resultado
+
+
+class CacheOptimizacion:
+    """
+    Caché de resultados de optimización con un nivel en memoria (LRU con tamaño máximo)
+    y un nivel opcional en disco (SQLite) que sobrevive a los reinicios.
+    """
+
+    def __init__(self, tamano_maximo=1024, ruta_disco=None):
+        """
+        :param tamano_maximo: Número máximo de resultados guardados en memoria.
+        :param ruta_disco: Ruta del archivo SQLite; None desactiva el nivel en disco.
+        """
+        self.tamano_maximo = tamano_maximo
+        self.memoria = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+        self.bloqueo = threading.Lock()
+        self.conexion = None
+
+        if ruta_disco is not None:
+            self.conexion = sqlite3.connect(ruta_disco, check_same_thread=False)
+            self.conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados (clave TEXT PRIMARY KEY, valor BLOB)"
+            )
+            self.conexion.commit()
+
+    def obtener(self, clave):
+        """
+        Busca un resultado en memoria y, si no está, en disco.
+
+        :param clave: Clave calculada con 'clave_problema'.
+        :return: Copia del resultado guardado o None si no existe.
+        """
+        with self.bloqueo:
+            if clave in self.memoria:
+                self.memoria.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(self.memoria[clave])
+
+            if self.conexion is not None:
+                fila = self.conexion.execute(
+                    "SELECT valor FROM resultados WHERE clave = ?", (clave,)
+                ).fetchone()
+                if fila is not None:
+                    resultado = pickle.loads(fila[0])
+                    self.guardar_en_memoria(clave, resultado)
+                    self.aciertos += 1
+                    return copy.deepcopy(resultado)
+
+            self.fallos += 1
+            return None
+
+    def guardar(self, clave, resultado):
+        """
+        Guarda un resultado en memoria y, si está configurado, en disco.
+
+        :param clave: Clave calculada con 'clave_problema'.
+        :param resultado: Diccionario de resultado a guardar.
+        """
+        resultado = copy.deepcopy(resultado)
+        with self.bloqueo:
+            self.guardar_en_memoria(clave, resultado)
+            if self.conexion is not None:
+                self.conexion.execute(
+                    "INSERT OR REPLACE INTO resultados (clave, valor) VALUES (?, ?)",
+                    (clave, pickle.dumps(resultado))
+                )
+                self.conexion.commit()
+
+    def guardar_en_memoria(self, clave, resultado):
+        # Inserta en el LRU y descarta la entrada menos usada si se supera el tamaño
+        self.memoria[clave] = resultado
+        self.memoria.move_to_end(clave)
+        while len(self.memoria) > self.tamano_maximo:
+            self.memoria.popitem(last=False)
+
+    def limpiar(self):
+        """
+        Elimina todos los resultados guardados en memoria y en disco.
+        """
+        with self.bloqueo:
+            self.memoria.clear()
+            if self.conexion is not None:
+                self.conexion.execute("DELETE FROM resultados")
+                self.conexion.commit()
+
+
+def se_puede_guardar(resultado):
+    """
+    Indica si un resultado es definitivo y puede guardarse en la caché. No lo son los
+    errores de datos (baratos de detectar), las búsquedas canceladas ni los problemas
+    enteros detenidos por el límite de tiempo, que con más tiempo podrían mejorar.
+
+    :param resultado: Diccionario de resultado del resolvedor.
+    :return: True si el resultado puede guardarse.
+    """
+    return (resultado["estado"] not in ("error", "limite_tiempo")
+            and resultado.get("motivo_parada") != "cancelado")
+
+
+def resolver_en_cache(clase, datos_optimizacion, funcion_resolver, cache, **opciones):
+    """
+    Devuelve el resultado guardado para el problema o lo resuelve y lo guarda.
+
+    :param clase: 'pl' o 'npl'.
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param funcion_resolver: Función que recibe los datos (y las opciones) y devuelve el resultado.
+    :param cache: Instancia de CacheOptimizacion; None desactiva la caché.
+    :param opciones: Parámetros adicionales para la función de resolución.
+    :return: Diccionario de resultado; incluye 'desde_cache' indicando si hubo acierto.
+    """
+    if cache is None:
+        resultado = funcion_resolver(datos_optimizacion, **opciones)
+        resultado["desde_cache"] = False
+        return resultado
+
+    inicio = time.perf_counter()
+    try:
+        clave, signos = clave_problema(clase, datos_optimizacion, **opciones)
+    except (KeyError, TypeError, ValueError):
+        # Datos mal formados: dejar que el resolvedor informe el error
+        resultado = funcion_resolver(datos_optimizacion, **opciones)
+        resultado["desde_cache"] = False
+        return resultado
+
+    resultado = cache.obtener(clave)
+    if resultado is not None:
+        resultado = ajustar_duales(resultado, signos)
+        resultado["tiempo"] = time.perf_counter() - inicio
+        resultado["desde_cache"] = True
+        return resultado
+
+    resultado = funcion_resolver(datos_optimizacion, **opciones)
+    if se_puede_guardar(resultado):
+        cache.guardar(clave, ajustar_duales(dict(resultado), signos))
+    resultado["desde_cache"] = False
+    return resultado
@@ -0,0 +1,324 @@
+import csv
+import json
+import os
+
+# Operadores de las filas de un archivo MPS y su equivalente en datos_optimizacion
+OPERADORES_MPS = {"L": "<=", "G": ">=", "E": "="}
+# Operadores que admite cada clase de problema; los no lineales no aceptan igualdades
+OPERADORES_VALIDOS = {"pl": ("<=", ">=", "="), "npl": ("<=", ">=")}
+
+
+def detectar_formato(ruta):
+    """
+    Determina el formato de un archivo de modelo a partir de su extensión.
+
+    :param ruta: Ruta del archivo.
+    :return: 'json', 'jsonl', 'csv' o 'mps'.
+    :raises ValueError: Si la extensión no es reconocida.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    formatos = {".json": "json", ".jsonl": "jsonl", ".csv": "csv", ".mps": "mps"}
+    if extension not in formatos:
+        raise ValueError(f"Formato de archivo no reconocido: {extension}")
+    return formatos[extension]
+
+
+def detectar_clase(datos_optimizacion):
+    """
+    Determina si los datos corresponden a un problema lineal o no lineal.
+
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :return: 'pl' o 'npl'.
+    :raises ValueError: Si los datos indican una clase desconocida.
+    """
+    if "clase" in datos_optimizacion:
+        if datos_optimizacion["clase"] not in OPERADORES_VALIDOS:
+            raise ValueError(f"Clase de problema no válida: {datos_optimizacion['clase']!r}")
+        return datos_optimizacion["clase"]
+    no_lineal = "coeficientes_objetivo" in datos_optimizacion or "monomios_objetivo" in datos_optimizacion
+    return "npl" if no_lineal else "pl"
+
+
+def convertir_numero(texto, linea):
+    """
+    Convierte un campo de texto en número, indicando la línea en caso de error.
+
+    :param texto: Campo leído del archivo.
+    :param linea: Número de línea, para el mensaje de error.
+    :return: Número flotante.
+    :raises ValueError: Si el campo no es numérico.
+    """
+    try:
+        return float(texto)
+    except ValueError:
+        raise ValueError(f"Valor numérico no válido en la línea {linea}: {texto!r}")
+
+
+def validar_restriccion(restriccion, clase, num_variables, linea):
+    """
+    Comprueba que una restricción leída tenga el formato de datos_optimizacion.
+
+    :param restriccion: Diccionario de la restricción leída.
+    :param clase: 'pl' o 'npl'.
+    :param num_variables: Número de variables del problema.
+    :param linea: Número de línea, para el mensaje de error.
+    :raises ValueError: Si la restricción no es válida.
+    """
+    if restriccion.get("operador") not in OPERADORES_VALIDOS[clase]:
+        raise ValueError(f"Operador no válido en la línea {linea}: {restriccion.get('operador')!r}")
+    if clase == "npl" and "monomios" in restriccion:
+        for monomio in restriccion["monomios"]:
+            if any(not 0 <= int(i) < num_variables for i in monomio["exponentes"]):
+                raise ValueError(f"Variable inexistente en un monomio de la línea {linea}.")
+        return
+    coeficientes = restriccion.get("coeficientes")
+    if not isinstance(coeficientes, dict) and len(coeficientes) != num_variables:
+        raise ValueError(f"Número de coeficientes incorrecto en la línea {linea}.")
+    if clase == "npl" and len(restriccion.get("exponentes", [])) != num_variables:
+        raise ValueError(f"Número de exponentes incorrecto en la línea {linea}.")
+
+
+def cargar_json(ruta):
+    """
+    Lee un modelo guardado como un único objeto JSON con el formato de datos_optimizacion.
+
+    :param ruta: Ruta del archivo.
+    :return: Tupla (clase, datos_optimizacion).
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    clase = detectar_clase(datos)
+    if clase == "npl" and "num_variables" in datos:
+        num_variables = int(datos["num_variables"])
+    else:
+        num_variables = len(datos["variables" if clase == "pl" else "coeficientes_objetivo"])
+    for i, restriccion in enumerate(datos.get("restricciones", []), start=1):
+        validar_restriccion(restriccion, clase, num_variables, i)
+    return clase, datos
+
+
+def cargar_jsonl(ruta):
+    """
+    Lee un modelo en JSON Lines: la primera línea contiene todo salvo las restricciones
+    y cada línea siguiente es una restricción, de modo que se procesa fila por fila.
+
+    :param ruta: Ruta del archivo.
+    :return: Tupla (clase, datos_optimizacion).
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.loads(archivo.readline())
+        clase = detectar_clase(datos)
+        if clase == "npl" and "num_variables" in datos:
+            num_variables = int(datos["num_variables"])
+        else:
+            num_variables = len(datos["variables" if clase == "pl" else "coeficientes_objetivo"])
+        restricciones = []
+        for linea, texto in enumerate(archivo, start=2):
+            if not texto.strip():
+                continue
+            restriccion = json.loads(texto)
+            validar_restriccion(restriccion, clase, num_variables, linea)
+            restricciones.append(restriccion)
+    datos["restricciones"] = restricciones
+    return clase, datos
+
+
+def cargar_csv(ruta):
+    """
+    Lee un modelo en CSV, procesando una restricción por fila.
+
+    Formato lineal:     'pl,max' / 'c1,...,cn' / 'a1,...,an,<=,b' por restricción.
+    Formato no lineal:  'npl,max' / 'c1,...,cn,e1,...,en' / 'a1,...,an,e1,...,en,<=,b'.
+
+    :param ruta: Ruta del archivo.
+    :return: Tupla (clase, datos_optimizacion).
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.reader(archivo)
+        encabezado = [campo.strip() for campo in next(lector)]
+        if len(encabezado) < 2 or encabezado[0] not in ("pl", "npl"):
+            raise ValueError("La primera línea debe indicar la clase y el tipo, por ejemplo 'pl,max'.")
+        clase, tipo_problema = encabezado[0], encabezado[1]
+
+        objetivo = [convertir_numero(campo, 2) for campo in next(lector)]
+        if clase == "pl":
+            num_variables = len(objetivo)
+            datos = {"tipo_problema": tipo_problema, "variables": objetivo}
+        else:
+            if len(objetivo) % 2:
+                raise ValueError("La función objetivo no lineal necesita un exponente por coeficiente.")
+            num_variables = len(objetivo) // 2
+            datos = {
+                "tipo_problema": tipo_problema,
+                "coeficientes_objetivo": objetivo[:num_variables],
+                "exponentes_objetivo": objetivo[num_variables:],
+            }
+
+        restricciones = []
+        columnas_esperadas = (1 if clase == "pl" else 2) * num_variables + 2
+        for linea, fila in enumerate(lector, start=3):
+            if not fila:
+                continue
+            if len(fila) != columnas_esperadas:
+                raise ValueError(f"Se esperaban {columnas_esperadas} columnas en la línea {linea}.")
+            valores = [convertir_numero(campo, linea) for campo in fila[:num_variables]]
+            restriccion = {
+                "coeficientes": valores,
+                "operador": fila[-2].strip(),
+                "resultado": convertir_numero(fila[-1], linea),
+            }
+            if clase == "npl":
+                restriccion["exponentes"] = [convertir_numero(campo, linea)
+                                             for campo in fila[num_variables:2 * num_variables]]
+            validar_restriccion(restriccion, clase, num_variables, linea)
+            restricciones.append(restriccion)
+
+    datos["restricciones"] = restricciones
+    return clase, datos
+
+
+def cargar_mps(ruta):
+    """
+    Lee un modelo lineal en formato MPS libre (secciones NAME, OBJSENSE, ROWS, COLUMNS,
+    RHS, BOUNDS y ENDATA). Las restricciones se guardan como diccionarios dispersos
+    {índice de variable: coeficiente}, por lo que la memoria crece con los no nulos.
+    Solo se admiten límites que mantengan las variables no negativas y sin cota superior.
+    Las columnas entre los marcadores 'INTORG' e 'INTEND' se marcan como enteras en
+    'enteras' (también sin cota superior, aunque algunos lectores las supongan binarias).
+
+    :param ruta: Ruta del archivo.
+    :return: Tupla (clase, datos_optimizacion).
+    """
+    tipo_problema = "min"
+    fila_objetivo = None
+    indice_fila = {}
+    restricciones = []
+    indice_variable = {}
+    objetivo = []
+    enteras = []
+    en_enteras = False
+    seccion = None
+
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea, texto in enumerate(archivo, start=1):
+            if not texto.strip() or texto.startswith("*"):
+                continue
+            campos = texto.split()
+
+            # Las líneas que no empiezan con espacio abren una sección
+            if not texto[0].isspace():
+                seccion = campos[0].upper()
+                if seccion == "OBJSENSE" and len(campos) > 1:
+                    tipo_problema = "max" if campos[1].upper().startswith("MAX") else "min"
+                elif seccion == "ENDATA":
+                    break
+                elif seccion not in ("NAME", "OBJSENSE", "ROWS", "COLUMNS", "RHS", "BOUNDS"):
+                    raise ValueError(f"Sección MPS no soportada en la línea {linea}: {seccion}")
+                continue
+
+            if seccion == "OBJSENSE":
+                tipo_problema = "max" if campos[0].upper().startswith("MAX") else "min"
+            elif seccion == "ROWS":
+                tipo_fila, nombre = campos[0].upper(), campos[1]
+                if tipo_fila == "N":
+                    if fila_objetivo is None:
+                        fila_objetivo = nombre
+                elif tipo_fila in OPERADORES_MPS:
+                    indice_fila[nombre] = len(restricciones)
+                    restricciones.append({
+                        "coeficientes": {},
+                        "operador": OPERADORES_MPS[tipo_fila],
+                        "resultado": 0.0,
+                    })
+                else:
+                    raise ValueError(f"Tipo de fila MPS no válido en la línea {linea}: {tipo_fila}")
+            elif seccion == "COLUMNS":
+                if "'MARKER'" in campos:
+                    marcador = campos[-1].upper()
+                    if marcador not in ("'INTORG'", "'INTEND'"):
+                        raise ValueError(f"Marcador MPS no válido en la línea {linea}: {campos[-1]}")
+                    en_enteras = marcador == "'INTORG'"
+                    continue
+                nombre_variable = campos[0]
+                if nombre_variable not in indice_variable:
+                    indice_variable[nombre_variable] = len(objetivo)
+                    objetivo.append(0.0)
+                    enteras.append(en_enteras)
+                j = indice_variable[nombre_variable]
+                for nombre_fila, valor in zip(campos[1::2], campos[2::2]):
+                    valor = convertir_numero(valor, linea)
+                    if nombre_fila == fila_objetivo:
+                        objetivo[j] = valor
+                    elif nombre_fila in indice_fila:
+                        restricciones[indice_fila[nombre_fila]]["coeficientes"][j] = valor
+                    else:
+                        raise ValueError(f"Fila desconocida en la línea {linea}: {nombre_fila}")
+            elif seccion == "RHS":
+                # El primer campo es el nombre del vector RHS, salvo que se haya omitido
+                pares = campos[1:] if len(campos) % 2 else campos
+                for nombre_fila, valor in zip(pares[0::2], pares[1::2]):
+                    if nombre_fila in indice_fila:
+                        restricciones[indice_fila[nombre_fila]]["resultado"] = convertir_numero(valor, linea)
+            elif seccion == "BOUNDS":
+                tipo_limite = campos[0].upper()
+                valor = convertir_numero(campos[3], linea) if len(campos) > 3 else 0.0
+                if not (tipo_limite == "PL" or (tipo_limite == "LO" and valor == 0)):
+                    raise ValueError(f"Límite MPS no soportado en la línea {linea}: {tipo_limite}")
+
+    datos = {
+        "tipo_problema": tipo_problema,
+        "variables": objetivo,
+        "restricciones": restricciones,
+    }
+    if any(enteras):
+        datos["enteras"] = enteras
+    return "pl", datos
+
+
+def cargar_modelo(ruta, formato=None):
+    """
+    Carga un problema lineal o no lineal desde un archivo al formato de datos_optimizacion,
+    sin pasar por los campos del formulario y sin sus límites de variables y restricciones.
+
+    :param ruta: Ruta del archivo.
+    :param formato: 'json', 'jsonl', 'csv' o 'mps'; si es None se deduce de la extensión.
+    :return: Tupla (clase, datos_optimizacion) con clase 'pl' o 'npl'.
+    :raises ValueError: Si el archivo no tiene un formato válido.
+    """
+    formato = formato or detectar_formato(ruta)
+    cargadores = {
+        "json": cargar_json,
+        "jsonl": cargar_jsonl,
+        "csv": cargar_csv,
+        "mps": cargar_mps,
+    }
+    if formato not in cargadores:
+        raise ValueError(f"Formato de archivo no reconocido: {formato}")
+
+    clase, datos = cargadores[formato](ruta)
+    datos.pop("clase", None)
+
+    if datos.get("tipo_problema") not in ("max", "min"):
+        raise ValueError("Tipo de problema no válido. Debe ser 'max' o 'min'.")
+    return clase, datos
+
+
+def densificar_restricciones(datos_optimizacion, num_variables):
+    """
+    Devuelve una copia de los datos con las restricciones dispersas convertidas a listas,
+    el formato que esperan las funciones de graficación.
+
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param num_variables: Número de variables del problema.
+    :return: Nuevo diccionario con todas las restricciones en forma densa.
+    """
+    restricciones = []
+    for restriccion in datos_optimizacion["restricciones"]:
+        coeficientes = restriccion["coeficientes"]
+        if isinstance(coeficientes, dict):
+            densos = [0.0] * num_variables
+            for indice, valor in coeficientes.items():
+                densos[int(indice)] = valor
+            restriccion = dict(restriccion, coeficientes=densos)
+        restricciones.append(restriccion)
+    return dict(datos_optimizacion, restricciones=restricciones)
@@ -0,0 +1,79 @@
+import time
+
+
+def buscar_conflicto(num_restricciones, es_factible, candidatos=None, verificar=False):
+    """
+    Busca un subconjunto irreducible de restricciones infactible (IIS): un conjunto que no
+    admite solución pero del que basta quitar cualquier restricción para que sí la admita.
+
+    Las restricciones se descartan por mitades (bisección de QuickXplain): si un grupo
+    puede quitarse sin recuperar la factibilidad se elimina entero con una sola resolución,
+    de modo que hacen falta del orden de k·log(m/k) resoluciones para un conflicto de k
+    restricciones entre m, en lugar de una por restricción.
+
+    :param num_restricciones: Número de restricciones del problema.
+    :param es_factible: Función que recibe una lista de índices de restricciones y devuelve
+                        True si el problema restringido a ellas tiene solución.
+    :param candidatos: Índices entre los que buscar, si ya se sabe que son infactibles juntos;
+                       por defecto, todas las restricciones.
+    :param verificar: Si es True, el conflicto encontrado se repasa quitando las restricciones
+                      de una en una (filtro de eliminación), lo que garantiza que cada una es
+                      necesaria aunque 'es_factible' no sea monótona, como ocurre con
+                      resolvedores locales.
+    :return: Diccionario con 'restricciones' (índices en orden creciente, o None si el
+             problema completo resultó factible), 'resoluciones' y 'tiempo' en segundos.
+    """
+    inicio = time.perf_counter()
+    resoluciones = 0
+
+    def factible(indices):
+        nonlocal resoluciones
+        resoluciones += 1
+        return es_factible(sorted(indices))
+
+    def separar(fondo, agregadas, candidatas):
+        # Devuelve el subconjunto mínimo de 'candidatas' que, junto con 'fondo', es infactible
+        if agregadas and not factible(fondo):
+            return []
+        if len(candidatas) == 1:
+            return candidatas
+        mitad = len(candidatas) // 2
+        primera, segunda = candidatas[:mitad], candidatas[mitad:]
+        conflicto_segunda = separar(fondo + primera, primera, segunda)
+        conflicto_primera = separar(fondo + conflicto_segunda, conflicto_segunda, primera)
+        return conflicto_primera + conflicto_segunda
+
+    if candidatos is None:
+        candidatos = list(range(num_restricciones))
+    else:
+        candidatos = sorted(candidatos)
+
+    if not candidatos or factible(candidatos):
+        return {"restricciones": None, "resoluciones": resoluciones,
+                "tiempo": time.perf_counter() - inicio}
+
+    conflicto = separar([], [], candidatos)
+
+    if verificar:
+        for indice in list(conflicto):
+            resto = [i for i in conflicto if i != indice]
+            if not factible(resto):
+                conflicto = resto
+
+    return {"restricciones": sorted(conflicto), "resoluciones": resoluciones,
+            "tiempo": time.perf_counter() - inicio}
+
+
+def describir_conflicto(resultado):
+    """
+    Redacta el mensaje de un problema sin solución, con las restricciones en conflicto si
+    el resultado las incluye.
+
+    :param resultado: Diccionario de resultado con la clave opcional 'conflicto'.
+    :return: Texto del mensaje; las restricciones se numeran desde 1, como en el formulario.
+    """
+    mensaje = "No se encontró una solución óptima."
+    if resultado.get("conflicto"):
+        numeros = ", ".join(str(i + 1) for i in resultado["conflicto"])
+        mensaje += f"\nEl problema es infactible; restricciones en conflicto: {numeros}."
+    return mensaje
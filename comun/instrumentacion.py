@@ -0,0 +1,131 @@
+"""
+Instrumentación ligera de los resolvedores: tiempo por fase (construcción del modelo,
+resolución, graficación) y número de evaluaciones de cada función.
+
+Solo se mide mientras hay una sesión abierta con 'sesion_instrumentacion'. Sin sesión,
+'medir' devuelve un contexto vacío compartido e 'instrumentar' devuelve la misma función
+sin envolver, así que el coste con la instrumentación desactivada es prácticamente nulo.
+"""
+import cProfile
+import contextlib
+import threading
+import time
+
+# Sesión en curso; None cuando la instrumentación está desactivada
+sesion_activa = None
+
+# Contexto vacío que se devuelve cuando no hay sesión
+CONTEXTO_VACIO = contextlib.nullcontext()
+
+
+class Instrumentacion:
+    """
+    Datos recogidos durante una sesión. Se comparte entre hilos, así que las
+    actualizaciones se hacen con un cerrojo.
+    """
+
+    def __init__(self, ruta_perfil=None):
+        """
+        :param ruta_perfil: Archivo donde guardar el perfil de cProfile al cerrar la sesión;
+                            si es None no se perfila.
+        """
+        self.fases = {}
+        self.contadores = {}
+        self.ruta_perfil = ruta_perfil
+        self.perfilador = cProfile.Profile() if ruta_perfil else None
+        self.cerrojo = threading.Lock()
+
+    @contextlib.contextmanager
+    def medir(self, fase):
+        """
+        Acumula el tiempo transcurrido dentro del bloque en la fase indicada.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            transcurrido = time.perf_counter() - inicio
+            with self.cerrojo:
+                datos = self.fases.setdefault(fase, {"tiempo": 0.0, "llamadas": 0})
+                datos["tiempo"] += transcurrido
+                datos["llamadas"] += 1
+
+    def contar(self, nombre, cantidad=1):
+        with self.cerrojo:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def como_dict(self):
+        """
+        :return: Diccionario con 'fases' ({fase: {'tiempo', 'llamadas'}}), 'contadores'
+                 ({función: evaluaciones}) y 'perfil' (ruta del volcado de cProfile o None).
+        """
+        with self.cerrojo:
+            return {
+                "fases": {fase: dict(datos) for fase, datos in self.fases.items()},
+                "contadores": dict(self.contadores),
+                "perfil": self.ruta_perfil,
+            }
+
+
+@contextlib.contextmanager
+def sesion_instrumentacion(ruta_perfil=None):
+    """
+    Activa la instrumentación durante el bloque.
+
+    Uso:
+        with sesion_instrumentacion() as datos:
+            resolver(datos_optimizacion)
+        print(datos.como_dict())
+
+    :param ruta_perfil: Archivo donde volcar las estadísticas de cProfile (legibles con
+                        pstats o snakeviz); si es None no se perfila.
+    :return: Objeto Instrumentacion con los datos recogidos.
+    """
+    global sesion_activa
+    anterior = sesion_activa
+    sesion = Instrumentacion(ruta_perfil)
+    sesion_activa = sesion
+    if sesion.perfilador is not None:
+        sesion.perfilador.enable()
+    try:
+        yield sesion
+    finally:
+        if sesion.perfilador is not None:
+            sesion.perfilador.disable()
+            sesion.perfilador.dump_stats(ruta_perfil)
+        sesion_activa = anterior
+
+
+def medir(fase):
+    """
+    Contexto que mide una fase si hay una sesión activa.
+
+    :param fase: Nombre de la fase ('construccion', 'resolucion', 'graficacion', ...).
+    :return: Gestor de contexto.
+    """
+    sesion = sesion_activa
+    if sesion is None:
+        return CONTEXTO_VACIO
+    return sesion.medir(fase)
+
+
+def instrumentar(funcion, nombre):
+    """
+    Envuelve una función para contar sus llamadas si hay una sesión activa al construirla.
+
+    La decisión se toma al construir el modelo: sin sesión se devuelve la función original,
+    de modo que las evaluaciones dentro del optimizador no pagan ningún coste adicional.
+
+    :param funcion: Función a envolver (objetivo, gradiente, restricción...).
+    :param nombre: Nombre del contador.
+    :return: La función original o una envoltura que cuenta las llamadas.
+    """
+    sesion = sesion_activa
+    if sesion is None:
+        return funcion
+
+    def funcion_contada(*args, **kwargs):
+        sesion.contar(nombre)
+        return funcion(*args, **kwargs)
+
+    return funcion_contada
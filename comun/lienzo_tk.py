@@ -0,0 +1,120 @@
+import tkinter as tk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+
+class LienzoGrafico:
+    """
+    Figura de matplotlib persistente embebida en una ventana secundaria de Tk.
+
+    La figura no se registra en pyplot, así que no se acumulan figuras entre resoluciones.
+    Las funciones de graficación guardan sus artistas en 'artistas' y, mientras la
+    estructura del gráfico no cambie, actualizan sus datos en lugar de crearlos de nuevo.
+    """
+
+    def __init__(self, root, titulo="Gráfica", tamano=(7, 5.5)):
+        """
+        :param root: Ventana principal de la que depende la ventana de la gráfica.
+        :param titulo: Título de la ventana de la gráfica.
+        :param tamano: Tamaño de la figura en pulgadas.
+        """
+        self.root = root
+        self.titulo = titulo
+        self.figura = Figure(figsize=tamano)
+        self.ventana = None
+        self.canvas = None
+        self.artistas = {}
+        self.estructura = None
+
+    def preparar(self, estructura):
+        """
+        Muestra la ventana (creándola si hace falta) y decide si se pueden reutilizar los artistas.
+
+        :param estructura: Valor que identifica la forma del gráfico (tipo, número de
+                           variables y de restricciones...); si cambia se vacía la figura.
+        :return: True si los artistas del dibujo anterior siguen siendo válidos.
+        """
+        if self.ventana is None or not self.ventana.winfo_exists():
+            self.crear_ventana()
+        else:
+            self.ventana.deiconify()
+
+        if estructura == self.estructura and self.figura.axes:
+            return True
+
+        self.figura.clear()
+        self.artistas = {}
+        self.estructura = estructura
+        return False
+
+    def crear_ventana(self):
+        self.ventana = tk.Toplevel(self.root)
+        self.ventana.title(self.titulo)
+        # Al cerrar la ventana solo se oculta, para conservar la figura y sus artistas
+        self.ventana.protocol("WM_DELETE_WINDOW", self.ventana.withdraw)
+
+        self.canvas = FigureCanvasTkAgg(self.figura, master=self.ventana)
+        NavigationToolbar2Tk(self.canvas, self.ventana).update()
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+    def dibujar(self):
+        """
+        Redibuja la figura en el siguiente ciclo ocioso de Tk.
+        """
+        self.canvas.draw_idle()
+
+    def cerrar(self):
+        if self.ventana is not None and self.ventana.winfo_exists():
+            self.ventana.destroy()
+        self.ventana = None
+        self.estructura = None
+
+
+def actualizar_linea(ax, artistas, clave, x, y, **estilo):
+    """
+    Actualiza los datos de una línea guardada en 'artistas' o la crea si no existe.
+    Con x e y vacíos la línea se oculta.
+
+    :param ax: Ejes en los que se dibuja la línea.
+    :param artistas: Diccionario con los artistas reutilizables del gráfico.
+    :param clave: Clave de la línea en 'artistas'.
+    :param x: Coordenadas x.
+    :param y: Coordenadas y.
+    :param estilo: Argumentos de 'ax.plot' usados al crearla; 'label' se actualiza siempre.
+    :return: La línea.
+    """
+    linea = artistas.get(clave)
+    if linea is None:
+        linea, = ax.plot(x, y, **estilo)
+        artistas[clave] = linea
+    else:
+        linea.set_data(x, y)
+        if "label" in estilo:
+            linea.set_label(estilo["label"])
+    linea.set_visible(len(x) > 0)
+    return linea
+
+
+def quitar_artistas(artistas, clave):
+    """
+    Elimina de la figura los artistas guardados bajo 'clave' (uno o una lista), para los
+    que matplotlib no permite actualizar los datos en el lugar (superficies, contornos, rellenos).
+    """
+    guardados = artistas.pop(clave, None)
+    if guardados is None:
+        return
+    for artista in guardados if isinstance(guardados, list) else [guardados]:
+        artista.remove()
+
+
+def actualizar_leyenda(ax, loc='best'):
+    """
+    Rehace la leyenda solo con los artistas visibles y con etiqueta.
+
+    :param ax: Ejes de la leyenda.
+    :param loc: Ubicación; 'best' recorre todos los datos dibujados, así que con mallas
+                densas conviene fijar una esquina.
+    """
+    manejadores = [a for a in list(ax.get_lines()) + list(ax.patches)
+                   if a.get_visible() and not a.get_label().startswith('_')]
+    ax.legend(handles=manejadores, loc=loc)
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import itertools
+import queue
+import threading
+
+
+class Tarea:
+    """
+    Resolución enviada a segundo plano. Guarda el futuro, los callbacks y el evento de
+    cancelación que la función puede consultar para terminar antes.
+    """
+
+    def __init__(self, identificador, futuro, al_terminar, al_error, al_progreso, evento_cancelacion):
+        self.identificador = identificador
+        self.futuro = futuro
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.al_progreso = al_progreso
+        self.evento_cancelacion = evento_cancelacion
+
+    @property
+    def cancelada(self):
+        return self.evento_cancelacion.is_set()
+
+    def cancelar(self):
+        """
+        Cancela la tarea: si aún no empezó no se ejecuta y, si está en curso, su resultado
+        se descarta (y la función puede detenerse consultando el evento de cancelación).
+        """
+        self.evento_cancelacion.set()
+        self.futuro.cancel()
+
+
+class GestorTareas:
+    """
+    Ejecuta funciones en un grupo de hilos o procesos sin bloquear el bucle de Tk.
+
+    Los callbacks de finalización, error y progreso se ejecutan siempre en el hilo de Tk,
+    porque se despachan desde 'root.after', así que pueden mostrar mensajes y gráficas.
+    """
+
+    def __init__(self, root, max_trabajadores=None, usar_procesos=False, intervalo=50):
+        """
+        :param root: Ventana de Tk en cuyo bucle se ejecutan los callbacks.
+        :param max_trabajadores: Número de hilos o procesos del grupo.
+        :param usar_procesos: Si es True se usa un grupo de procesos (sin informe de progreso).
+        :param intervalo: Milisegundos entre revisiones de las tareas en curso.
+        """
+        self.root = root
+        self.intervalo = intervalo
+        self.usar_procesos = usar_procesos
+        if usar_procesos:
+            self.executor = ProcessPoolExecutor(max_workers=max_trabajadores)
+        else:
+            self.executor = ThreadPoolExecutor(max_workers=max_trabajadores)
+        self.tareas = {}
+        self.mensajes_progreso = queue.Queue()
+        self.contador = itertools.count(1)
+        self.revision_programada = False
+        self.al_cambiar = None
+
+    def enviar(self, funcion, *args, al_terminar=None, al_error=None, al_progreso=None,
+               cancelable=False, **kwargs):
+        """
+        Envía una función a segundo plano.
+
+        :param funcion: Función a ejecutar con args y kwargs.
+        :param al_terminar: Callback que recibe el valor devuelto por la función.
+        :param al_error: Callback que recibe la excepción si la función falla.
+        :param al_progreso: Callback de progreso; si se indica, la función recibe un argumento
+                            'progreso' que puede llamar desde el hilo de trabajo.
+        :param cancelable: Si es True, la función recibe un argumento 'cancelacion' (un
+                           threading.Event) para detenerse antes cuando se cancele la tarea.
+        :return: Objeto Tarea, que permite cancelarla.
+        """
+        identificador = next(self.contador)
+        evento_cancelacion = threading.Event()
+
+        if al_progreso is not None and not self.usar_procesos:
+            kwargs["progreso"] = lambda *datos: self.mensajes_progreso.put((identificador, datos))
+        if cancelable and not self.usar_procesos:
+            kwargs["cancelacion"] = evento_cancelacion
+
+        futuro = self.executor.submit(funcion, *args, **kwargs)
+        tarea = Tarea(identificador, futuro, al_terminar, al_error, al_progreso, evento_cancelacion)
+        self.tareas[identificador] = tarea
+        self.notificar_cambio()
+        self.programar_revision()
+        return tarea
+
+    def pendientes(self):
+        """
+        :return: Número de tareas enviadas que aún no terminaron.
+        """
+        return len(self.tareas)
+
+    def cancelar_todas(self):
+        """
+        Cancela todas las tareas pendientes.
+        """
+        for tarea in list(self.tareas.values()):
+            tarea.cancelar()
+
+    def programar_revision(self):
+        if not self.revision_programada:
+            self.revision_programada = True
+            self.root.after(self.intervalo, self.revisar)
+
+    def revisar(self):
+        """
+        Despacha los mensajes de progreso y los resultados de las tareas terminadas.
+        Se ejecuta en el hilo de Tk mediante 'root.after'.
+        """
+        self.revision_programada = False
+
+        while True:
+            try:
+                identificador, datos = self.mensajes_progreso.get_nowait()
+            except queue.Empty:
+                break
+            tarea = self.tareas.get(identificador)
+            if tarea is not None and not tarea.cancelada and tarea.al_progreso is not None:
+                tarea.al_progreso(*datos)
+
+        for identificador, tarea in list(self.tareas.items()):
+            if not tarea.futuro.done():
+                continue
+            del self.tareas[identificador]
+            if tarea.cancelada or tarea.futuro.cancelled():
+                continue
+            excepcion = tarea.futuro.exception()
+            if excepcion is not None:
+                if tarea.al_error is not None:
+                    tarea.al_error(excepcion)
+            elif tarea.al_terminar is not None:
+                tarea.al_terminar(tarea.futuro.result())
+
+        self.notificar_cambio()
+        if self.tareas:
+            self.programar_revision()
+
+    def notificar_cambio(self):
+        if self.al_cambiar is not None:
+            self.al_cambiar(self.pendientes())
+
+    def cerrar(self):
+        """
+        Cancela las tareas pendientes y libera el grupo de trabajadores sin esperar.
+        """
+        self.cancelar_todas()
+        self.executor.shutdown(wait=False, cancel_futures=True)
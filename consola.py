@@ -0,0 +1,206 @@
+"""
+Resolución de modelos desde la línea de comandos, sin cargar la interfaz gráfica.
+
+Uso: python -m consola modelo.json [--formato csv] [--arranques 8] [--metodo auto] [--presolve] [--graficar]
+                                   [--tiempo-limite 30] [--instrumentar] [--perfil perfil.prof] [--servidor 127.0.0.1:47300]
+
+Solo se importa el resolvedor que el modelo necesita; tkinter y matplotlib se importan
+únicamente cuando se pide la gráfica.
+"""
+import time
+
+inicio_proceso = time.perf_counter()
+
+import argparse
+import contextlib
+import json
+import sys
+
+
+def convertir_a_json(valor):
+    """
+    Convierte recursivamente los resultados (arrays y escalares de numpy) a tipos de JSON.
+
+    :param valor: Valor a convertir.
+    :return: Valor equivalente formado por dict, list, float, int, str, bool o None.
+    """
+    if isinstance(valor, dict):
+        return {clave: convertir_a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [convertir_a_json(v) for v in valor]
+    if hasattr(valor, "tolist"):
+        return convertir_a_json(valor.tolist())
+    if isinstance(valor, float) and valor != valor:
+        return None  # NaN no es válido en JSON
+    return valor
+
+
+def obtener_resolvedor(clase, arranques=1, metodo="auto", presolve=False, tiempo_limite=None):
+    """
+    Importa y devuelve el resolvedor de la clase de problema; solo se carga el que se usa.
+
+    :param clase: 'pl' o 'npl'.
+    :param arranques: Número de puntos iniciales para problemas no lineales.
+    :param metodo: Método de resolución de los problemas no lineales ('auto' lo elige).
+    :param presolve: Reducir y escalar los problemas lineales antes de resolverlos.
+    :param tiempo_limite: Segundos máximos de los problemas lineales con variables enteras;
+                          None usa el límite por defecto de 'pl.optimizacion_pl'.
+    :return: Función que recibe datos_optimizacion y devuelve el diccionario de resultado.
+    """
+    if clase == "pl":
+        from pl.optimizacion_pl import resolver
+        limite = {} if tiempo_limite is None else {"tiempo_limite": tiempo_limite}
+        return lambda datos: resolver(datos, presolve=presolve, **limite)
+
+    if arranques > 1:
+        from npl.multiarranque_npl import resolver_multiarranque
+        return lambda datos: resolver_multiarranque(datos, num_puntos=arranques, metodo=metodo)
+
+    from npl.optimizacion_npl import resolver
+    return lambda datos: resolver(datos, metodo=metodo)
+
+
+def resolver_en_servidor(direccion, clase, arranques=1, metodo="auto", presolve=False, tiempo_limite=None):
+    """
+    Devuelve un resolvedor que envía el problema al servicio local ('servidor.py') en lugar
+    de importar scipy en este proceso.
+
+    :param direccion: Dirección del servicio.
+    :param clase: 'pl' o 'npl'.
+    :param arranques: Número de puntos iniciales para problemas no lineales.
+    :param metodo: Método de resolución de los problemas no lineales.
+    :param presolve: Reducir y escalar los problemas lineales antes de resolverlos.
+    :param tiempo_limite: Segundos máximos de los problemas lineales con variables enteras;
+                          None usa el límite por defecto.
+    :return: Función que recibe datos_optimizacion y devuelve el diccionario de resultado.
+    """
+    from servidor import solicitar
+
+    def resolver(datos_optimizacion):
+        peticion = {"id": 0, "clase": clase, "datos": datos_optimizacion, "arranques": arranques, "metodo": metodo,
+                    "presolve": presolve, "tiempo_limite": tiempo_limite}
+        respuesta = next(solicitar([peticion], direccion))
+        resultado = respuesta["resultado"]
+        resultado["compartido"] = respuesta["compartido"]
+        return resultado
+
+    return resolver
+
+
+def graficar_modelo(clase, datos_optimizacion, solucion_optima):
+    """
+    Grafica la solución; aquí es el único lugar donde se importan los módulos de graficación.
+
+    :param clase: 'pl' o 'npl'.
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param solucion_optima: Array con los valores óptimos de las variables.
+    """
+    from comun.cargador_modelos import densificar_restricciones
+
+    if clase == "pl":
+        from pl.graficar_pl import graficar_solucion
+        num_variables = len(datos_optimizacion["variables"])
+        graficar_solucion(densificar_restricciones(datos_optimizacion, num_variables), solucion_optima)
+    else:
+        from npl.polinomios_npl import es_polinomico
+        if es_polinomico(datos_optimizacion):
+            print("La gráfica solo está disponible para modelos separables.", file=sys.stderr)
+            return
+        from npl.graficar_npl import graficar_solucion
+        graficar_solucion(datos_optimizacion["coeficientes_objetivo"], datos_optimizacion["exponentes_objetivo"],
+                          solucion_optima, datos_optimizacion["restricciones"], datos_optimizacion["tipo_problema"])
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    :param argumentos: Lista de argumentos; por defecto se usan los de sys.argv.
+    :return: Código de salida (0 si se encontró solución óptima).
+    """
+    analizador = argparse.ArgumentParser(
+        prog="python -m consola",
+        description="Resuelve un modelo de programación lineal o no lineal y muestra el resultado en JSON."
+    )
+    analizador.add_argument("modelo", help="Archivo del modelo (.json, .jsonl, .csv o .mps)")
+    analizador.add_argument("--formato", choices=["json", "jsonl", "csv", "mps"],
+                            help="Formato del archivo; por defecto se deduce de la extensión")
+    analizador.add_argument("--arranques", type=int, default=1,
+                            help="Puntos iniciales para la búsqueda multiarranque (solo no lineal)")
+    analizador.add_argument("--metodo", default="auto", choices=["auto", "slsqp", "trust-constr", "highs"],
+                            help="Método de resolución no lineal; 'auto' lo elige según la estructura del modelo")
+    analizador.add_argument("--presolve", action="store_true",
+                            help="Reducir y escalar el modelo lineal antes de resolverlo e informar de lo eliminado")
+    analizador.add_argument("--tiempo-limite", type=float, default=None,
+                            help="Segundos máximos para un modelo lineal con variables enteras; al agotarse "
+                                 "se devuelve la mejor solución encontrada con su gap")
+    analizador.add_argument("--graficar", action="store_true",
+                            help="Mostrar la gráfica de la solución (importa tkinter y matplotlib)")
+    analizador.add_argument("--indentar", type=int, default=None,
+                            help="Sangría del JSON de salida")
+    analizador.add_argument("--instrumentar", action="store_true",
+                            help="Añadir al resultado el tiempo por fase y las evaluaciones de cada función "
+                                 "(con --graficar, el JSON se muestra al cerrar la gráfica)")
+    analizador.add_argument("--perfil", default=None,
+                            help="Volcar las estadísticas de cProfile en este archivo (implica --instrumentar)")
+    analizador.add_argument("--servidor", default=None,
+                            help="Resolver en el servicio local ('python -m servidor') en esta dirección "
+                                 "en lugar de en este proceso")
+    opciones = analizador.parse_args(argumentos)
+
+    from comun.cargador_modelos import cargar_modelo
+
+    instrumentar = opciones.instrumentar or opciones.perfil is not None
+    if instrumentar:
+        from comun.instrumentacion import sesion_instrumentacion, medir
+        contexto = sesion_instrumentacion(opciones.perfil)
+    else:
+        contexto = contextlib.nullcontext()
+
+    with contexto as instrumentacion:
+        try:
+            if instrumentar:
+                with medir("carga"):
+                    clase, datos_optimizacion = cargar_modelo(opciones.modelo, opciones.formato)
+            else:
+                clase, datos_optimizacion = cargar_modelo(opciones.modelo, opciones.formato)
+        except (OSError, ValueError, KeyError) as e:
+            print(json.dumps({"estado": "error", "mensaje": f"No se pudo cargar el modelo: {e}"}))
+            return 2
+
+        if opciones.servidor:
+            resolver = resolver_en_servidor(opciones.servidor, clase, opciones.arranques, opciones.metodo,
+                                           opciones.presolve, opciones.tiempo_limite)
+        else:
+            resolver = obtener_resolvedor(clase, opciones.arranques, opciones.metodo, opciones.presolve,
+                                          opciones.tiempo_limite)
+        inicio_resolucion = time.perf_counter()
+        try:
+            resultado = resolver(datos_optimizacion)
+        except OSError as e:
+            # Solo el servicio remoto falla así; el resolvedor local informa en el resultado
+            print(json.dumps({"estado": "error", "mensaje": f"No se pudo conectar con el servicio: {e}"}))
+            return 2
+        fin_resolucion = time.perf_counter()
+
+        resultado["clase"] = clase
+        # Tiempo desde el inicio del módulo hasta tener el resolvedor listo (carga e importaciones);
+        # no incluye el arranque del intérprete, que puede medirse con 'python -X importtime'
+        resultado["tiempo_arranque"] = inicio_resolucion - inicio_proceso
+        resultado["tiempo_total"] = fin_resolucion - inicio_proceso
+        if not instrumentar:
+            print(json.dumps(convertir_a_json(resultado), indent=opciones.indentar, ensure_ascii=False))
+
+        if opciones.graficar and resultado["exito"]:
+            graficar_modelo(clase, datos_optimizacion, resultado["variables"])
+
+    if instrumentar:
+        # Los arranques resueltos en otros procesos no se cuentan en los contadores
+        resultado["instrumentacion"] = instrumentacion.como_dict()
+        print(json.dumps(convertir_a_json(resultado), indent=opciones.indentar, ensure_ascii=False))
+
+    return 0 if resultado["exito"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,16 @@
 import tkinter as tk
-from pl.formulario_pl import crear_formulario as crear_formulario_pl
-from npl.formulario_npl import crear_formulario as crear_formulario_npl
+
+# Los formularios se importan al abrirlos: cargan scipy y matplotlib, que el menú no necesita
 
 def abrir_programacion_lineal():
+    from pl.formulario_pl import crear_formulario as crear_formulario_pl
     root = tk.Tk()
     root.title("Programación Lineal")
     crear_formulario_pl(root)
     root.mainloop()
 
 def abrir_programacion_no_lineal():
+    from npl.formulario_npl import crear_formulario as crear_formulario_npl
     root = tk.Tk()
     root.title("Programación No Lineal")
     crear_formulario_npl(root)
@@ -0,0 +1,243 @@
+"""
+Compilador de modelos no lineales separables.
+
+A partir de los coeficientes y exponentes se genera el código fuente de dos funciones
+especializadas para el modelo: 'valores' (objetivo y vector de restricciones) y 'derivadas'
+(gradiente y jacobiano). Los términos se agrupan por exponente, de modo que cada potencia
+x ** e se calcula una sola vez como vector (con productos sucesivos si el exponente es un
+entero pequeño) y cada grupo se reduce con un producto matriz-vector, en lugar de elevar
+elemento a elemento la matriz completa de exponentes en cada llamada.
+
+El código compilado y sus constantes se guardan por hash del modelo, así que resolver varias
+veces el mismo problema (por ejemplo en la búsqueda multiarranque) no lo vuelve a generar.
+"""
+from collections import OrderedDict
+import hashlib
+import threading
+import numpy as np
+
+# Máximo de exponentes distintos que se compilan; con más, cada grupo añadiría una matriz
+# completa y compensa seguir elevando elemento a elemento
+MAX_EXPONENTES = 8
+
+# Tamaño mínimo de la matriz de restricciones (filas x columnas) para compilar; por debajo,
+# el coste de cada llamada lo domina el intérprete y las funciones genéricas son igual de rápidas
+MIN_ENTRADAS = 4096
+
+# Mayor exponente entero que se calcula con productos sucesivos en lugar de np.power
+MAX_ENTERO = 8
+
+# Número de modelos compilados que se conservan
+TAMANO_CACHE = 64
+
+modelos_compilados = OrderedDict()
+cerrojo_cache = threading.Lock()
+
+
+def clave_modelo(tipo_problema, coeficientes, exponentes, matriz_coeficientes, matriz_exponentes,
+                 resultados, signos):
+    """
+    Calcula el hash de los datos numéricos de un modelo.
+
+    :return: Clave hexadecimal.
+    """
+    resumen = hashlib.sha256(tipo_problema.encode("utf-8"))
+    for array in (coeficientes, exponentes, matriz_coeficientes, matriz_exponentes, resultados, signos):
+        array = np.ascontiguousarray(array, dtype=float)
+        resumen.update(repr(array.shape).encode("utf-8"))
+        resumen.update(array.tobytes())
+    return resumen.hexdigest()
+
+
+def generar_potencias(necesarios):
+    """
+    Genera las líneas que calculan las potencias de x que usa el modelo.
+
+    :param necesarios: Conjunto de exponentes distintos de 0 y 1.
+    :return: Tupla (lista de líneas de código, diccionario {exponente: nombre de variable}).
+    """
+    lineas = []
+    nombres = {1.0: "x"}
+
+    enteros = [e for e in necesarios if float(e).is_integer() and 2 <= e <= MAX_ENTERO]
+    if enteros:
+        # Cadena x2 = x * x, x3 = x2 * x, ... hasta el mayor entero necesario
+        for e in range(2, int(max(enteros)) + 1):
+            nombre = f"x{e}"
+            lineas.append(f"{nombre} = {nombres[float(e - 1)]} * x")
+            nombres[float(e)] = nombre
+
+    for indice, e in enumerate(sorted(set(necesarios) - set(nombres))):
+        nombre = f"xp{indice}"
+        lineas.append(f"{nombre} = power(x, {e!r})")
+        nombres[e] = nombre
+
+    return lineas, nombres
+
+
+def generar_fuente(grupos_objetivo, grupos_restricciones):
+    """
+    Genera el código fuente de las funciones 'valores' y 'derivadas'.
+
+    Las constantes se referencian por nombre: 'co{k}' y 'go{k}' son los coeficientes del
+    objetivo y de su gradiente para el exponente k-ésimo, 'ar{k}' y 'jr{k}' las matrices de
+    las restricciones y del jacobiano, y 'constante_objetivo' y 'constante_restricciones'
+    los términos independientes.
+
+    :param grupos_objetivo: Lista de (índice, exponente) con términos en el objetivo.
+    :param grupos_restricciones: Lista de (índice, exponente) con términos en las restricciones.
+    :return: Código fuente.
+    """
+    def suma(terminos, vacio):
+        return " + ".join(terminos) if terminos else vacio
+
+    # Exponentes cuyas potencias hacen falta en cada función
+    exponentes = {e for _, e in grupos_objetivo + grupos_restricciones}
+    lineas_valores, nombres_valores = generar_potencias(exponentes - {0.0, 1.0})
+    derivados = {e - 1 for e in exponentes if e not in (0.0, 1.0)}
+    lineas_derivadas, nombres_derivadas = generar_potencias(derivados - {0.0, 1.0})
+
+    def valor(prefijo, k, e):
+        # Exponente 0: el término es constante y ya está sumado en la constante
+        return None if e == 0.0 else f"{prefijo}{k} @ {nombres_valores[e]}"
+
+    def derivada(prefijo, k, e):
+        # Exponente 0: derivada nula; exponente 1: derivada constante
+        if e == 0.0:
+            return None
+        if e == 1.0:
+            return f"{prefijo}{k}"
+        return f"{prefijo}{k} * {nombres_derivadas[e - 1]}"
+
+    objetivo = [t for k, e in grupos_objetivo if (t := valor("co", k, e))]
+    restricciones = [t for k, e in grupos_restricciones if (t := valor("ar", k, e))]
+    gradiente = [t for k, e in grupos_objetivo if (t := derivada("go", k, e))]
+    jacobiano = [t for k, e in grupos_restricciones if (t := derivada("jr", k, e))]
+
+    fuente = ["def valores(x):"]
+    fuente += [f"    {linea}" for linea in lineas_valores]
+    fuente.append(f"    objetivo = constante_objetivo + {suma(objetivo, '0.0')}")
+    fuente.append(f"    restricciones = constante_restricciones + {suma(restricciones, '0.0')}")
+    fuente.append("    return objetivo, restricciones")
+    fuente.append("")
+    fuente.append("def derivadas(x):")
+    fuente += [f"    {linea}" for linea in lineas_derivadas]
+    # 'ceros + ...' garantiza un array nuevo aunque solo haya términos constantes
+    fuente.append(f"    gradiente = ceros_gradiente + {suma(gradiente, '0.0')}")
+    fuente.append(f"    jacobiano = ceros_jacobiano + {suma(jacobiano, '0.0')}")
+    fuente.append("    return gradiente, jacobiano")
+    return "\n".join(fuente) + "\n"
+
+
+def compilar(tipo_problema, coeficientes, exponentes, matriz_coeficientes, matriz_exponentes,
+             resultados, signos):
+    """
+    Genera y compila las funciones de un modelo ya apilado en arrays.
+
+    Las restricciones se expresan como signo * (resultado - sum(a_ij * x_j ** e_ij)) >= 0,
+    igual que en 'compilar_restricciones', y el objetivo ya con el signo de la minimización.
+
+    :return: Diccionario con 'valores', 'derivadas' y 'fuente', o None si el modelo tiene
+             más de MAX_EXPONENTES exponentes distintos.
+    """
+    signo_objetivo = -1.0 if tipo_problema == "max" else 1.0
+    coeficientes = signo_objetivo * coeficientes
+    # Coeficientes de las restricciones con el signo ya aplicado: s_i * (r_i - sum) = s_i * r_i + sum(-s_i * a_ij ...)
+    matriz = -signos[:, np.newaxis] * matriz_coeficientes
+
+    exponentes_objetivo = set(exponentes[coeficientes != 0].tolist())
+    exponentes_restricciones = set(matriz_exponentes[matriz != 0].tolist())
+    distintos = sorted(exponentes_objetivo | exponentes_restricciones)
+    if len(distintos) > MAX_EXPONENTES:
+        return None
+
+    num_filas, num_variables = matriz.shape
+    espacio = {
+        "power": np.power,
+        "constante_objetivo": 0.0,
+        "constante_restricciones": signos * resultados,
+        "ceros_gradiente": np.zeros(num_variables),
+        "ceros_jacobiano": np.zeros((num_filas, num_variables)),
+    }
+
+    grupos_objetivo = []
+    grupos_restricciones = []
+    for k, e in enumerate(distintos):
+        if e in exponentes_objetivo:
+            co = np.where(exponentes == e, coeficientes, 0.0)
+            if e == 0.0:
+                espacio["constante_objetivo"] += float(co.sum())
+            espacio[f"co{k}"] = co
+            espacio[f"go{k}"] = co * e
+            grupos_objetivo.append((k, e))
+        if e in exponentes_restricciones:
+            ar = np.where(matriz_exponentes == e, matriz, 0.0)
+            if e == 0.0:
+                espacio["constante_restricciones"] = espacio["constante_restricciones"] + ar.sum(axis=1)
+            espacio[f"ar{k}"] = ar
+            espacio[f"jr{k}"] = ar * e
+            grupos_restricciones.append((k, e))
+
+    fuente = generar_fuente(grupos_objetivo, grupos_restricciones)
+    exec(compile(fuente, "<modelo no lineal compilado>", "exec"), espacio)
+    return {"valores": espacio["valores"], "derivadas": espacio["derivadas"], "fuente": fuente}
+
+
+def obtener_compilado(tipo_problema, coeficientes, exponentes, matriz_coeficientes, matriz_exponentes,
+                      resultados, signos):
+    """
+    Devuelve el modelo compilado desde la caché o lo compila y lo guarda.
+
+    :return: Diccionario de 'compilar', o None si el modelo es pequeño o no se puede compilar.
+    """
+    if matriz_coeficientes.size < MIN_ENTRADAS:
+        return None
+
+    clave = clave_modelo(tipo_problema, coeficientes, exponentes, matriz_coeficientes,
+                         matriz_exponentes, resultados, signos)
+    with cerrojo_cache:
+        if clave in modelos_compilados:
+            modelos_compilados.move_to_end(clave)
+            return modelos_compilados[clave]
+
+    compilado = compilar(tipo_problema, coeficientes, exponentes, matriz_coeficientes,
+                         matriz_exponentes, resultados, signos)
+    with cerrojo_cache:
+        modelos_compilados[clave] = compilado
+        if len(modelos_compilados) > TAMANO_CACHE:
+            modelos_compilados.popitem(last=False)
+    return compilado
+
+
+def instanciar(compilado):
+    """
+    Crea las funciones que recibe el optimizador a partir de un modelo compilado.
+
+    El optimizador evalúa el objetivo y las restricciones (y después sus derivadas) en el
+    mismo punto, así que cada par se calcula una sola vez y se reutiliza mientras x no cambie.
+    El estado es propio de cada instancia, de modo que un mismo modelo compilado puede
+    resolverse a la vez en varios hilos.
+
+    :param compilado: Diccionario de 'compilar'.
+    :return: Diccionario con 'objetivo', 'gradiente', 'restricciones' y 'jacobiano'.
+    """
+    calcular_valores = compilado["valores"]
+    calcular_derivadas = compilado["derivadas"]
+    ultimo = {"valores": (None, None), "derivadas": (None, None)}
+
+    def evaluar(tipo, calcular, variables):
+        x = np.asarray(variables, dtype=float)
+        # Comparar los bytes es más barato que np.array_equal con vectores pequeños
+        clave = x.tobytes()
+        punto, resultado = ultimo[tipo]
+        if clave != punto:
+            resultado = calcular(x)
+            ultimo[tipo] = (clave, resultado)
+        return resultado
+
+    return {
+        "objetivo": lambda x: evaluar("valores", calcular_valores, x)[0],
+        "restricciones": lambda x: evaluar("valores", calcular_valores, x)[1],
+        "gradiente": lambda x: evaluar("derivadas", calcular_derivadas, x)[0],
+        "jacobiano": lambda x: evaluar("derivadas", calcular_derivadas, x)[1],
+    }
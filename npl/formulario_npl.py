@@ -1,7 +1,11 @@
 import tkinter as tk
-from tkinter import messagebox
-from npl.optimizacion_npl import optimizar
+from tkinter import messagebox, filedialog
+from comun.cargador_modelos import cargar_modelo
+from npl.optimizacion_npl import resolver_para_interfaz, mostrar_resultado
+from npl.polinomios_npl import es_polinomico
 from npl.graficar_npl import graficar_solucion
+from comun.tareas_tk import GestorTareas
+from comun.lienzo_tk import LienzoGrafico
 
 # Variables globales para almacenar las entradas de usuario
 entries_variables = []  # Lista para entradas de coeficientes de variables
@@ -20,6 +24,7 @@ def continuar():
         # Obtener y validar el número de variables y restricciones
         num_variables = int(entry_num_variables.get())
         num_restricciones = int(entry_num_restricciones.get())
+        arranques = leer_arranques()
 
         if not (1 <= num_variables <= 3) or not (1 <= num_restricciones <= 9):
             raise ValueError
@@ -31,7 +36,8 @@ def continuar():
         datos_iniciales = {
             "num_variables": num_variables,
             "num_restricciones": num_restricciones,
-            "tipo_problema": tipo_problema
+            "tipo_problema": tipo_problema,
+            "arranques": arranques
         }
 
         # Limpiar la ventana
@@ -157,6 +163,7 @@ def crear_campos_restricciones():
         # Botón para enviar datos y ejecutar la optimización
         btn_enviar = tk.Button(root, text="Optimizar", command=enviar_datos)
         btn_enviar.grid(row=num_restricciones * (num_variables + 3) + 1, column=0, columnspan=4, pady=10)
+        crear_barra_estado(num_restricciones * (num_variables + 3) + 2)
 
     except ValueError:
         # Mostrar mensaje de error si los datos son inválidos
@@ -205,22 +212,148 @@ def enviar_datos():
             "restricciones": restricciones
         }
 
-        # Ejecutar la optimización no lineal
-        solucion_optima = optimizar(datos_optimizacion)
-
-        # Graficar la solución si existe
-        if solucion_optima is not None:
-            graficar_solucion(coeficientes_objetivo, exponentes_objetivo, solucion_optima, restricciones, tipo_problema)
-
-        # Mostrar mensaje de éxito
-        messagebox.showinfo("Éxito", "Optimización completada exitosamente.")
-        root.destroy()
+        # Ejecutar la optimización no lineal en segundo plano para no bloquear la ventana
+        enviar_optimizacion(datos_optimizacion, datos_iniciales["arranques"], mostrar_solucion)
 
     except ValueError:
         # Mostrar mensaje de error si hay valores inválidos
         messagebox.showerror("Error", "Por favor, ingrese datos válidos.")
 
 
+def cargar_desde_archivo():
+    """
+    Carga un modelo desde un archivo (JSON, JSON Lines o CSV) y lo optimiza directamente,
+    sin crear un campo por coeficiente ni aplicar los límites de variables, restricciones
+    y exponentes del formulario.
+    """
+    ruta = filedialog.askopenfilename(
+        title="Cargar modelo",
+        filetypes=[("Modelos", "*.json *.jsonl *.csv"), ("Todos los archivos", "*.*")]
+    )
+    if not ruta:
+        return
+
+    try:
+        clase, datos_optimizacion = cargar_modelo(ruta)
+    except (OSError, ValueError, KeyError) as e:
+        messagebox.showerror("Error", f"No se pudo cargar el modelo:\n{str(e)}")
+        return
+
+    if clase != "npl":
+        messagebox.showerror("Error", "El archivo no contiene un problema de programación no lineal.")
+        return
+
+    try:
+        arranques = leer_arranques()
+    except ValueError:
+        messagebox.showerror("Error", "El número de puntos iniciales debe ser un entero positivo.")
+        return
+
+    # Ejecutar la optimización no lineal en segundo plano para no bloquear la ventana
+    enviar_optimizacion(datos_optimizacion, arranques, mostrar_solucion)
+
+
+def leer_arranques():
+    """
+    Lee el número de puntos iniciales de la búsqueda multiarranque (1 si está vacío).
+
+    :return: Número entero de puntos iniciales.
+    :raises ValueError: Si el valor no es un entero positivo.
+    """
+    texto = entry_arranques.get().strip()
+    arranques = int(texto) if texto else 1
+    if arranques < 1:
+        raise ValueError
+    return arranques
+
+
+def enviar_optimizacion(datos_optimizacion, arranques, al_terminar):
+    """
+    Envía la optimización a segundo plano. Con varios puntos iniciales se informa el
+    progreso de la búsqueda y la cancelación la detiene en el siguiente arranque.
+
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param arranques: Número de puntos iniciales.
+    :param al_terminar: Función que recibe los datos y el resultado, en el hilo de Tk.
+    """
+    gestor_tareas.enviar(
+        resolver_para_interfaz, datos_optimizacion, arranques,
+        al_terminar=lambda resultado: al_terminar(datos_optimizacion, resultado),
+        al_error=mostrar_error_optimizacion,
+        al_progreso=mostrar_progreso if arranques > 1 else None,
+        cancelable=arranques > 1
+    )
+
+
+def mostrar_solucion(datos_optimizacion, resultado):
+    """
+    Muestra el resultado de una optimización terminada y su gráfica. Se ejecuta en el hilo de Tk.
+
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param resultado: Diccionario de resultado del resolvedor.
+    :return: Variables óptimas si se encontró solución; None en caso contrario.
+    """
+    solucion_optima = mostrar_resultado(resultado)
+
+    # Graficar la solución si existe; la gráfica solo admite modelos separables
+    if solucion_optima is not None and es_polinomico(datos_optimizacion):
+        messagebox.showinfo("Información", "La gráfica solo está disponible para modelos separables.")
+    elif solucion_optima is not None:
+        graficar_solucion(datos_optimizacion["coeficientes_objetivo"], datos_optimizacion["exponentes_objetivo"],
+                          solucion_optima, datos_optimizacion["restricciones"], datos_optimizacion["tipo_problema"],
+                          lienzo)
+    return solucion_optima
+
+
+def mostrar_error_optimizacion(error):
+    """
+    Informa de un error ocurrido en segundo plano durante la optimización.
+    """
+    messagebox.showerror("Error", f"Ocurrió un error durante la optimización:\n{str(error)}")
+
+
+def mostrar_progreso(resueltos, total):
+    """
+    Muestra el avance de la búsqueda multiarranque en curso.
+    """
+    try:
+        etiqueta_estado.config(text=f"Puntos iniciales resueltos: {resueltos}/{total}")
+    except (NameError, tk.TclError):
+        pass  # La etiqueta aún no existe o la ventana ya se cerró
+
+
+def crear_barra_estado(fila):
+    """
+    Crea la etiqueta con el número de problemas en cola y el botón para cancelarlos.
+
+    :param fila: Fila de la grilla en la que se ubican.
+    """
+    global etiqueta_estado
+    etiqueta_estado = tk.Label(root, text="")
+    etiqueta_estado.grid(row=fila, column=0, padx=5, pady=5)
+    tk.Button(root, text="Cancelar", command=gestor_tareas.cancelar_todas).grid(row=fila, column=1, padx=5, pady=5)
+    actualizar_estado(gestor_tareas.pendientes())
+
+
+def actualizar_estado(pendientes):
+    """
+    Muestra cuántos problemas se están resolviendo en segundo plano.
+    """
+    try:
+        etiqueta_estado.config(text=f"Resolviendo {pendientes} problema(s)..." if pendientes else "")
+    except (NameError, tk.TclError):
+        pass  # La etiqueta aún no existe o la ventana ya se cerró
+
+
+def cerrar_formulario():
+    """
+    Cancela los problemas en cola, cierra la gráfica y la ventana del formulario.
+    """
+    gestor_tareas.cerrar()
+    lienzo.cerrar()
+    root.destroy()
+
+
 def crear_formulario(parent):
     """
     Función para crear el formulario inicial de la interfaz gráfica.
@@ -228,6 +361,16 @@ def crear_formulario(parent):
     global root
     root = parent
 
+    # Gestor que resuelve los problemas en segundo plano sin bloquear la ventana
+    global gestor_tareas
+    gestor_tareas = GestorTareas(root)
+    gestor_tareas.al_cambiar = actualizar_estado
+
+    # Gráfica persistente: cada nueva solución se dibuja sobre la misma figura
+    global lienzo
+    lienzo = LienzoGrafico(root, "Gráfica de la solución")
+    root.protocol("WM_DELETE_WINDOW", cerrar_formulario)
+
     # Etiqueta y entrada para número de variables
     tk.Label(root, text="Número de variables (máximo 3):").grid(row=0, column=0, padx=5, pady=5)
     global entry_num_variables
@@ -247,9 +390,21 @@ def crear_formulario(parent):
     variable_tipo.set("max")  # Valor por defecto
     tk.OptionMenu(root, variable_tipo, "max", "min").grid(row=2, column=1, padx=5, pady=5)
 
+    # Etiqueta y entrada para el número de puntos iniciales de la búsqueda multiarranque
+    tk.Label(root, text="Puntos iniciales (multiarranque):").grid(row=3, column=0, padx=5, pady=5)
+    global entry_arranques
+    entry_arranques = tk.Entry(root)
+    entry_arranques.insert(0, "1")
+    entry_arranques.grid(row=3, column=1, padx=5, pady=5)
+
     # Botón "Continuar"
     btn_continuar = tk.Button(root, text="Continuar", command=continuar)
-    btn_continuar.grid(row=3, column=0, columnspan=2, pady=10)
+    btn_continuar.grid(row=4, column=0, columnspan=2, pady=10)
+
+    # Botón para cargar un modelo completo desde un archivo
+    btn_cargar = tk.Button(root, text="Cargar modelo desde archivo", command=cargar_desde_archivo)
+    btn_cargar.grid(row=5, column=0, columnspan=2, pady=10)
+    crear_barra_estado(6)
 
 
 # Código para iniciar la aplicación
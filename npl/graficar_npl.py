@@ -2,266 +2,349 @@ import matplotlib.pyplot as plt
 import numpy as np
 from tkinter import messagebox
 from mpl_toolkits.mplot3d import Axes3D
+from comun.lienzo_tk import actualizar_linea, actualizar_leyenda, quitar_artistas
+from comun.instrumentacion import medir
+from matplotlib.widgets import RadioButtons, Slider
+from npl.muestreo_npl import PRESUPUESTO_PUNTOS, precalcular_corte, evaluar_corte
 
-def graficar_solucion(coeficientes_objetivo, exponentes_objetivo, solucion_optima, restricciones, tipo_problema):
+# Valores de la variable fija, repartidos por el recorrido del deslizador, para los que se
+# refina la malla de cada corte cerca de los bordes de las restricciones
+CORTES_REFINADOS = 5
+
+def graficar_solucion(coeficientes_objetivo, exponentes_objetivo, solucion_optima, restricciones, tipo_problema,
+                      lienzo=None, presupuesto=PRESUPUESTO_PUNTOS):
     """
     Función para graficar la solución de problemas de optimización no lineal.
-    Maneja casos de una a tres variables. En el caso de tres variables, fija una variable
-    para poder graficar en 3D. Muestra las restricciones en el gráfico cuando es posible.
+    Maneja casos de una a tres variables. En el caso de tres variables muestra un explorador
+    de cortes 3D en el que se elige la variable fija y su valor. Muestra las restricciones
+    en el gráfico cuando es posible.
 
     :param coeficientes_objetivo: Lista de coeficientes de la función objetivo.
     :param exponentes_objetivo: Lista de exponentes de la función objetivo.
     :param solucion_optima: Array con los valores óptimos de las variables.
     :param restricciones: Lista de restricciones del problema.
     :param tipo_problema: Tipo de problema ('max' o 'min').
+    :param lienzo: LienzoGrafico en el que dibujar reutilizando la figura, los ejes, la barra
+                   de color y los artistas del dibujo anterior; si es None se abre una figura
+                   nueva con plt.show().
+    :param presupuesto: Número máximo de puntos de la malla de las superficies 3D.
     """
     num_variables = len(coeficientes_objetivo)
 
-    if num_variables == 1:
-        # Caso de una variable
-        x_vals = np.linspace(0, max(solucion_optima[0]*1.5, 10), 400)
-
-        # Definir la función objetivo
-        def funcion_objetivo(x):
-            return coeficientes_objetivo[0] * (x ** exponentes_objetivo[0])
-
-        # Calcular los valores de y usando la función objetivo
-        y_vals = funcion_objetivo(x_vals)
-
-        # Crear la gráfica
-        plt.figure()
-        plt.plot(x_vals, y_vals, label="Función Objetivo")
-
-        # Marcar la solución óptima
-        if solucion_optima is not None:
-            y_optimo = funcion_objetivo(solucion_optima[0])
-            plt.plot(solucion_optima[0], y_optimo, 'ro', label="Solución Óptima")
-            # Añadir etiquetas
-            plt.text(solucion_optima[0], y_optimo, f'({solucion_optima[0]:.2f}, {y_optimo:.2f})', color='red')
-
-            # Mostrar el valor optimizado de la función objetivo
-            plt.annotate(f'Valor óptimo: {y_optimo:.2f}',
-                         xy=(solucion_optima[0], y_optimo),
-                         xytext=(solucion_optima[0], y_optimo*1.1),
-                         arrowprops=dict(facecolor='red', shrink=0.05),
-                         color='red')
-
-        # Graficar las restricciones
-        for restriccion in restricciones:
-            coef = restriccion['coeficientes'][0]
-            exp = restriccion['exponentes'][0]
-            operador = restriccion['operador']
-            resultado = restriccion['resultado']
-            # Definir la función de restricción
-            def funcion_restriccion(x):
-                return coef * (x ** exp)
-
-            y_restriccion = funcion_restriccion(x_vals)
-            if operador == "<=":
-                plt.fill_between(x_vals, y_vals.min(), y_vals.max(), where=(y_restriccion <= resultado), color='grey', alpha=0.3)
-            elif operador == ">=":
-                plt.fill_between(x_vals, y_vals.min(), y_vals.max(), where=(y_restriccion >= resultado), color='grey', alpha=0.3)
-            plt.plot(x_vals, y_restriccion, linestyle='--', color='black', label='Restricción')
-
-        plt.xlabel('x₁')
-        plt.ylabel('f(x₁)')
-        plt.title('Gráfico de la solución óptima (1 variable)')
-        plt.legend()
-        plt.grid(True)
-        plt.show()
+    if num_variables > 3:
+        # Caso de más de tres variables
+        messagebox.showinfo("Información", "La graficación solo está disponible para problemas con hasta tres variables.")
+        return
 
-    elif num_variables == 2:
-        # Caso de dos variables
-        x1_vals = np.linspace(0, max(solucion_optima[0]*1.5, 10), 200)
-        x2_vals = np.linspace(0, max(solucion_optima[1]*1.5, 10), 200)
-        X1, X2 = np.meshgrid(x1_vals, x2_vals)
-
-        # Definir la función objetivo
-        def funcion_objetivo(x1, x2):
-            return (coeficientes_objetivo[0] * (x1 ** exponentes_objetivo[0]) +
-                    coeficientes_objetivo[1] * (x2 ** exponentes_objetivo[1]))
-
-        # Calcular los valores de Z usando la función objetivo
-        Z = funcion_objetivo(X1, X2)
-
-        # Ajustar la escala del mapa de color alrededor del valor óptimo
-        if solucion_optima is not None:
-            valor_optimo = funcion_objetivo(solucion_optima[0], solucion_optima[1])
-            z_min = valor_optimo * 0.5
-            z_max = valor_optimo * 1.5
+    if lienzo is None:
+        fig = plt.figure()
+        artistas = {}
+        ax = None
+    else:
+        # Con el mismo número de variables y restricciones se reutilizan los ejes y los artistas
+        reutilizar = lienzo.preparar(("npl", num_variables, len(restricciones)))
+        fig = lienzo.figura
+        artistas = lienzo.artistas
+        ax = fig.axes[0] if reutilizar else None
+
+    if ax is None:
+        ax = fig.add_subplot(111) if num_variables == 1 else fig.add_subplot(111, projection='3d')
+
+    with medir("graficacion"):
+        if num_variables == 1:
+            dibujar_una_variable(ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima,
+                                 restricciones)
+        elif num_variables == 3:
+            dibujar_explorador(fig, ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima,
+                               restricciones, presupuesto)
         else:
-            z_min = np.min(Z)
-            z_max = np.max(Z)
+            dibujar_superficie(fig, ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima,
+                               restricciones, presupuesto)
 
-        # Crear la figura y el eje 3D
-        fig = plt.figure()
-        ax = fig.add_subplot(111, projection='3d')
-
-        # Crear la superficie de la función objetivo con la escala ajustada
-        surf = ax.plot_surface(X1, X2, Z, cmap='viridis', alpha=0.8, vmin=z_min, vmax=z_max)
-
-        # Agregar la barra de color
-        fig.colorbar(surf, shrink=0.5, aspect=5)
-
-        # Marcar la solución óptima
-        if solucion_optima is not None:
-            valor_optimo = funcion_objetivo(solucion_optima[0], solucion_optima[1])
-            ax.scatter(solucion_optima[0], solucion_optima[1], valor_optimo,
-                       color='red', s=50, label='Solución Óptima')
-
-            # Añadir etiquetas de los valores óptimos
-            ax.text(solucion_optima[0], solucion_optima[1], valor_optimo,
-                    f'({solucion_optima[0]:.2f}, {solucion_optima[1]:.2f}, {valor_optimo:.2f})',
-                    color='red')
-
-            # Mostrar el valor optimizado de la función objetivo
-            ax.text2D(0.05, 0.95, f'Valor óptimo de f(x₁, x₂): {valor_optimo:.2f}',
-                      transform=ax.transAxes, color='red')
-
-        # Proyectar las restricciones sobre la superficie
-        for restriccion in restricciones:
-            coeficientes = restriccion['coeficientes']
-            exponentes = restriccion['exponentes']
-            operador = restriccion['operador']
-            resultado = restriccion['resultado']
-
-            # Definir la función de restricción
-            def funcion_restriccion(x1, x2):
-                return sum(coef * (x ** exp) for coef, x, exp in zip(coeficientes, [x1, x2], exponentes))
-
-            # Calcular los valores de la restricción sobre la malla
-            C = funcion_restriccion(X1, X2)
-
-            # Crear una máscara para la región factible
-            if operador == "<=":
-                mask = C <= resultado
-            elif operador == ">=":
-                mask = C >= resultado
-            else:
-                continue  # Si el operador no es válido, saltamos esta restricción
-
-            # Proyectar la restricción sobre la superficie
-            Z_restriccion = np.where(mask, Z, np.nan)
-            ax.plot_surface(X1, X2, Z_restriccion, color='grey', alpha=0.3)
-
-            # Trazar la línea de la restricción en el nivel del resultado
-            ax.contour(X1, X2, C, levels=[resultado], colors='black', linestyles='--')
-
-        # Etiquetas y título
+    if lienzo is None:
+        plt.show()
+    else:
+        lienzo.dibujar()
+
+
+def dibujar_una_variable(ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima, restricciones):
+    """
+    Dibuja la función objetivo de una variable, sus restricciones y el óptimo. Las curvas y el
+    marcador existentes se actualizan con set_data; solo los rellenos y la flecha se recrean.
+
+    :param ax: Ejes de matplotlib.
+    :param artistas: Diccionario con los artistas reutilizables (vacío la primera vez).
+    """
+    x_vals = np.linspace(0, max(solucion_optima[0]*1.5, 10), 400)
+
+    # Definir la función objetivo
+    def funcion_objetivo(x):
+        return coeficientes_objetivo[0] * (x ** exponentes_objetivo[0])
+
+    # Calcular los valores de y usando la función objetivo
+    y_vals = funcion_objetivo(x_vals)
+
+    if not artistas:
         ax.set_xlabel('x₁')
-        ax.set_ylabel('x₂')
-        ax.set_zlabel('f(x₁, x₂)')
-        ax.set_title('Gráfico 3D de la función objetivo con restricciones proyectadas')
+        ax.set_ylabel('f(x₁)')
+        ax.set_title('Gráfico de la solución óptima (1 variable)')
+        ax.grid(True)
+    actualizar_linea(ax, artistas, "objetivo", x_vals, y_vals, label="Función Objetivo")
+
+    # Marcar la solución óptima
+    y_optimo = funcion_objetivo(solucion_optima[0])
+    actualizar_linea(ax, artistas, "optimo", [solucion_optima[0]], [y_optimo],
+                     color='red', marker='o', linestyle='', label="Solución Óptima")
+
+    # Añadir etiquetas
+    texto = f'({solucion_optima[0]:.2f}, {y_optimo:.2f})'
+    if "texto_optimo" in artistas:
+        artistas["texto_optimo"].set_position((solucion_optima[0], y_optimo))
+        artistas["texto_optimo"].set_text(texto)
+    else:
+        artistas["texto_optimo"] = ax.text(solucion_optima[0], y_optimo, texto, color='red')
+
+    # Mostrar el valor optimizado de la función objetivo
+    quitar_artistas(artistas, "anotacion")
+    artistas["anotacion"] = ax.annotate(f'Valor óptimo: {y_optimo:.2f}',
+                                        xy=(solucion_optima[0], y_optimo),
+                                        xytext=(solucion_optima[0], y_optimo*1.1),
+                                        arrowprops=dict(facecolor='red', shrink=0.05),
+                                        color='red')
+
+    # Graficar las restricciones
+    quitar_artistas(artistas, "rellenos")
+    rellenos = []
+    for i, restriccion in enumerate(restricciones):
+        coef = restriccion['coeficientes'][0]
+        exp = restriccion['exponentes'][0]
+        operador = restriccion['operador']
+        resultado = restriccion['resultado']
+
+        y_restriccion = coef * (x_vals ** exp)
+        if operador == "<=":
+            rellenos.append(ax.fill_between(x_vals, y_vals.min(), y_vals.max(), where=(y_restriccion <= resultado),
+                                            color='grey', alpha=0.3))
+        elif operador == ">=":
+            rellenos.append(ax.fill_between(x_vals, y_vals.min(), y_vals.max(), where=(y_restriccion >= resultado),
+                                            color='grey', alpha=0.3))
+        actualizar_linea(ax, artistas, ("restriccion", i), x_vals, y_restriccion, linestyle='--', color='black',
+                         label='Restricción' if i == 0 else '_Restricción')
+    artistas["rellenos"] = rellenos
+
+    # Las líneas actualizadas con set_data no reajustan la escala por sí solas
+    ax.relim()
+    ax.autoscale_view()
+    actualizar_leyenda(ax)
+
+
+def obtener_corte(artistas, coeficientes_objetivo, exponentes_objetivo, restricciones, var_indices, limites,
+                  idx_fijo, valores_fijos, punto_optimo, presupuesto):
+    """
+    Devuelve el corte precalculado ('precalcular_corte'), reutilizando el guardado en
+    'artistas' si el problema, la variable fija, la vista y el presupuesto no cambiaron.
+    """
+    clave = repr((coeficientes_objetivo, exponentes_objetivo, restricciones, var_indices, limites,
+                  idx_fijo, list(valores_fijos), punto_optimo, presupuesto))
+    cortes = artistas.setdefault("cortes", {})
+    if clave not in cortes:
+        cortes[clave] = precalcular_corte(coeficientes_objetivo, exponentes_objetivo, restricciones, var_indices,
+                                          limites, idx_fijo, valores_fijos, punto_optimo, presupuesto)
+    return cortes[clave]
 
-        # Mostrar la leyenda
-        ax.legend()
 
-        plt.show()
+def dibujar_superficie(fig, ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima,
+                       restricciones, presupuesto=PRESUPUESTO_PUNTOS):
+    """
+    Dibuja la superficie 3D de la función objetivo de dos variables con la región factible
+    proyectada y el óptimo marcado.
 
-    elif num_variables == 3:
-        # Caso de tres variables
-        # Fijar una variable (la que tiene el valor óptimo más alto)
-        idx_max = np.argmax(solucion_optima)
-        var_fija = solucion_optima[idx_max]
-        var_fija_label = f'x{idx_max + 1}'
-
-        # Variables para graficar
-        var_indices = [i for i in range(num_variables) if i != idx_max]
-        x_vals = [np.linspace(0, max(solucion_optima[i]*1.5, 10), 100) for i in var_indices]
-        X1, X2 = np.meshgrid(x_vals[0], x_vals[1])
-
-        # Definir la función objetivo con la variable fija
-        def funcion_objetivo(x1, x2):
-            variables = [0]*num_variables
-            variables[var_indices[0]] = x1
-            variables[var_indices[1]] = x2
-            variables[idx_max] = var_fija
-            return sum(coeficientes_objetivo[i] * (variables[i] ** exponentes_objetivo[i]) for i in range(num_variables))
-
-        # Calcular los valores de Z usando la función objetivo
-        Z = funcion_objetivo(X1, X2)
-
-        # Ajustar la escala del mapa de color alrededor del valor óptimo
-        if solucion_optima is not None:
-            x_opt = solucion_optima[var_indices[0]]
-            y_opt = solucion_optima[var_indices[1]]
-            valor_optimo = funcion_objetivo(x_opt, y_opt)
-            z_min = valor_optimo * 0.5
-            z_max = valor_optimo * 1.5
-        else:
-            z_min = np.min(Z)
-            z_max = np.max(Z)
+    :param fig: Figura que contiene los ejes (para la barra de color).
+    :param ax: Ejes 3D.
+    :param artistas: Diccionario con los artistas reutilizables (vacío la primera vez).
+    :param presupuesto: Número máximo de puntos de la malla.
+    """
+    limites = (max(solucion_optima[0]*1.5, 10), max(solucion_optima[1]*1.5, 10))
+    punto_optimo = (solucion_optima[0], solucion_optima[1])
+    corte = obtener_corte(artistas, coeficientes_objetivo, exponentes_objetivo, restricciones, [0, 1], limites,
+                          None, (), punto_optimo, presupuesto)
 
-        # Crear la figura y el eje 3D
-        fig = plt.figure()
-        ax = fig.add_subplot(111, projection='3d')
-
-        # Crear la superficie de la función objetivo con la escala ajustada
-        surf = ax.plot_surface(X1, X2, Z, cmap='viridis', alpha=0.8, vmin=z_min, vmax=z_max)
-
-        # Agregar la barra de color
-        fig.colorbar(surf, shrink=0.5, aspect=5)
-
-        # Marcar la solución óptima
-        if solucion_optima is not None:
-            ax.scatter(x_opt, y_opt, valor_optimo, color='red', s=50, label='Solución Óptima')
-
-            # Añadir etiquetas de los valores óptimos
-            ax.text(x_opt, y_opt, valor_optimo,
-                    f'({x_opt:.2f}, {y_opt:.2f}, {valor_optimo:.2f})',
-                    color='red')
-
-            # Mostrar el valor optimizado de la función objetivo
-            ax.text2D(0.05, 0.95, f'Valor óptimo de f(x): {valor_optimo:.2f}',
-                      transform=ax.transAxes, color='red')
-
-        # Proyectar las restricciones sobre la superficie
-        for restriccion in restricciones:
-            coeficientes = restriccion['coeficientes']
-            exponentes = restriccion['exponentes']
-            operador = restriccion['operador']
-            resultado = restriccion['resultado']
-
-            # Solo graficar restricciones que involucren las variables representadas
-            if coeficientes[idx_max] == 0:
-                coef_x1 = coeficientes[var_indices[0]]
-                exp_x1 = exponentes[var_indices[0]]
-                coef_x2 = coeficientes[var_indices[1]]
-                exp_x2 = exponentes[var_indices[1]]
-
-                # Definir la función de restricción
-                def funcion_restriccion(x1, x2):
-                    return (coef_x1 * (x1 ** exp_x1) + coef_x2 * (x2 ** exp_x2))
-
-                # Calcular los valores de la restricción sobre la malla
-                C = funcion_restriccion(X1, X2)
-
-                # Crear una máscara para la región factible
-                if operador == "<=":
-                    mask = C <= resultado
-                elif operador == ">=":
-                    mask = C >= resultado
-                else:
-                    continue  # Si el operador no es válido, saltamos esta restricción
-
-                # Proyectar la restricción sobre la superficie
-                Z_restriccion = np.where(mask, Z, np.nan)
-                ax.plot_surface(X1, X2, Z_restriccion, color='grey', alpha=0.3)
-
-                # Trazar la línea de la restricción en el nivel del resultado
-                ax.contour(X1, X2, C, levels=[resultado], colors='black', linestyles='--')
-
-        # Etiquetas y título
-        ax.set_xlabel(f'x{var_indices[0] + 1}')
-        ax.set_ylabel(f'x{var_indices[1] + 1}')
-        ax.set_zlabel('f(x)')
-        ax.set_title(f'Gráfico 3D con {var_fija_label} = {var_fija:.2f}')
-
-        # Mostrar la leyenda
-        ax.legend()
+    dibujar_corte(fig, ax, artistas, corte, None, 0.0, coeficientes_objetivo, exponentes_objetivo,
+                  solucion_optima, limites,
+                  titulo='Gráfico 3D de la función objetivo con restricciones proyectadas',
+                  etiquetas=('x₁', 'x₂', 'f(x₁, x₂)'))
 
-        plt.show()
 
+def dibujar_explorador(fig, ax, artistas, coeficientes_objetivo, exponentes_objetivo, solucion_optima,
+                       restricciones, presupuesto=PRESUPUESTO_PUNTOS):
+    """
+    Explorador de cortes para problemas de tres variables: un selector elige la variable
+    fija y un deslizador recorre su valor. Todas las restricciones se dibujan en cada corte,
+    incluido el aporte de la variable fija.
+
+    Para cada variable fija la malla y los términos de cada eje se calculan una sola vez
+    (refinando cerca de los bordes de las restricciones a lo largo de todo el recorrido), así
+    que cada paso del deslizador es una suma con broadcasting más el dibujo.
+
+    :param fig: Figura que contiene los ejes (para la barra de color y los controles).
+    :param ax: Ejes 3D.
+    :param artistas: Diccionario con los artistas reutilizables (vacío la primera vez).
+    :param presupuesto: Número máximo de puntos de la malla de cada corte.
+    """
+    num_variables = len(coeficientes_objetivo)
+
+    def preparar_corte(idx_fijo):
+        var_indices = [i for i in range(num_variables) if i != idx_fijo]
+        limites = (max(solucion_optima[var_indices[0]]*1.5, 10), max(solucion_optima[var_indices[1]]*1.5, 10))
+        limite_fijo = max(solucion_optima[idx_fijo]*1.5, 10)
+        valores_fijos = np.linspace(0, limite_fijo, CORTES_REFINADOS).tolist() + [float(solucion_optima[idx_fijo])]
+        punto_optimo = (solucion_optima[var_indices[0]], solucion_optima[var_indices[1]])
+        corte = obtener_corte(artistas, coeficientes_objetivo, exponentes_objetivo, restricciones, var_indices,
+                              limites, idx_fijo, valores_fijos, punto_optimo, presupuesto)
+        return corte, var_indices, limites, limite_fijo
+
+    def dibujar(valor_fijo):
+        idx_fijo = estado["idx_fijo"]
+        corte, var_indices, limites, _ = preparar_corte(idx_fijo)
+        dibujar_corte(fig, ax, artistas, corte, idx_fijo, valor_fijo, coeficientes_objetivo, exponentes_objetivo,
+                      solucion_optima, limites,
+                      titulo=f'Gráfico 3D con x{idx_fijo + 1} = {valor_fijo:.2f}',
+                      etiquetas=(f'x{var_indices[0] + 1}', f'x{var_indices[1] + 1}', 'f(x)'))
+        fig.canvas.draw_idle()
+
+    def cambiar_variable(etiqueta):
+        idx_fijo = nombres.index(etiqueta)
+        estado["idx_fijo"] = idx_fijo
+        _, _, _, limite_fijo = preparar_corte(idx_fijo)
+        deslizador.label.set_text(etiqueta)
+        deslizador.valmin, deslizador.valmax = 0, limite_fijo
+        deslizador.ax.set_xlim(0, limite_fijo)
+        # set_val notifica al deslizador, que redibuja el corte
+        deslizador.set_val(float(solucion_optima[idx_fijo]))
+
+    # Por defecto se fija la variable con el valor óptimo más alto, en su valor óptimo
+    estado = {"idx_fijo": int(np.argmax(solucion_optima))}
+    nombres = [f'x{i + 1}' for i in range(num_variables)]
+    _, _, _, limite_fijo = preparar_corte(estado["idx_fijo"])
+
+    # Los controles se recrean en cada llamada porque sus callbacks dependen del problema
+    quitar_artistas(artistas, "controles")
+    fig.subplots_adjust(left=0.18, bottom=0.16)
+    ax_selector = fig.add_axes([0.02, 0.45, 0.1, 0.15])
+    ax_deslizador = fig.add_axes([0.25, 0.04, 0.5, 0.03])
+    artistas["controles"] = [ax_selector, ax_deslizador]
+
+    selector = RadioButtons(ax_selector, nombres, active=estado["idx_fijo"])
+    deslizador = Slider(ax_deslizador, nombres[estado["idx_fijo"]], 0, limite_fijo,
+                        valinit=float(solucion_optima[estado["idx_fijo"]]))
+    selector.on_clicked(cambiar_variable)
+    deslizador.on_changed(dibujar)
+    # Los widgets solo guardan referencias débiles a sus callbacks: hay que conservarlos
+    artistas["widgets"] = (selector, deslizador)
+
+    dibujar(deslizador.val)
+
+
+def dibujar_corte(fig, ax, artistas, corte, idx_fijo, valor_fijo, coeficientes_objetivo, exponentes_objetivo,
+                  solucion_optima, limites, titulo, etiquetas):
+    """
+    Dibuja un corte precalculado: la superficie de la función objetivo, la región factible
+    (todas las restricciones en una sola máscara), el borde de cada restricción y el óptimo.
+
+    La superficie y la región factible se recrean porque matplotlib no permite cambiar los
+    datos de una superficie, pero la barra de color, el marcador del óptimo y los textos
+    se actualizan en el lugar.
+
+    :param fig: Figura que contiene los ejes (para la barra de color).
+    :param ax: Ejes 3D.
+    :param artistas: Diccionario con los artistas reutilizables.
+    :param corte: Diccionario de 'precalcular_corte'.
+    :param idx_fijo: Índice de la variable fija, o None con dos variables.
+    :param valor_fijo: Valor de la variable fija en este corte.
+    :param limites: Tupla con el valor máximo de cada eje.
+    :param titulo: Título del gráfico.
+    :param etiquetas: Tupla con las etiquetas de los ejes x, y, z.
+    """
+    ejes = corte["ejes"]
+    X1, X2 = np.meshgrid(*ejes)
+    Z, valores_restricciones, factible = evaluar_corte(corte, valor_fijo)
+
+    # El óptimo se proyecta sobre el corte: misma posición en el plano, con la variable fija en el valor del corte
+    var_indices = [i for i in range(len(coeficientes_objetivo)) if i != idx_fijo]
+    x_opt = solucion_optima[var_indices[0]]
+    y_opt = solucion_optima[var_indices[1]]
+    punto = np.array(solucion_optima, dtype=float)
+    if idx_fijo is not None:
+        punto[idx_fijo] = valor_fijo
+    z_opt = float(np.dot(coeficientes_objetivo, punto ** np.asarray(exponentes_objetivo, dtype=float)))
+    valor_optimo = float(np.dot(coeficientes_objetivo,
+                                np.asarray(solucion_optima, dtype=float) ** np.asarray(exponentes_objetivo, dtype=float)))
+
+    # Ajustar la escala del mapa de color alrededor del valor óptimo
+    z_min = valor_optimo * 0.5
+    z_max = valor_optimo * 1.5
+
+    # Crear la superficie de la función objetivo con la escala ajustada
+    # (con paso 1 para usar todos los puntos de la malla adaptativa, que ya respeta el presupuesto)
+    quitar_artistas(artistas, "superficie")
+    surf = ax.plot_surface(X1, X2, Z, cmap='viridis', alpha=0.8, vmin=z_min, vmax=z_max, rstride=1, cstride=1)
+    artistas["superficie"] = surf
+
+    # Agregar la barra de color, o apuntar la existente a la nueva superficie
+    if "barra" in artistas:
+        artistas["barra"].update_normal(surf)
     else:
-        # Caso de más de tres variables
-        messagebox.showinfo("Información", "La graficación solo está disponible para problemas con hasta tres variables.")
+        artistas["barra"] = fig.colorbar(surf, ax=ax, shrink=0.5, aspect=5)
+
+    # Marcar la solución óptima
+    etiqueta_optimo = 'Solución Óptima'
+    if idx_fijo is not None and not np.isclose(valor_fijo, solucion_optima[idx_fijo]):
+        etiqueta_optimo = 'Solución Óptima (proyectada)'
+    if "optimo" in artistas:
+        artistas["optimo"].set_data_3d([x_opt], [y_opt], [z_opt])
+        artistas["optimo"].set_label(etiqueta_optimo)
+    else:
+        artistas["optimo"], = ax.plot([x_opt], [y_opt], [z_opt], color='red', marker='o',
+                                      linestyle='', label=etiqueta_optimo)
+
+    # Añadir etiquetas de los valores óptimos
+    texto = f'({x_opt:.2f}, {y_opt:.2f}, {z_opt:.2f})'
+    if "texto_optimo" in artistas:
+        artistas["texto_optimo"].set_position_3d((x_opt, y_opt, z_opt))
+        artistas["texto_optimo"].set_text(texto)
+    else:
+        artistas["texto_optimo"] = ax.text(x_opt, y_opt, z_opt, texto, color='red')
+
+    # Mostrar el valor optimizado de la función objetivo
+    texto_valor = f'Valor óptimo de {etiquetas[2]}: {valor_optimo:.2f}'
+    if "texto_valor" in artistas:
+        artistas["texto_valor"].set_text(texto_valor)
+    else:
+        artistas["texto_valor"] = ax.text2D(0.05, 0.95, texto_valor, transform=ax.transAxes, color='red')
+
+    # Proyectar la región factible (todas las restricciones a la vez) sobre la superficie
+    quitar_artistas(artistas, "restricciones")
+    proyecciones = []
+    if corte["restricciones"] and factible.any():
+        proyecciones.append(ax.plot_surface(X1, X2, np.where(factible, Z, np.nan), color='grey', alpha=0.3,
+                                            rstride=1, cstride=1))
+
+    # Trazar la línea de cada restricción en el nivel del resultado
+    for restriccion, C in zip(corte["restricciones"], valores_restricciones):
+        if C.min() < restriccion['resultado'] < C.max():
+            proyecciones.append(ax.contour(X1, X2, C, levels=[restriccion['resultado']], colors='black',
+                                           linestyles='--'))
+    artistas["restricciones"] = proyecciones
+
+    # Etiquetas, título y límites (las superficies quitadas no reducen la escala por sí solas)
+    ax.set_xlim(0, limites[0])
+    ax.set_ylim(0, limites[1])
+    if np.max(Z) > np.min(Z):
+        ax.set_zlim(np.min(Z), np.max(Z))
+    ax.set_xlabel(etiquetas[0])
+    ax.set_ylabel(etiquetas[1])
+    ax.set_zlabel(etiquetas[2])
+    ax.set_title(titulo)
+
+    # Mostrar la leyenda
+    actualizar_leyenda(ax, loc='lower left')
@@ -0,0 +1,79 @@
+"""
+Diagnóstico de modelos no lineales infactibles: localiza un subconjunto irreducible de
+restricciones en conflicto (IIS) resolviendo problemas de factibilidad (objetivo nulo)
+sobre subconjuntos de restricciones.
+
+Cada resolución parte del último punto factible encontrado, que ya cumple buena parte de
+las restricciones del subconjunto siguiente. Como los resolvedores son locales, que uno no
+encuentre un punto factible no demuestra que no exista; por eso el conflicto se repasa al
+final con el filtro de eliminación, de modo que cada restricción devuelta sea necesaria
+para el resolvedor.
+"""
+import numpy as np
+from comun.infactibilidad import buscar_conflicto
+from npl.optimizacion_npl import resolver, validar_datos
+from npl.polinomios_npl import contar_variables
+
+
+def problema_factibilidad(datos_optimizacion, indices):
+    """
+    Construye el problema de factibilidad de un subconjunto de restricciones.
+
+    :param datos_optimizacion: Diccionario con los datos del problema no lineal.
+    :param indices: Índices de las restricciones que se conservan.
+    :return: Diccionario de datos con objetivo nulo y solo esas restricciones.
+    """
+    num_variables = contar_variables(datos_optimizacion)
+    return {
+        "tipo_problema": "min",
+        "num_variables": num_variables,
+        "coeficientes_objetivo": [0.0] * num_variables,
+        "exponentes_objetivo": [1] * num_variables,
+        "restricciones": [datos_optimizacion["restricciones"][i] for i in indices],
+    }
+
+
+def crear_evaluador_factibilidad(datos_optimizacion, metodo="auto"):
+    """
+    Crea una función que comprueba si un subconjunto de restricciones tiene solución,
+    arrancando cada resolución desde el último punto factible encontrado y, si desde él no
+    se encuentra ninguno, desde el punto inicial por defecto.
+
+    :param datos_optimizacion: Diccionario con los datos del problema no lineal.
+    :param metodo: Método de resolución; ver 'npl.optimizacion_npl.resolver'.
+    :return: Función que recibe índices de restricciones y devuelve True si el resolvedor
+             encontró un punto que las cumple.
+    """
+    punto = {"x0": None}
+
+    def es_factible(indices):
+        problema = problema_factibilidad(datos_optimizacion, indices)
+        resultado = resolver(problema, x0=punto["x0"], metodo=metodo)
+        if not resultado["exito"] and punto["x0"] is not None:
+            # El punto anterior puede ser un mal arranque (por ejemplo, un vértice con
+            # gradientes nulos); antes de declarar la infactibilidad se prueba el habitual
+            resultado = resolver(problema, metodo=metodo)
+        if resultado["estado"] == "error":
+            raise ValueError(resultado["mensaje"])
+        if resultado["exito"]:
+            punto["x0"] = np.asarray(resultado["variables"], dtype=float)
+        return resultado["exito"]
+
+    return es_factible
+
+
+def buscar_iis(datos_optimizacion, metodo="auto"):
+    """
+    Busca las restricciones de un problema no lineal infactible que están en conflicto.
+
+    :param datos_optimizacion: Diccionario con los datos del problema no lineal.
+    :param metodo: Método de resolución; ver 'npl.optimizacion_npl.resolver'.
+    :return: Diccionario de 'buscar_conflicto': 'restricciones' con los índices (en el orden
+             de 'datos_optimizacion["restricciones"]') de un subconjunto mínimo para el que
+             no se encontró punto factible, o None si se encontró para el problema completo.
+    :raises ValueError: Si los datos no tienen el formato esperado.
+    """
+    validar_datos(datos_optimizacion)
+    return buscar_conflicto(len(datos_optimizacion["restricciones"]),
+                            crear_evaluador_factibilidad(datos_optimizacion, metodo),
+                            verificar=True)
@@ -0,0 +1,333 @@
+"""
+Resolución por lotes de muchos problemas no lineales separables pequeños.
+
+Los problemas con el mismo número de variables y de restricciones se apilan en arrays de
+forma (lote, variables) y (lote, restricciones, variables) y se resuelven todos a la vez con
+un método primal-dual de punto interior: en cada iteración se evalúan el objetivo, las
+restricciones y sus derivadas primeras y segundas de todo el lote con operaciones de numpy y
+se resuelven a la vez los sistemas de Newton de las condiciones KKT, que con pocas variables
+son matrices pequeñas (lote x n x n). Como los modelos son separables, los hessianos del
+objetivo y de cada restricción son diagonales.
+
+Los problemas que no convergen (o que no son separables) se resuelven después uno a uno
+con 'npl.optimizacion_npl.resolver' y SLSQP.
+"""
+import time
+import numpy as np
+
+from npl.optimizacion_npl import resolver, validar_datos
+from npl.polinomios_npl import es_polinomico
+
+# Tolerancia de factibilidad, estacionariedad y complementariedad (relativas)
+TOLERANCIA = 1e-6
+
+# Iteraciones de Newton del punto interior
+MAX_ITERACIONES = 50
+
+# Fracción del paso hasta la frontera (x, holguras y multiplicadores positivos)
+FRACCION_FRONTERA = 0.995
+
+# Reducción del parámetro de barrera respecto de la complementariedad media
+REDUCCION_BARRERA = 0.1
+
+# Autovalor mínimo de la matriz de Newton; por debajo se regulariza (problemas no convexos)
+AUTOVALOR_MINIMO = 1e-8
+
+# Norma de x a partir de la cual se considera que el problema no está acotado
+LIMITE_DIVERGENCIA = 1e8
+
+
+def apilar_lote(lista_datos):
+    """
+    Apila problemas con el mismo número de variables y de restricciones.
+
+    :param lista_datos: Lista de diccionarios datos_optimizacion separables.
+    :return: Diccionario con 'coeficientes' y 'exponentes' (lote x n) del objetivo ya en
+             forma de minimización, 'matriz' y 'exponentes_restricciones' (lote x m x n),
+             'resultados' y 'signos' (lote x m) de las restricciones, expresadas como
+             signo * (resultado - sum(a_ij * x_j ** e_ij)) >= 0, y 'signos_objetivo' (lote).
+    :raises ValueError: Si algún problema no tiene el formato esperado.
+    """
+    for datos in lista_datos:
+        validar_datos(datos)
+        if datos["tipo_problema"] not in ("max", "min"):
+            raise ValueError("Tipo de problema no válido. Debe ser 'max' o 'min'.")
+        if any(r["operador"] not in ("<=", ">=") for r in datos["restricciones"]):
+            raise ValueError("Operador de restricción inválido.")
+
+    tamano = len(lista_datos)
+    num_variables = len(lista_datos[0]["coeficientes_objetivo"])
+    num_restricciones = len(lista_datos[0]["restricciones"])
+    signos_objetivo = np.array([-1.0 if d["tipo_problema"] == "max" else 1.0 for d in lista_datos])
+
+    def restricciones(campo):
+        return np.array([[r[campo] for r in d["restricciones"]] for d in lista_datos],
+                        dtype=float).reshape(tamano, num_restricciones, -1)
+
+    return {
+        "coeficientes": signos_objetivo[:, None] * np.array([d["coeficientes_objetivo"] for d in lista_datos],
+                                                            dtype=float),
+        "exponentes": np.array([d["exponentes_objetivo"] for d in lista_datos], dtype=float),
+        "matriz": restricciones("coeficientes").reshape(tamano, num_restricciones, num_variables),
+        "exponentes_restricciones": restricciones("exponentes").reshape(tamano, num_restricciones, num_variables),
+        "resultados": restricciones("resultado").reshape(tamano, num_restricciones),
+        "signos": np.array([[1.0 if r["operador"] == "<=" else -1.0 for r in d["restricciones"]]
+                            for d in lista_datos]).reshape(tamano, num_restricciones),
+        "signos_objetivo": signos_objetivo,
+    }
+
+
+def seleccionar(lote, indices):
+    """
+    Extrae un sublote con los problemas indicados.
+
+    :return: Diccionario con el formato de 'apilar_lote'.
+    """
+    return {clave: valor[indices] for clave, valor in lote.items()}
+
+
+def evaluar_lote(lote, x):
+    """
+    Evalúa objetivo, restricciones y sus derivadas en todos los problemas del lote.
+
+    :param lote: Diccionario de 'apilar_lote'.
+    :param x: Array (lote x n) con un punto estrictamente positivo por problema.
+    :return: Diccionario con 'objetivo' (lote), 'gradiente' y 'hessiano' (diagonal del
+             hessiano, lote x n) del objetivo, y 'restricciones' (lote x m), 'jacobiano' y
+             'hessianos' (diagonales, lote x m x n) de las restricciones.
+    """
+    def derivadas(coeficientes, exponentes, base):
+        valor = coeficientes * base ** exponentes
+        primera = coeficientes * exponentes * base ** (exponentes - 1)
+        # Con exponente 0 o 1 la derivada segunda es nula; se evita elevar a potencias negativas
+        lineal = (exponentes == 0) | (exponentes == 1)
+        segunda = np.where(lineal, 0.0, coeficientes * exponentes * (exponentes - 1)
+                           * base ** np.where(lineal, 0.0, exponentes - 2))
+        return valor, primera, segunda
+
+    objetivo, gradiente, hessiano = derivadas(lote["coeficientes"], lote["exponentes"], x)
+
+    # Restricción i: signo_i * resultado_i + sum(-signo_i * a_ij * x_j ** e_ij)
+    matriz = -lote["signos"][:, :, None] * lote["matriz"]
+    terminos, jacobiano, hessianos = derivadas(matriz, lote["exponentes_restricciones"], x[:, None, :])
+
+    return {
+        "objetivo": objetivo.sum(axis=1),
+        "gradiente": gradiente,
+        "hessiano": hessiano,
+        "restricciones": lote["signos"] * lote["resultados"] + terminos.sum(axis=2),
+        "jacobiano": jacobiano,
+        "hessianos": hessianos,
+    }
+
+
+def paso_maximo(valores, direcciones):
+    """
+    Calcula el mayor paso en [0, 1] que mantiene positivos los valores, con la fracción
+    FRACCION_FRONTERA de la distancia a la frontera.
+
+    :param valores: Array (lote x k) estrictamente positivo.
+    :param direcciones: Array (lote x k) con la dirección de cada valor.
+    :return: Array (lote) con el paso de cada problema.
+    """
+    cocientes = np.where(direcciones < 0, -valores / np.where(direcciones < 0, direcciones, -1.0), np.inf)
+    return np.minimum(1.0, FRACCION_FRONTERA * np.min(cocientes, axis=1, initial=np.inf))
+
+
+def resolver_grupo(lote, tolerancia=TOLERANCIA):
+    """
+    Resuelve un lote apilado con un método primal-dual de punto interior.
+
+    Con holguras s para c(x) >= 0, multiplicadores z de las restricciones y w de x >= 0, cada
+    iteración resuelve el sistema de Newton reducido
+
+        (H + J^T diag(z / s) J + diag(w / x)) dx = -grad f + J^T (mu / s - z / s * (c - s)) + mu / x
+
+    donde H es el hessiano del Lagrangiano; si la matriz no es definida positiva se le suma
+    un múltiplo de la identidad. La barrera mu baja con la complementariedad media.
+
+    :param lote: Diccionario de 'apilar_lote'.
+    :param tolerancia: Tolerancia relativa de factibilidad, estacionariedad y complementariedad.
+    :return: Diccionario con 'variables' (lote x n), 'objetivo' (lote, en la forma de
+             minimización), 'convergido' (lote), 'iteraciones' y 'evaluaciones'.
+    """
+    tamano, num_variables = lote["coeficientes"].shape
+    num_restricciones = lote["resultados"].shape[1]
+    identidad = np.eye(num_variables)
+
+    x = np.ones((tamano, num_variables))
+    evaluacion = evaluar_lote(lote, x)
+    holguras = np.maximum(evaluacion["restricciones"], 1.0)
+    multiplicadores = np.ones((tamano, num_restricciones))
+    multiplicadores_cotas = np.ones((tamano, num_variables))
+    convergido = np.zeros(tamano, dtype=bool)
+    pendientes = np.arange(tamano)
+    escala_restricciones = 1 + np.abs(lote["resultados"])
+    iteraciones = 0
+    evaluaciones = 0
+
+    with np.errstate(all="ignore"):
+        for iteracion in range(MAX_ITERACIONES):
+            iteraciones = iteracion + 1
+            sublote = seleccionar(lote, pendientes)
+            xp, s = x[pendientes], holguras[pendientes]
+            z, w = multiplicadores[pendientes], multiplicadores_cotas[pendientes]
+            evaluacion = evaluar_lote(sublote, xp)
+            evaluaciones += 1
+            c, jacobiano = evaluacion["restricciones"], evaluacion["jacobiano"]
+
+            # Condiciones KKT del problema original
+            gradiente_lagrangiano = evaluacion["gradiente"] - np.einsum("bm,bmn->bn", z, jacobiano) - w
+            escala_x = 1 + np.max(np.abs(xp), axis=1)
+            violacion = np.max(np.maximum(0.0, -c) / escala_restricciones[pendientes], axis=1, initial=0.0)
+            escala_multiplicadores = 1 + np.maximum(np.max(z, axis=1, initial=0.0), np.max(w, axis=1))
+            estacionariedad = np.max(np.abs(gradiente_lagrangiano), axis=1) / escala_multiplicadores
+            complementariedad = np.maximum(np.max(np.abs(z * np.maximum(c, 0.0)), axis=1, initial=0.0),
+                                           np.max(w * xp, axis=1))
+            listo = ((violacion <= tolerancia) & (estacionariedad <= tolerancia * escala_x)
+                     & (complementariedad <= tolerancia * escala_multiplicadores))
+            convergido[pendientes[listo]] = True
+
+            # Se descartan los resueltos y los que divergen o dan valores no finitos
+            valido = (np.all(np.isfinite(gradiente_lagrangiano), axis=1) & np.all(np.isfinite(c), axis=1)
+                      & np.all(np.isfinite(evaluacion["hessiano"]), axis=1)
+                      & np.all(np.isfinite(evaluacion["hessianos"]), axis=(1, 2))
+                      & (np.max(xp, axis=1) < LIMITE_DIVERGENCIA))
+            seguir = ~listo & valido
+            if not seguir.any():
+                break
+            pendientes = pendientes[seguir]
+            xp, s, z, w, c, jacobiano = xp[seguir], s[seguir], z[seguir], w[seguir], c[seguir], jacobiano[seguir]
+            gradiente = evaluacion["gradiente"][seguir]
+            hessiano_objetivo = evaluacion["hessiano"][seguir]
+            hessianos = evaluacion["hessianos"][seguir]
+
+            mu = REDUCCION_BARRERA * (np.sum(s * z, axis=1) + np.sum(xp * w, axis=1)) / (num_restricciones + num_variables)
+
+            # Matriz de Newton reducida: J^T diag(z / s) J es semidefinida positiva, así que
+            # solo puede no ser definida positiva si la diagonal tiene algún término negativo
+            diagonal = hessiano_objetivo - np.einsum("bm,bmn->bn", z, hessianos) + w / xp
+            matriz = np.matmul(np.swapaxes(jacobiano, 1, 2), (z / s)[:, :, None] * jacobiano)
+            matriz[:, np.arange(num_variables), np.arange(num_variables)] += diagonal
+            # Las matrices no finitas (desbordamiento) se sustituyen por la identidad y el
+            # problema se descarta en la iteración siguiente al quedar x sin valor
+            finita = np.all(np.isfinite(matriz), axis=(1, 2))
+            matriz[~finita] = identidad
+            escala = np.max(np.abs(matriz), axis=(1, 2))
+            dudosas = np.flatnonzero(finita & np.any(diagonal <= AUTOVALOR_MINIMO * escala[:, None], axis=1))
+            if len(dudosas):
+                autovalores = np.linalg.eigvalsh(matriz[dudosas])
+                umbral = AUTOVALOR_MINIMO * (1 + np.abs(autovalores[:, -1]))
+                matriz[dudosas] += np.maximum(0.0, umbral - autovalores[:, 0])[:, None, None] * identidad
+
+            termino = mu[:, None] / s - z / s * (c - s)
+            derecha = -gradiente + np.einsum("bmn,bm->bn", jacobiano, termino) + mu[:, None] / xp
+            try:
+                dx = np.linalg.solve(matriz, derecha[:, :, None])[:, :, 0]
+            except np.linalg.LinAlgError:
+                # Alguna matriz es singular en coma flotante pese a la regularización
+                dx = np.matmul(np.linalg.pinv(matriz), derecha[:, :, None])[:, :, 0]
+            dx[~finita] = np.nan
+
+            ds = np.einsum("bmn,bn->bm", jacobiano, dx) + c - s
+            dz = termino - z - z / s * np.einsum("bmn,bn->bm", jacobiano, dx)
+            dw = (mu[:, None] - xp * w - w * dx) / xp
+
+            paso_primal = np.minimum(paso_maximo(xp, dx), paso_maximo(s, ds))
+            paso_dual = np.minimum(paso_maximo(z, dz), paso_maximo(w, dw))
+            x[pendientes] = xp + paso_primal[:, None] * dx
+            holguras[pendientes] = s + paso_primal[:, None] * ds
+            multiplicadores[pendientes] = z + paso_dual[:, None] * dz
+            multiplicadores_cotas[pendientes] = w + paso_dual[:, None] * dw
+
+        objetivo = evaluar_lote(lote, x)["objetivo"]
+
+    return {
+        "variables": x,
+        "objetivo": objetivo,
+        "convergido": convergido & np.isfinite(objetivo),
+        "iteraciones": iteraciones,
+        "evaluaciones": evaluaciones,
+    }
+
+
+def resolver_lote(lista_datos, tolerancia=TOLERANCIA, respaldo=True):
+    """
+    Resuelve una colección de problemas no lineales separables, típicamente muchos
+    problemas pequeños que solo difieren en los coeficientes.
+
+    Los problemas con igual número de variables y restricciones se resuelven juntos con
+    'resolver_grupo'; los que no convergen se resuelven uno a uno con SLSQP si 'respaldo'
+    es True. Cada problema parte de x = 1, igual que 'resolver', pero en problemas no
+    convexos ambos métodos pueden llegar a óptimos locales distintos.
+
+    :param lista_datos: Iterable de diccionarios con el formato que acepta 'resolver'.
+    :param tolerancia: Tolerancia relativa de las condiciones de optimalidad del lote.
+    :param respaldo: Si es False, los problemas que no convergen se devuelven con estado
+                     'no_convergio' en lugar de resolverse con SLSQP.
+    :return: Lista de resultados con el formato de 'resolver', en el orden de la entrada;
+             'metodo' es 'lote' o el método con que se resolvió el problema individualmente.
+    """
+    inicio = time.perf_counter()
+    lista_datos = list(lista_datos)
+    resultados = [None] * len(lista_datos)
+
+    # Agrupar por forma; los problemas con monomios o mal formados van directamente a 'resolver'
+    grupos = {}
+    individuales = []
+    for indice, datos in enumerate(lista_datos):
+        try:
+            if es_polinomico(datos):
+                raise ValueError("El método por lotes solo admite modelos separables.")
+            forma = (len(datos["coeficientes_objetivo"]), len(datos["restricciones"]))
+        except (KeyError, TypeError, ValueError):
+            individuales.append(indice)
+            continue
+        grupos.setdefault(forma, []).append(indice)
+
+    for indices in grupos.values():
+        try:
+            lote = apilar_lote([lista_datos[i] for i in indices])
+        except (KeyError, TypeError, ValueError):
+            individuales.extend(indices)
+            continue
+
+        solucion = resolver_grupo(lote, tolerancia)
+        for posicion, indice in enumerate(indices):
+            if not solucion["convergido"][posicion]:
+                individuales.append(indice)
+                continue
+            resultados[indice] = {
+                "estado": "optimo",
+                "exito": True,
+                "mensaje": "Convergencia del método de punto interior por lotes",
+                "valor_optimo": float(lote["signos_objetivo"][posicion] * solucion["objetivo"][posicion]),
+                "variables": solucion["variables"][posicion].copy(),
+                "iteraciones": solucion["iteraciones"],
+                "evaluaciones": solucion["evaluaciones"],
+                "metodo": "lote",
+                "tiempo": 0.0,
+            }
+
+    for indice in sorted(individuales):
+        if respaldo:
+            resultados[indice] = resolver(lista_datos[indice], metodo="slsqp")
+        else:
+            resultados[indice] = {
+                "estado": "no_convergio",
+                "exito": False,
+                "mensaje": "El método por lotes no convergió.",
+                "valor_optimo": None,
+                "variables": None,
+                "iteraciones": 0,
+                "evaluaciones": 0,
+                "metodo": "lote",
+                "tiempo": 0.0,
+            }
+
+    # El tiempo del lote se reparte entre sus problemas
+    promedio = (time.perf_counter() - inicio) / max(len(lista_datos), 1)
+    for resultado in resultados:
+        if resultado["metodo"] == "lote":
+            resultado["tiempo"] = promedio
+    return resultados
@@ -0,0 +1,232 @@
+import numpy as np
+
+# Número máximo de puntos de la malla de una superficie 3D
+PRESUPUESTO_PUNTOS = 6000
+
+# Puntos por eje de la malla inicial, antes de refinar
+PUNTOS_INICIALES = 17
+
+# Error de interpolación lineal tolerado, relativo al rango de la función en la vista
+TOLERANCIA_CURVATURA = 2e-3
+
+# Ancho mínimo de un intervalo, relativo al ancho del eje, por debajo del cual no se refina
+ANCHO_MINIMO = 1 / 512
+
+
+def proyectar_en_plano(coeficientes, exponentes, var_indices, valores_fijos):
+    """
+    Restringe una función separable sum(c_i * x_i ** e_i) al plano de dos variables,
+    sumando en una constante el aporte de las variables fijas.
+
+    :param coeficientes: Lista de coeficientes de todas las variables.
+    :param exponentes: Lista de exponentes de todas las variables.
+    :param var_indices: Índices de las dos variables que se representan en los ejes.
+    :param valores_fijos: Diccionario {índice: valor} con las variables fijas.
+    :return: Diccionario con 'coeficientes' y 'exponentes' de los dos ejes y 'constante'.
+    """
+    constante = sum(coeficientes[i] * (valor ** exponentes[i]) for i, valor in valores_fijos.items())
+    return {
+        "coeficientes": [coeficientes[i] for i in var_indices],
+        "exponentes": [exponentes[i] for i in var_indices],
+        "constante": float(constante),
+    }
+
+
+def evaluar_terminos(funcion, ejes):
+    """
+    Evalúa por separado el término de cada eje de una función del plano.
+
+    :param funcion: Diccionario de 'proyectar_en_plano'.
+    :param ejes: Lista con las coordenadas 1D de cada eje.
+    :return: Lista con un array por eje.
+    """
+    return [funcion["coeficientes"][k] * (ejes[k] ** funcion["exponentes"][k]) for k in range(2)]
+
+
+def evaluar_en_malla(funcion, ejes):
+    """
+    Evalúa una función separable del plano en la malla producto de los dos ejes como suma
+    exterior de los términos 1D, sin evaluar potencias sobre la malla completa.
+
+    :param funcion: Diccionario de 'proyectar_en_plano'.
+    :param ejes: Tupla (x, y) con las coordenadas de cada eje.
+    :return: Array de forma (len(y), len(x)), igual que np.meshgrid(x, y).
+    """
+    termino_x, termino_y = evaluar_terminos(funcion, ejes)
+    return termino_y[:, None] + termino_x[None, :] + funcion["constante"]
+
+
+def marcar_intervalos(objetivo, restricciones, ejes, limites, punto_optimo):
+    """
+    Marca los intervalos de cada eje que conviene dividir: donde la función objetivo se
+    curva más de lo tolerado, donde cruza el borde de alguna restricción y donde está el óptimo.
+
+    :return: Lista con un array booleano por eje (un valor por intervalo).
+    """
+    marcas = [np.zeros(len(eje) - 1, dtype=bool) for eje in ejes]
+    medios = [(eje[1:] + eje[:-1]) / 2 for eje in ejes]
+
+    # La función es separable: el error de interpolación de cada eje depende solo de su término
+    terminos = evaluar_terminos(objetivo, ejes)
+    terminos_medios = evaluar_terminos(objetivo, medios)
+    escala = max(sum(np.ptp(termino) for termino in terminos), 1e-12)
+    for k in range(2):
+        error = np.abs(terminos_medios[k] - (terminos[k][1:] + terminos[k][:-1]) / 2)
+        marcas[k] |= error > TOLERANCIA_CURVATURA * escala
+
+    # Celdas cuyas esquinas quedan a distintos lados del borde de una restricción
+    for restriccion in restricciones:
+        lado = evaluar_en_malla(restriccion, ejes) <= restriccion["resultado"]
+        esquina = lado[:-1, :-1]
+        cruza = (esquina != lado[1:, :-1]) | (esquina != lado[:-1, 1:]) | (esquina != lado[1:, 1:])
+        marcas[0] |= cruza.any(axis=0)
+        marcas[1] |= cruza.any(axis=1)
+
+    # Intervalo que contiene el óptimo
+    if punto_optimo is not None:
+        for k in range(2):
+            i = np.searchsorted(ejes[k], punto_optimo[k]) - 1
+            marcas[k][np.clip(i, 0, len(marcas[k]) - 1)] = True
+
+    # No dividir intervalos demasiado estrechos
+    for k in range(2):
+        marcas[k] &= np.diff(ejes[k]) > ANCHO_MINIMO * limites[k]
+    return marcas
+
+
+def recortar_a_presupuesto(marcas, ejes, presupuesto):
+    """
+    Reduce las marcas para que la malla refinada no supere el presupuesto de puntos,
+    dividiendo primero los intervalos más anchos de cada eje.
+
+    :return: Tupla (marcas ajustadas, True si hubo que recortar).
+    """
+    tamanos = [len(eje) for eje in ejes]
+    marcados = [int(m.sum()) for m in marcas]
+    if (tamanos[0] + marcados[0]) * (tamanos[1] + marcados[1]) <= presupuesto:
+        return marcas, False
+
+    # Mayor fracción t de los intervalos marcados que cabe en el presupuesto
+    a = marcados[0] * marcados[1]
+    b = tamanos[0] * marcados[1] + tamanos[1] * marcados[0]
+    c = tamanos[0] * tamanos[1] - presupuesto
+    if a > 0:
+        fraccion = (-b + np.sqrt(max(b * b - 4 * a * c, 0.0))) / (2 * a)
+    else:
+        fraccion = -c / b if b > 0 else 0.0
+    fraccion = float(np.clip(fraccion, 0.0, 1.0))
+
+    recortadas = []
+    for k in range(2):
+        cantidad = int(np.floor(fraccion * marcados[k]))
+        marcadas = np.flatnonzero(marcas[k])
+        anchos = np.diff(ejes[k])[marcadas]
+        nuevas = np.zeros_like(marcas[k])
+        nuevas[marcadas[np.argsort(-anchos, kind="stable")[:cantidad]]] = True
+        recortadas.append(nuevas)
+    return recortadas, True
+
+
+def muestrear_adaptativo(objetivo, restricciones, limites, punto_optimo=None, presupuesto=PRESUPUESTO_PUNTOS):
+    """
+    Construye una malla rectilínea no uniforme sobre [0, limites[0]] x [0, limites[1]]:
+    parte de una malla gruesa y divide por la mitad los intervalos de cada eje marcados por
+    'marcar_intervalos' hasta que no quedan marcas o se agota el presupuesto de puntos.
+
+    :param objetivo: Función objetivo en el plano (diccionario de 'proyectar_en_plano').
+    :param restricciones: Restricciones en el plano, con 'operador' y 'resultado'.
+    :param limites: Tupla con el valor máximo de cada eje.
+    :param punto_optimo: Coordenadas del óptimo en el plano, o None.
+    :param presupuesto: Número máximo de puntos de la malla.
+    :return: Tupla (x, y) con las coordenadas crecientes de cada eje.
+    """
+    puntos_iniciales = int(min(PUNTOS_INICIALES, max(2, np.sqrt(presupuesto))))
+    ejes = [np.linspace(0, limites[k], puntos_iniciales) for k in range(2)]
+
+    while True:
+        marcas = marcar_intervalos(objetivo, restricciones, ejes, limites, punto_optimo)
+        marcas, agotado = recortar_a_presupuesto(marcas, ejes, presupuesto)
+        if not any(m.any() for m in marcas):
+            break
+
+        for k in range(2):
+            medios = (ejes[k][1:] + ejes[k][:-1]) / 2
+            ejes[k] = np.sort(np.concatenate([ejes[k], medios[marcas[k]]]))
+        if agotado:
+            break
+
+    return ejes[0], ejes[1]
+
+
+def precalcular_corte(coeficientes_objetivo, exponentes_objetivo, restricciones, var_indices, limites,
+                      idx_fijo=None, valores_fijos=(), punto_optimo=None, presupuesto=PRESUPUESTO_PUNTOS):
+    """
+    Prepara un corte 2D del problema: la malla adaptativa y, para cada función, los términos
+    c_i * x_i ** e_i de cada eje ya evaluados, de modo que cambiar el valor de la variable
+    fija solo requiere sumarlos con broadcasting ('evaluar_corte').
+
+    :param coeficientes_objetivo: Lista de coeficientes de la función objetivo.
+    :param exponentes_objetivo: Lista de exponentes de la función objetivo.
+    :param restricciones: Lista de restricciones del problema (las de operador no válido se ignoran).
+    :param var_indices: Índices de las dos variables de los ejes.
+    :param limites: Tupla con el valor máximo de cada eje.
+    :param idx_fijo: Índice de la variable fija, o None si el problema tiene dos variables.
+    :param valores_fijos: Valores de la variable fija para los que se refina la malla cerca de
+                          los bordes de las restricciones (los del recorrido del deslizador).
+    :param punto_optimo: Coordenadas del óptimo en el plano, o None.
+    :param presupuesto: Número máximo de puntos de la malla.
+    :return: Diccionario con 'ejes', 'objetivo' y 'restricciones'; cada función guarda sus
+             'terminos' por eje y el par 'fijo' (coeficiente, exponente) de la variable fija.
+    """
+    restricciones = [r for r in restricciones if r['operador'] in ("<=", ">=")]
+
+    # La malla se adapta a los bordes de las restricciones en todos los valores indicados
+    objetivo = proyectar_en_plano(coeficientes_objetivo, exponentes_objetivo, var_indices, {})
+    planos = [
+        dict(proyectar_en_plano(r['coeficientes'], r['exponentes'], var_indices,
+                                {} if idx_fijo is None else {idx_fijo: valor}),
+             operador=r['operador'], resultado=r['resultado'])
+        for valor in (valores_fijos if idx_fijo is not None else [None])
+        for r in restricciones
+    ]
+    ejes = muestrear_adaptativo(objetivo, planos, limites, punto_optimo, presupuesto)
+
+    def preparar(coeficientes, exponentes):
+        plano = proyectar_en_plano(coeficientes, exponentes, var_indices, {})
+        fijo = (coeficientes[idx_fijo], exponentes[idx_fijo]) if idx_fijo is not None else (0.0, 1.0)
+        return {"terminos": evaluar_terminos(plano, ejes), "fijo": fijo}
+
+    return {
+        "ejes": ejes,
+        "objetivo": preparar(coeficientes_objetivo, exponentes_objetivo),
+        "restricciones": [dict(preparar(r['coeficientes'], r['exponentes']),
+                               operador=r['operador'], resultado=r['resultado'])
+                          for r in restricciones],
+    }
+
+
+def evaluar_corte(corte, valor_fijo=0.0):
+    """
+    Evalúa un corte precalculado para un valor de la variable fija.
+
+    :param corte: Diccionario de 'precalcular_corte'.
+    :param valor_fijo: Valor de la variable fija (se ignora si el problema tiene dos variables).
+    :return: Tupla (Z, lista con los valores de cada restricción, máscara de factibilidad
+             combinada), todos de forma (len(y), len(x)).
+    """
+    def sumar(funcion):
+        termino_x, termino_y = funcion["terminos"]
+        coeficiente, exponente = funcion["fijo"]
+        return termino_y[:, None] + termino_x[None, :] + coeficiente * (valor_fijo ** exponente)
+
+    Z = sumar(corte["objetivo"])
+    valores = []
+    factible = np.ones(Z.shape, dtype=bool)
+    for restriccion in corte["restricciones"]:
+        C = sumar(restriccion)
+        valores.append(C)
+        if restriccion["operador"] == "<=":
+            factible &= C <= restriccion["resultado"]
+        else:
+            factible &= C >= restriccion["resultado"]
+    return Z, valores, factible
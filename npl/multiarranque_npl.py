@@ -0,0 +1,196 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError
+from scipy.stats import qmc
+from npl.optimizacion_npl import resolver
+from npl.polinomios_npl import contar_variables
+import numpy as np
+import time
+
+
+def estimar_limite_superior(datos_optimizacion, limite_por_defecto=10.0):
+    """
+    Estima una cota superior para cada variable a partir de las restricciones '<='
+    separables cuyos términos variables tienen coeficientes no negativos
+    (a_j * x_j ** e_j <= resultado). Los términos de exponente 0 son constantes y se pasan
+    al lado derecho. Las restricciones de monomios no se usan para acotar.
+
+    :param datos_optimizacion: Diccionario con datos del problema no lineal.
+    :param limite_por_defecto: Cota usada para las variables que ninguna restricción acota.
+    :return: Array con la cota superior de cada variable.
+    """
+    num_variables = contar_variables(datos_optimizacion)
+    limites = np.full(num_variables, np.inf)
+
+    for restriccion in datos_optimizacion["restricciones"]:
+        if "monomios" in restriccion:
+            continue
+        coeficientes = np.asarray(restriccion["coeficientes"], dtype=float)
+        exponentes = np.asarray(restriccion["exponentes"], dtype=float)
+        constantes = exponentes == 0
+        resultado = restriccion["resultado"] - coeficientes[constantes].sum()
+        if restriccion["operador"] != "<=" or resultado < 0 or np.any(coeficientes[~constantes] < 0):
+            continue
+
+        positivos = (coeficientes > 0) & ~constantes
+        cotas = (resultado / coeficientes[positivos]) ** (1 / exponentes[positivos])
+        limites[positivos] = np.minimum(limites[positivos], cotas)
+
+    limites[~np.isfinite(limites) | (limites <= 0)] = limite_por_defecto
+    return limites
+
+
+def generar_puntos_iniciales(num_puntos, limite_superior, metodo_muestreo='lhs', semilla=None):
+    """
+    Genera puntos iniciales distribuidos dentro de la caja [0, limite_superior].
+
+    :param num_puntos: Cantidad de puntos a generar.
+    :param limite_superior: Array con la cota superior de cada variable.
+    :param metodo_muestreo: 'lhs' (hipercubo latino) o 'sobol'.
+    :param semilla: Semilla para que el muestreo sea reproducible.
+    :return: Array de forma (num_puntos, num_variables).
+    """
+    limite_superior = np.asarray(limite_superior, dtype=float)
+    dimension = len(limite_superior)
+
+    if metodo_muestreo == 'lhs':
+        muestreador = qmc.LatinHypercube(d=dimension, seed=semilla)
+        muestras = muestreador.random(num_puntos)
+    elif metodo_muestreo == 'sobol':
+        muestreador = qmc.Sobol(d=dimension, seed=semilla)
+        # Sobol mantiene sus propiedades de balance con potencias de dos
+        muestras = muestreador.random_base2(int(np.ceil(np.log2(max(num_puntos, 1)))))[:num_puntos]
+    else:
+        raise ValueError(f"Método de muestreo no válido: {metodo_muestreo}")
+
+    return qmc.scale(muestras, np.zeros(dimension), limite_superior)
+
+
+def agrupar_optimos(resultados, tipo_problema, tolerancia=1e-4):
+    """
+    Agrupa las soluciones convergidas que corresponden al mismo óptimo local.
+
+    :param resultados: Lista de resultados exitosos de 'resolver'.
+    :param tipo_problema: 'max' o 'min', para ordenar del mejor al peor.
+    :param tolerancia: Distancia relativa por debajo de la cual dos puntos se consideran iguales.
+    :return: Lista de diccionarios con 'variables', 'valor_optimo' y 'repeticiones'.
+    """
+    signo = -1 if tipo_problema == "max" else 1
+    ordenados = sorted(resultados, key=lambda r: signo * r["valor_optimo"])
+
+    optimos = []
+    for resultado in ordenados:
+        x = resultado["variables"]
+        for optimo in optimos:
+            if np.linalg.norm(x - optimo["variables"]) <= tolerancia * (1 + np.linalg.norm(x)):
+                optimo["repeticiones"] += 1
+                break
+        else:
+            optimos.append({
+                "variables": x,
+                "valor_optimo": resultado["valor_optimo"],
+                "repeticiones": 1,
+            })
+
+    return optimos
+
+
+def resolver_multiarranque(datos_optimizacion, num_puntos=32, metodo_muestreo='lhs',
+                           limite_superior=None, procesos=None, tiempo_limite=None,
+                           paciencia=None, semilla=None, tolerancia=1e-4,
+                           progreso=None, cancelacion=None, metodo="auto"):
+    """
+    Busca el óptimo global resolviendo el problema desde varios puntos iniciales.
+
+    :param datos_optimizacion: Diccionario con datos del problema no lineal.
+    :param num_puntos: Cantidad de puntos iniciales.
+    :param metodo_muestreo: 'lhs' (hipercubo latino) o 'sobol'.
+    :param limite_superior: Cota superior de la caja de muestreo; si es None se estima
+                            a partir de las restricciones.
+    :param procesos: Número de procesos; None usa todos los núcleos y 1 resuelve en serie.
+    :param tiempo_limite: Tiempo máximo en segundos; los arranques pendientes se descartan.
+    :param paciencia: Número de soluciones consecutivas sin mejorar la incumbente tras el
+                      cual se detiene la búsqueda.
+    :param semilla: Semilla del muestreo.
+    :param tolerancia: Tolerancia relativa para considerar iguales dos óptimos o una mejora.
+    :param progreso: Función opcional que recibe (arranques resueltos, arranques totales).
+    :param cancelacion: Evento opcional (con 'is_set') que detiene la búsqueda al activarse.
+    :param metodo: Método de resolución de cada arranque; ver 'resolver'.
+    :return: Diccionario con el formato de 'resolver' más 'optimos_locales', 'arranques'
+             (resueltos) y 'motivo_parada'.
+    """
+    inicio = time.perf_counter()
+    tipo_problema = datos_optimizacion["tipo_problema"]
+    signo = -1 if tipo_problema == "max" else 1
+
+    if limite_superior is None:
+        limite_superior = estimar_limite_superior(datos_optimizacion)
+    puntos = generar_puntos_iniciales(num_puntos, limite_superior, metodo_muestreo, semilla)
+
+    exitosos = []
+    mejor = None
+    sin_mejora = 0
+    resueltos = 0
+    motivo_parada = "completado"
+
+    def registrar(resultado):
+        # Actualiza la incumbente y devuelve True si se debe detener la búsqueda
+        nonlocal mejor, sin_mejora, resueltos, motivo_parada
+        resueltos += 1
+        if progreso is not None:
+            progreso(resueltos, num_puntos)
+        if cancelacion is not None and cancelacion.is_set():
+            motivo_parada = "cancelado"
+            return True
+        if resultado["exito"]:
+            exitosos.append(resultado)
+            umbral = tolerancia * (1 + abs(mejor["valor_optimo"])) if mejor else 0
+            if mejor is None or signo * (mejor["valor_optimo"] - resultado["valor_optimo"]) > umbral:
+                mejor = resultado
+                sin_mejora = 0
+                return False
+        sin_mejora += 1
+        return paciencia is not None and sin_mejora >= paciencia
+
+    if procesos == 1:
+        for x0 in puntos:
+            if tiempo_limite is not None and time.perf_counter() - inicio > tiempo_limite:
+                motivo_parada = "tiempo_limite"
+                break
+            if registrar(resolver(datos_optimizacion, x0, metodo)):
+                if motivo_parada == "completado":
+                    motivo_parada = "sin_mejora"
+                break
+    else:
+        executor = ProcessPoolExecutor(max_workers=procesos)
+        try:
+            futuros = [executor.submit(resolver, datos_optimizacion, x0, metodo) for x0 in puntos]
+            restante = None if tiempo_limite is None else max(0.0, tiempo_limite - (time.perf_counter() - inicio))
+            try:
+                for futuro in as_completed(futuros, timeout=restante):
+                    if registrar(futuro.result()):
+                        if motivo_parada == "completado":
+                            motivo_parada = "sin_mejora"
+                        break
+            except TimeoutError:
+                motivo_parada = "tiempo_limite"
+        finally:
+            # No esperar a los arranques pendientes si la búsqueda terminó antes
+            executor.shutdown(wait=motivo_parada == "completado", cancel_futures=True)
+
+    if mejor is not None:
+        resultado = dict(mejor)
+    else:
+        resultado = {
+            "estado": "no_convergio",
+            "exito": False,
+            "mensaje": "Ningún punto inicial convergió a una solución factible.",
+            "valor_optimo": None,
+            "variables": None,
+            "iteraciones": 0,
+            "evaluaciones": 0,
+        }
+
+    resultado["optimos_locales"] = agrupar_optimos(exitosos, tipo_problema, tolerancia)
+    resultado["arranques"] = resueltos
+    resultado["motivo_parada"] = motivo_parada
+    resultado["tiempo"] = time.perf_counter() - inicio
+    return resultado
@@ -1,6 +1,39 @@
-from scipy.optimize import minimize
-from tkinter import messagebox
+from scipy.optimize import minimize, NonlinearConstraint
+from scipy import sparse
+from comun.cache_optimizacion import CacheOptimizacion, resolver_en_cache
+from comun.infactibilidad import describir_conflicto
+from comun.instrumentacion import medir, instrumentar
+from npl.compilador_npl import obtener_compilado, instanciar
+from npl.polinomios_npl import (es_polinomico, contar_variables, construir_polinomio,
+                                evaluar_polinomio, derivar_polinomio, hessiano_polinomio)
 import numpy as np
+import time
+
+# Traducción de los códigos de salida de SLSQP a estados legibles
+ESTADOS_SLSQP = {
+    0: "optimo",
+    4: "infactible",
+    9: "limite_iteraciones",
+}
+
+# Traducción de los códigos de salida de trust-constr; la infactibilidad se detecta aparte
+ESTADOS_TRUST_CONSTR = {
+    0: "limite_iteraciones",
+    1: "optimo",
+    2: "optimo",
+}
+
+# Violación de restricciones por encima de la cual trust-constr se considera infactible
+TOLERANCIA_FACTIBILIDAD = 1e-6
+
+# Selección automática: a partir de este número de variables, y si la fracción de coeficientes
+# no nulos de las restricciones no supera DENSIDAD_DISPERSA, se usa trust-constr con
+# jacobiano disperso en lugar de SLSQP, cuyo subproblema es denso
+UMBRAL_GRANDE = 500
+DENSIDAD_DISPERSA = 0.1
+
+# Caché usada por 'optimizar'; puede reemplazarse por una con nivel en disco o por None
+cache_resultados = CacheOptimizacion(tamano_maximo=256)
 
 def construir_funcion_objetivo(coeficientes, exponentes):
     """
@@ -10,11 +43,34 @@ def construir_funcion_objetivo(coeficientes, exponentes):
     :param exponentes: Lista de exponentes para cada variable.
     :return: Función objetivo lista para ser utilizada en la optimización.
     """
+    # Compilar los datos una sola vez en arrays de numpy
+    coeficientes = np.asarray(coeficientes, dtype=float)
+    exponentes = np.asarray(exponentes, dtype=float)
+
     def funcion_objetivo(variables):
-        # Calcula la suma de c_i * (x_i ** e_i) para cada variable
-        return sum(c * (v ** e) for c, v, e in zip(coeficientes, variables, exponentes))
+        # Calcula la suma de c_i * (x_i ** e_i) como un único producto punto
+        return np.dot(coeficientes, np.asarray(variables, dtype=float) ** exponentes)
+
+    return instrumentar(funcion_objetivo, "objetivo")
+
+def construir_gradiente_objetivo(coeficientes, exponentes):
+    """
+    Construye el gradiente exacto de la función objetivo separable.
+
+    :param coeficientes: Lista de coeficientes para cada variable.
+    :param exponentes: Lista de exponentes para cada variable.
+    :return: Función que devuelve el vector c_i * e_i * x_i ** (e_i - 1).
+    """
+    coeficientes = np.asarray(coeficientes, dtype=float)
+    exponentes = np.asarray(exponentes, dtype=float)
+    factores = coeficientes * exponentes
+    # Los términos constantes (exponente 0) tienen derivada nula; elevarlos a 0 evita 0 * inf en x = 0
+    potencias = np.where(factores != 0, exponentes - 1, 0.0)
+
+    def gradiente_objetivo(variables):
+        return factores * np.asarray(variables, dtype=float) ** potencias
 
-    return funcion_objetivo
+    return instrumentar(gradiente_objetivo, "gradiente")
 
 def crear_funcion_restriccion(coeficientes, exponentes, resultado, operador):
     """
@@ -26,103 +82,647 @@ def crear_funcion_restriccion(coeficientes, exponentes, resultado, operador):
     :param operador: Operador de la restricción ('<=', '>=').
     :return: Función de restricción lista para ser utilizada en la optimización.
     """
+    coeficientes = np.asarray(coeficientes, dtype=float)
+    exponentes = np.asarray(exponentes, dtype=float)
+
     if operador == "<=":
         def restriccion_func(variables):
             # Para '<=': resultado - sum(a_i * x_i ** e_i) >= 0
-            return resultado - sum(coef * (var ** exp) for coef, var, exp in zip(coeficientes, variables, exponentes))
+            return resultado - np.dot(coeficientes, np.asarray(variables, dtype=float) ** exponentes)
     elif operador == ">=":
         def restriccion_func(variables):
             # Para '>=': sum(a_i * x_i ** e_i) - resultado >= 0
-            return sum(coef * (var ** exp) for coef, var, exp in zip(coeficientes, variables, exponentes)) - resultado
+            return np.dot(coeficientes, np.asarray(variables, dtype=float) ** exponentes) - resultado
     else:
         raise ValueError(f"Operador de restricción inválido: {operador}")
 
-    return restriccion_func
+    return instrumentar(restriccion_func, "restriccion")
+
+def compilar_restricciones(restricciones_datos):
+    """
+    Apila todas las restricciones en matrices de coeficientes y exponentes.
+
+    Cada restricción se expresa como signo * (resultado - sum(a_i * x_i ** e_i)) >= 0,
+    con signo 1 para '<=' y -1 para '>='.
+
+    :param restricciones_datos: Lista de diccionarios con datos de restricciones.
+    :return: Tupla (coeficientes, exponentes, resultados, signos) como arrays de numpy.
+    """
+    coeficientes = []
+    exponentes = []
+    resultados = []
+    signos = []
+    for dato in restricciones_datos:
+        operador = dato['operador']
+        if operador == "<=":
+            signos.append(1.0)
+        elif operador == ">=":
+            signos.append(-1.0)
+        else:
+            raise ValueError(f"Operador de restricción inválido: {operador}")
+
+        coeficientes.append(dato['coeficientes'])
+        exponentes.append(dato['exponentes'])
+        resultados.append(dato['resultado'])
+
+    return (np.array(coeficientes, dtype=float),
+            np.array(exponentes, dtype=float),
+            np.array(resultados, dtype=float),
+            np.array(signos, dtype=float))
 
 def construir_restricciones(restricciones_datos):
     """
-    Construye una lista de restricciones para la optimización.
+    Construye la lista de restricciones para la optimización.
+
+    Todas las restricciones se agrupan en una sola restricción vectorial, de modo que
+    cada evaluación calcula todas las filas en una única operación de numpy.
 
     :param restricciones_datos: Lista de diccionarios con datos de restricciones.
     :return: Lista de restricciones en el formato requerido por scipy.optimize.
     """
-    restricciones = []
+    if not restricciones_datos:
+        return []
+
+    coeficientes, exponentes, resultados, signos = compilar_restricciones(restricciones_datos)
+
+    def restricciones_func(variables):
+        # signo * (resultado - sum(a_ij * x_j ** e_ij)) >= 0 para cada fila
+        potencias = np.asarray(variables, dtype=float) ** exponentes
+        return signos * (resultados - np.einsum('ij,ij->i', coeficientes, potencias))
+
+    # Jacobiano exacto: -signo_i * a_ij * e_ij * x_j ** (e_ij - 1)
+    factores = -signos[:, np.newaxis] * coeficientes * exponentes
+    # Como en el gradiente del objetivo, los términos constantes no se derivan
+    potencias_jacobiano = np.where(factores != 0, exponentes - 1, 0.0)
+
+    def jacobiano_restricciones(variables):
+        return factores * np.asarray(variables, dtype=float) ** potencias_jacobiano
+
+    return [{'type': 'ineq',
+             'fun': instrumentar(restricciones_func, "restricciones"),
+             'jac': instrumentar(jacobiano_restricciones, "jacobiano_restricciones")}]
+
+def validar_datos(datos_optimizacion):
+    """
+    Comprueba que estén todos los campos del problema no lineal.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :raises ValueError: Si falta algún campo.
+    """
+    objetivo_separable = all(k in datos_optimizacion for k in ["coeficientes_objetivo", "exponentes_objetivo"])
+    if (not all(k in datos_optimizacion for k in ["tipo_problema", "restricciones"])
+            or not (objetivo_separable or "monomios_objetivo" in datos_optimizacion)):
+        raise ValueError("Faltan datos en la entrada.")
+
+def construir_polinomios(datos_optimizacion):
+    """
+    Construye la representación de monomios ('npl.polinomios_npl') del objetivo y de las
+    restricciones, con los signos ya aplicados: el objetivo en forma de minimización y las
+    restricciones como constante + polinomio >= 0, igual que en 'compilar_restricciones'.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :return: Tupla (polinomio del objetivo, polinomio de las restricciones, constantes).
+    :raises ValueError: Si los datos no tienen el formato esperado.
+    """
+    num_variables = contar_variables(datos_optimizacion)
+    if "monomios_objetivo" in datos_optimizacion:
+        objetivo = {"monomios": datos_optimizacion["monomios_objetivo"]}
+    else:
+        objetivo = {"coeficientes": datos_optimizacion["coeficientes_objetivo"],
+                    "exponentes": datos_optimizacion["exponentes_objetivo"]}
+    polinomio_objetivo = construir_polinomio([objetivo], num_variables)
+    if datos_optimizacion["tipo_problema"] == "max":
+        polinomio_objetivo["coeficientes"] = -polinomio_objetivo["coeficientes"]
+
+    restricciones_datos = datos_optimizacion["restricciones"]
+    signos = np.array([1.0 if r['operador'] == "<=" else -1.0 for r in restricciones_datos])
     for dato in restricciones_datos:
-        # Extraer datos de la restricción
-        coeficientes = dato['coeficientes']
-        exponentes = dato['exponentes']
-        resultado = dato['resultado']
-        operador = dato['operador']
+        if dato['operador'] not in ("<=", ">="):
+            raise ValueError(f"Operador de restricción inválido: {dato['operador']}")
+    resultados = np.array([r['resultado'] for r in restricciones_datos], dtype=float)
+
+    # signo * (resultado - polinomio) = signo * resultado + (-signo) * polinomio
+    polinomio_restricciones = construir_polinomio(restricciones_datos, num_variables)
+    polinomio_restricciones["coeficientes"] = (-signos[polinomio_restricciones["salidas"]]
+                                               * polinomio_restricciones["coeficientes"])
+    return polinomio_objetivo, polinomio_restricciones, signos * resultados
+
+def construir_funciones_polinomicas(datos_optimizacion, disperso=False):
+    """
+    Construye el objetivo, su gradiente y las restricciones de un problema con monomios.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param disperso: Si es True las restricciones se devuelven como NonlinearConstraint de
+                     trust-constr, con jacobiano y hessiano CSR; si no, en el formato de SLSQP.
+    :return: Tupla (objetivo, gradiente, lista de restricciones, hessiano del objetivo),
+             con el objetivo ya en forma de minimización.
+    """
+    polinomio_objetivo, polinomio_restricciones, constantes = construir_polinomios(datos_optimizacion)
+
+    def funcion_objetivo(variables):
+        return evaluar_polinomio(polinomio_objetivo, variables)[0]
+
+    def gradiente_objetivo(variables):
+        return derivar_polinomio(polinomio_objetivo, variables)[0]
 
-        # Crear la función de restricción considerando el operador
-        funcion_restriccion = crear_funcion_restriccion(coeficientes, exponentes, resultado, operador)
+    def restricciones_func(variables):
+        return constantes + evaluar_polinomio(polinomio_restricciones, variables)
 
-        # Agregar la restricción al listado como una inecuación
-        restricciones.append({'type': 'ineq', 'fun': funcion_restriccion})
+    def jacobiano_restricciones(variables):
+        return derivar_polinomio(polinomio_restricciones, variables, disperso)
 
-    return restricciones
+    def hessiano_objetivo(variables):
+        return hessiano_polinomio(polinomio_objetivo, variables, [1.0])
 
-def optimizar(datos_optimizacion):
+    def hessiano_restricciones(variables, multiplicadores):
+        return hessiano_polinomio(polinomio_restricciones, variables, multiplicadores)
+
+    restricciones = []
+    if datos_optimizacion["restricciones"]:
+        restricciones_func = instrumentar(restricciones_func, "restricciones")
+        jacobiano_restricciones = instrumentar(jacobiano_restricciones, "jacobiano_restricciones")
+        if disperso:
+            restricciones = [NonlinearConstraint(restricciones_func, 0, np.inf, jac=jacobiano_restricciones,
+                                                 hess=instrumentar(hessiano_restricciones, "hessiano_restricciones"))]
+        else:
+            restricciones = [{'type': 'ineq', 'fun': restricciones_func, 'jac': jacobiano_restricciones}]
+    return (instrumentar(funcion_objetivo, "objetivo"), instrumentar(gradiente_objetivo, "gradiente"),
+            restricciones, instrumentar(hessiano_objetivo, "hessiano"))
+
+def construir_funciones_compiladas(datos_optimizacion):
     """
-    Ejecuta la optimización no lineal basada en los datos proporcionados.
+    Construye el objetivo, su gradiente y las restricciones con el compilador de modelos
+    ('npl.compilador_npl'), que genera código especializado y lo guarda por hash del modelo.
 
     :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
-    :return: Variables óptimas si se encuentra solución; None en caso contrario.
+    :return: Tupla (objetivo, gradiente, restricciones) con el objetivo ya en forma de
+             minimización, o None si el modelo es pequeño o tiene demasiados exponentes
+             distintos ('npl.compilador_npl.obtener_compilado').
     """
-    try:
+    coeficientes = np.asarray(datos_optimizacion["coeficientes_objetivo"], dtype=float)
+    exponentes = np.asarray(datos_optimizacion["exponentes_objetivo"], dtype=float)
+    restricciones_datos = datos_optimizacion["restricciones"]
+    if restricciones_datos:
+        matriz_coeficientes, matriz_exponentes, resultados, signos = compilar_restricciones(restricciones_datos)
+    else:
+        matriz_coeficientes = matriz_exponentes = np.zeros((0, len(coeficientes)))
+        resultados = signos = np.zeros(0)
+
+    compilado = obtener_compilado(datos_optimizacion["tipo_problema"], coeficientes, exponentes,
+                                  matriz_coeficientes, matriz_exponentes, resultados, signos)
+    if compilado is None:
+        return None
+
+    funciones = instanciar(compilado)
+    restricciones = []
+    if restricciones_datos:
+        restricciones = [{'type': 'ineq',
+                          'fun': instrumentar(funciones["restricciones"], "restricciones"),
+                          'jac': instrumentar(funciones["jacobiano"], "jacobiano_restricciones")}]
+    return (instrumentar(funciones["objetivo"], "objetivo"),
+            instrumentar(funciones["gradiente"], "gradiente"),
+            restricciones)
+
+def construir_modelo(datos_optimizacion, compilar=True):
+    """
+    Construye las funciones, gradientes, restricciones y límites del problema no lineal.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param compilar: Si es True se usan las funciones generadas por el compilador de modelos
+                     cuando es posible; si no, las funciones genéricas.
+    :return: Diccionario con 'objetivo', 'gradiente', 'restricciones', 'bounds',
+             'num_variables' y 'tipo_problema', listo para scipy.optimize.minimize.
+    :raises ValueError: Si los datos no tienen el formato esperado.
+    """
+    validar_datos(datos_optimizacion)
+
+    # Determinar si el problema es de maximización o minimización
+    tipo_problema = datos_optimizacion["tipo_problema"]
+    if tipo_problema not in ("max", "min"):
+        raise ValueError("Tipo de problema no válido. Debe ser 'max' o 'min'.")
+
+    # Número de variables en el problema
+    num_variables = contar_variables(datos_optimizacion)
+
+    if es_polinomico(datos_optimizacion):
+        # Modelo con monomios (términos cruzados)
+        funciones = construir_funciones_polinomicas(datos_optimizacion)
+    elif compilar:
+        funciones = construir_funciones_compiladas(datos_optimizacion)
+    else:
+        funciones = None
+
+    if funciones is not None:
+        funcion_objetivo_modificada, gradiente_modificado, restricciones = funciones[:3]
+    else:
         # Extraer coeficientes y exponentes de la función objetivo
         coeficientes_objetivo = datos_optimizacion["coeficientes_objetivo"]
         exponentes_objetivo = datos_optimizacion["exponentes_objetivo"]
         funcion_objetivo = construir_funcion_objetivo(coeficientes_objetivo, exponentes_objetivo)
+        gradiente_objetivo = construir_gradiente_objetivo(coeficientes_objetivo, exponentes_objetivo)
 
         # Construir las restricciones
-        restricciones_datos = datos_optimizacion["restricciones"]
-        restricciones = construir_restricciones(restricciones_datos)
-
-        # Número de variables en el problema
-        num_variables = len(coeficientes_objetivo)
+        restricciones = construir_restricciones(datos_optimizacion["restricciones"])
 
-        # Determinar si el problema es de maximización o minimización
-        tipo_problema = datos_optimizacion["tipo_problema"]
         if tipo_problema == "max":
             # Si es maximización, minimizar el negativo de la función objetivo
             funcion_objetivo_modificada = lambda x: -funcion_objetivo(x)
+            gradiente_modificado = lambda x: -gradiente_objetivo(x)
         else:
             # Si es minimización, utilizar la función objetivo tal cual
             funcion_objetivo_modificada = funcion_objetivo
+            gradiente_modificado = gradiente_objetivo
+
+    # Definir límites para las variables (por ejemplo, no negativas)
+    bounds = [(0, None) for _ in range(num_variables)]
+
+    return {
+        "objetivo": funcion_objetivo_modificada,
+        "gradiente": gradiente_modificado,
+        "restricciones": restricciones,
+        "bounds": bounds,
+        "num_variables": num_variables,
+        "tipo_problema": tipo_problema,
+    }
+
+def construir_hessiano_objetivo(coeficientes, exponentes, tipo_problema):
+    """
+    Construye el hessiano exacto de la función objetivo (ya con el signo de la minimización),
+    que es diagonal por ser separable.
+
+    :param coeficientes: Lista de coeficientes para cada variable.
+    :param exponentes: Lista de exponentes para cada variable.
+    :param tipo_problema: 'max' o 'min'.
+    :return: Función que devuelve el hessiano como matriz diagonal dispersa.
+    """
+    signo = -1.0 if tipo_problema == "max" else 1.0
+    exponentes = np.asarray(exponentes, dtype=float)
+    factores = signo * np.asarray(coeficientes, dtype=float) * exponentes * (exponentes - 1)
+    # Los términos lineales tienen derivada segunda nula; se excluyen para no evaluar 0 ** -1
+    curvos = factores != 0
 
-        # Definir límites para las variables (por ejemplo, no negativas)
-        bounds = [(0, None) for _ in range(num_variables)]
+    def hessiano_objetivo(variables):
+        diagonal = np.zeros(len(factores))
+        diagonal[curvos] = factores[curvos] * np.asarray(variables, dtype=float)[curvos] ** (exponentes[curvos] - 2)
+        return sparse.diags(diagonal, dtype=float)
 
-        # Ejecutar la optimización
-        resultado = minimize(
-            funcion_objetivo_modificada,          # Función objetivo a minimizar
-            x0=[1] * num_variables,               # Valor inicial para las variables
-            bounds=bounds,                        # Límites de las variables
-            constraints=restricciones,            # Restricciones del problema
+    return instrumentar(hessiano_objetivo, "hessiano")
+
+def construir_restriccion_dispersa(restricciones_datos, num_variables):
+    """
+    Construye las restricciones como un único NonlinearConstraint de trust-constr con
+    jacobiano disperso (solo se evalúan los coeficientes no nulos) y hessiano exacto.
+
+    :param restricciones_datos: Lista de diccionarios con datos de restricciones.
+    :param num_variables: Número de variables del problema.
+    :return: Lista con el NonlinearConstraint, o vacía si no hay restricciones.
+    """
+    if not restricciones_datos:
+        return []
+
+    coeficientes, exponentes, resultados, signos = compilar_restricciones(restricciones_datos)
+    filas, columnas = np.nonzero(coeficientes)
+    num_filas = len(resultados)
+
+    # Estructura CSR fija: np.nonzero recorre la matriz por filas
+    punteros = np.concatenate([[0], np.cumsum(np.bincount(filas, minlength=num_filas))])
+    valores = coeficientes[filas, columnas]
+    potencias = exponentes[filas, columnas]
+    factores_jacobiano = -signos[filas] * valores * potencias
+    # Los términos constantes (exponente 0) se elevan a 0 para no evaluar 0 * inf en x = 0
+    potencias_jacobiano = np.where(factores_jacobiano != 0, potencias - 1, 0.0)
+    factores_hessiano = -signos[filas] * valores * potencias * (potencias - 1)
+    curvos = factores_hessiano != 0
+
+    def restricciones_func(variables):
+        terminos = valores * np.asarray(variables, dtype=float)[columnas] ** potencias
+        return signos * (resultados - np.bincount(filas, weights=terminos, minlength=num_filas))
+
+    def jacobiano_restricciones(variables):
+        datos = factores_jacobiano * np.asarray(variables, dtype=float)[columnas] ** potencias_jacobiano
+        return sparse.csr_matrix((datos, columnas, punteros), shape=(num_filas, num_variables))
+
+    def hessiano_restricciones(variables, multiplicadores):
+        # sum_i v_i * H_i, con cada H_i diagonal
+        x = np.asarray(variables, dtype=float)[columnas[curvos]]
+        pesos = (np.asarray(multiplicadores, dtype=float)[filas[curvos]] * factores_hessiano[curvos]
+                 * x ** (potencias[curvos] - 2))
+        return sparse.diags(np.bincount(columnas[curvos], weights=pesos, minlength=num_variables), dtype=float)
+
+    return [NonlinearConstraint(instrumentar(restricciones_func, "restricciones"), 0, np.inf,
+                                jac=instrumentar(jacobiano_restricciones, "jacobiano_restricciones"),
+                                hess=instrumentar(hessiano_restricciones, "hessiano_restricciones"))]
+
+def clasificar_modelo(datos_optimizacion):
+    """
+    Analiza la estructura del problema para elegir el método de resolución.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :return: Diccionario con 'lineal' (todos los términos con coeficiente no nulo tienen
+             exponente 1), 'num_variables' y 'densidad' (fracción de coeficientes no nulos
+             de las restricciones).
+    """
+    if es_polinomico(datos_optimizacion):
+        # Los modelos con monomios se tratan siempre como no lineales; la densidad es la
+        # fracción de pares (restricción, variable) que aparecen en algún monomio
+        num_variables = contar_variables(datos_optimizacion)
+        _, polinomio, _ = construir_polinomios(datos_optimizacion)
+        pares = np.unique(polinomio["salidas_entradas"] * num_variables + polinomio["exponentes"].indices)
+        celdas = num_variables * polinomio["num_salidas"]
+        return {
+            "lineal": False,
+            "num_variables": num_variables,
+            "densidad": len(pares) / celdas if celdas else 0.0,
+        }
+
+    coeficientes = [np.asarray(datos_optimizacion["coeficientes_objetivo"], dtype=float)]
+    exponentes = [np.asarray(datos_optimizacion["exponentes_objetivo"], dtype=float)]
+    for restriccion in datos_optimizacion["restricciones"]:
+        coeficientes.append(np.asarray(restriccion["coeficientes"], dtype=float))
+        exponentes.append(np.asarray(restriccion["exponentes"], dtype=float))
+
+    num_variables = len(coeficientes[0])
+    lineal = all(np.all(e[c != 0] == 1) for c, e in zip(coeficientes, exponentes))
+    no_nulos = sum(np.count_nonzero(c) for c in coeficientes[1:])
+    celdas = num_variables * (len(coeficientes) - 1)
+
+    return {
+        "lineal": bool(lineal),
+        "num_variables": num_variables,
+        "densidad": no_nulos / celdas if celdas else 0.0,
+    }
+
+def seleccionar_metodo(clasificacion):
+    """
+    Elige el método más barato que resuelve correctamente un problema con la estructura dada.
+
+    :param clasificacion: Diccionario de 'clasificar_modelo'.
+    :return: Nombre de un método de METODOS.
+    """
+    if clasificacion["lineal"]:
+        return "highs"
+    if clasificacion["num_variables"] >= UMBRAL_GRANDE and clasificacion["densidad"] <= DENSIDAD_DISPERSA:
+        return "trust-constr"
+    return "slsqp"
+
+def resolver_slsqp(datos_optimizacion, x0):
+    """
+    Resuelve el problema con SLSQP, el método general para problemas pequeños y medianos.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param x0: Punto inicial.
+    :return: Diccionario con 'estado', 'exito', 'mensaje', 'valor_optimo', 'variables',
+             'iteraciones' y 'evaluaciones'.
+    """
+    with medir("construccion"):
+        modelo = construir_modelo(datos_optimizacion)
+
+    with medir("resolucion"):
+        res = minimize(
+            modelo["objetivo"],                   # Función objetivo a minimizar
+            x0=x0,                                # Valor inicial para las variables
+            jac=modelo["gradiente"],              # Gradiente exacto de la función objetivo
+            bounds=modelo["bounds"],              # Límites de las variables
+            constraints=modelo["restricciones"],  # Restricciones del problema
             method='SLSQP',                       # Método de optimización
             options={'disp': False}               # No mostrar mensajes en consola
         )
 
-        # Verificar si la optimización fue exitosa
-        if resultado.success:
-            # Obtener el valor óptimo original (considerando si era maximización)
-            valor_optimo = -resultado.fun if tipo_problema == "max" else resultado.fun
-
-            # Redondear los resultados para presentación
-            variables_optimas = np.round(resultado.x, decimals=4)
-            valor_optimo = np.round(valor_optimo, decimals=4)
-
-            # Mostrar mensaje con el valor óptimo y las variables óptimas
-            messagebox.showinfo(
-                "Solución óptima",
-                f"Valor óptimo: {valor_optimo}\nVariables óptimas: {variables_optimas}"
-            )
-            return variables_optimas  # Retornar las variables óptimas
+    signo_objetivo = -1 if modelo["tipo_problema"] == "max" else 1
+    return {
+        "estado": ESTADOS_SLSQP.get(res.status, "no_convergio"),
+        "exito": bool(res.success),
+        "mensaje": res.message,
+        "valor_optimo": float(signo_objetivo * res.fun) if res.success else None,
+        "variables": np.asarray(res.x, dtype=float) if res.success else None,
+        "iteraciones": int(getattr(res, "nit", 0)),
+        "evaluaciones": int(getattr(res, "nfev", 0)),
+    }
+
+def resolver_trust_constr(datos_optimizacion, x0):
+    """
+    Resuelve el problema con trust-constr, usando el hessiano exacto y un jacobiano disperso
+    de las restricciones; escala mejor que SLSQP en problemas grandes y poco densos.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param x0: Punto inicial.
+    :return: Diccionario con el formato de 'resolver_slsqp'.
+    """
+    with medir("construccion"):
+        if es_polinomico(datos_optimizacion):
+            validar_datos(datos_optimizacion)
+            objetivo, gradiente, restricciones, hessiano = construir_funciones_polinomicas(datos_optimizacion,
+                                                                                          disperso=True)
+            modelo = {"objetivo": objetivo, "gradiente": gradiente,
+                      "bounds": [(0, None)] * contar_variables(datos_optimizacion),
+                      "tipo_problema": datos_optimizacion["tipo_problema"]}
         else:
-            # Mostrar mensaje de error si no se encontró solución
-            messagebox.showerror("Error", "No se encontró una solución óptima.")
-            return None  # Retornar None si no hay solución
+            # Las restricciones densas del modelo no se usan: se construyen dispersas más abajo
+            modelo = construir_modelo(datos_optimizacion, compilar=False)
+            hessiano = construir_hessiano_objetivo(datos_optimizacion["coeficientes_objetivo"],
+                                                   datos_optimizacion["exponentes_objetivo"],
+                                                   modelo["tipo_problema"])
+            restricciones = construir_restriccion_dispersa(datos_optimizacion["restricciones"],
+                                                           modelo["num_variables"])
+
+    with medir("resolucion"):
+        res = minimize(
+            modelo["objetivo"],
+            x0=x0,
+            jac=modelo["gradiente"],
+            hess=hessiano,
+            bounds=modelo["bounds"],
+            constraints=restricciones,
+            method='trust-constr',
+            options={'disp': False}
+        )
+
+    # trust-constr termina con éxito aunque no encuentre un punto factible
+    factible = res.constr_violation <= TOLERANCIA_FACTIBILIDAD
+    exito = bool(res.success) and factible
+    estado = ESTADOS_TRUST_CONSTR.get(res.status, "no_convergio")
+    if estado == "optimo" and not factible:
+        estado = "infactible"
+
+    signo_objetivo = -1 if modelo["tipo_problema"] == "max" else 1
+    return {
+        "estado": estado,
+        "exito": exito,
+        "mensaje": res.message,
+        "valor_optimo": float(signo_objetivo * res.fun) if exito else None,
+        "variables": np.asarray(res.x, dtype=float) if exito else None,
+        "iteraciones": int(getattr(res, "nit", 0)),
+        "evaluaciones": int(getattr(res, "nfev", 0)),
+    }
+
+def resolver_highs(datos_optimizacion, x0):
+    """
+    Resuelve con HiGHS un problema cuyos términos tienen todos exponente 1, que es lineal.
+    El punto inicial no se usa.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param x0: Punto inicial (ignorado).
+    :return: Diccionario con el formato de 'resolver_slsqp'.
+    """
+    from pl.optimizacion_pl import resolver as resolver_pl
+
+    if not clasificar_modelo(datos_optimizacion)["lineal"]:
+        raise ValueError("El método 'highs' solo admite modelos con todos los exponentes iguales a 1.")
+
+    datos_lineales = {
+        "tipo_problema": datos_optimizacion["tipo_problema"],
+        "variables": datos_optimizacion["coeficientes_objetivo"],
+        "restricciones": [{"coeficientes": r["coeficientes"], "operador": r["operador"],
+                           "resultado": r["resultado"]}
+                          for r in datos_optimizacion["restricciones"]],
+    }
+    res = resolver_pl(datos_lineales)
+    # Los errores de datos se propagan igual que en los demás métodos
+    if res["estado"] == "error":
+        raise ValueError(res["mensaje"])
+
+    return {
+        "estado": res["estado"],
+        "exito": res["exito"],
+        "mensaje": res["mensaje"],
+        "valor_optimo": res["valor_optimo"],
+        "variables": res["variables"],
+        "iteraciones": res["iteraciones"],
+        "evaluaciones": 0,
+    }
+
+# Métodos de resolución disponibles; cada uno recibe (datos_optimizacion, x0)
+METODOS = {
+    "slsqp": resolver_slsqp,
+    "trust-constr": resolver_trust_constr,
+    "highs": resolver_highs,
+}
+
+def resolver(datos_optimizacion, x0=None, metodo="auto"):
+    """
+    Resuelve un problema de optimización no lineal sin interactuar con la interfaz gráfica.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param x0: Punto inicial; por defecto se usa 1 para cada variable.
+    :param metodo: Nombre de un método de METODOS, o 'auto' para elegirlo según la
+                   estructura del problema ('seleccionar_metodo').
+    :return: Diccionario con 'estado', 'exito', 'mensaje', 'valor_optimo', 'variables'
+             (precisión completa), 'iteraciones', 'evaluaciones', 'metodo' (el usado)
+             y 'tiempo' en segundos.
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        "estado": "error",
+        "exito": False,
+        "mensaje": "",
+        "valor_optimo": None,
+        "variables": None,
+        "iteraciones": 0,
+        "evaluaciones": 0,
+        "metodo": None,
+        "tiempo": 0.0,
+    }
+
+    try:
+        validar_datos(datos_optimizacion)
+        if metodo == "auto":
+            metodo = seleccionar_metodo(clasificar_modelo(datos_optimizacion))
+        elif metodo not in METODOS:
+            raise ValueError(f"Método no válido: {metodo}. Opciones: auto, {', '.join(METODOS)}.")
+
+        if x0 is None:
+            x0 = [1] * contar_variables(datos_optimizacion)
+
+        resultado.update(METODOS[metodo](datos_optimizacion, x0))
+        resultado["metodo"] = metodo
+
+    except (KeyError, ValueError) as e:
+        resultado["mensaje"] = str(e)
+
+    resultado["tiempo"] = time.perf_counter() - inicio
+    return resultado
+
+def resolver_para_interfaz(datos_optimizacion, arranques=1, progreso=None, cancelacion=None, metodo="auto"):
+    """
+    Resuelve el problema con la caché que usa la interfaz gráfica. No muestra mensajes,
+    por lo que puede ejecutarse en un hilo de trabajo.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param arranques: Número de puntos iniciales; con más de uno se usa la búsqueda multiarranque.
+    :param progreso: Función opcional que recibe (arranques resueltos, arranques totales).
+    :param cancelacion: Evento opcional que detiene la búsqueda multiarranque al activarse.
+    :param metodo: Método de resolución; ver 'resolver'.
+    :return: Diccionario de resultado de 'resolver'; si no se encontró solución y el
+             diagnóstico de 'npl.infactibilidad_npl.buscar_iis' halla restricciones en
+             conflicto, incluye 'conflicto' con sus índices.
+    """
+    # 'auto' no se incluye en la clave para conservar las entradas ya guardadas
+    opciones = {} if metodo == "auto" else {"metodo": metodo}
+
+    if arranques > 1:
+        from npl.multiarranque_npl import resolver_multiarranque
+
+        def resolver_arranques(datos, num_puntos, **opciones_metodo):
+            return resolver_multiarranque(datos, num_puntos=num_puntos,
+                                          progreso=progreso, cancelacion=cancelacion,
+                                          **opciones_metodo)
+
+        resultado = resolver_en_cache("npl", datos_optimizacion, resolver_arranques,
+                                      cache_resultados, num_puntos=arranques, **opciones)
+    else:
+        resultado = resolver_en_cache("npl", datos_optimizacion, resolver, cache_resultados, **opciones)
+
+    # Los fallos de SLSQP no siempre se deben a la infactibilidad; si el problema de
+    # factibilidad completo tiene solución, el diagnóstico termina tras una resolución
+    if (not resultado["exito"] and resultado["estado"] != "error"
+            and resultado.get("motivo_parada") != "cancelado"):
+        from npl.infactibilidad_npl import buscar_iis
+        resultado["conflicto"] = buscar_iis(datos_optimizacion, metodo)["restricciones"]
+    return resultado
+
+def mostrar_resultado(resultado):
+    """
+    Muestra el resultado de una optimización en un cuadro de diálogo.
+    Debe llamarse desde el hilo de Tk.
+
+    :param resultado: Diccionario de resultado de 'resolver'.
+    :return: Variables óptimas redondeadas si se encontró solución; None en caso contrario.
+    """
+    from tkinter import messagebox
+
+    # Verificar si la optimización fue exitosa
+    if resultado["exito"]:
+        # Redondear los resultados para presentación
+        variables_optimas = np.round(resultado["variables"], decimals=4)
+        valor_optimo = np.round(resultado["valor_optimo"], decimals=4)
+
+        # Mostrar mensaje con el valor óptimo y las variables óptimas
+        messagebox.showinfo(
+            "Solución óptima",
+            f"Valor óptimo: {valor_optimo}\nVariables óptimas: {variables_optimas}"
+        )
+        return variables_optimas  # Retornar las variables óptimas
+    elif resultado["estado"] == "error":
+        messagebox.showerror("Error", resultado["mensaje"])
+        return None
+    else:
+        # Mostrar mensaje de error si no se encontró solución
+        messagebox.showerror("Error", describir_conflicto(resultado))
+        return None  # Retornar None si no hay solución
+
+def optimizar(datos_optimizacion, arranques=1):
+    """
+    Ejecuta la optimización no lineal basada en los datos proporcionados.
+
+    :param datos_optimizacion: Diccionario con datos necesarios para la optimización.
+    :param arranques: Número de puntos iniciales; con más de uno se usa la búsqueda multiarranque.
+    :return: Variables óptimas si se encuentra solución; None en caso contrario.
+    """
+    # La interfaz gráfica solo se importa aquí para que 'resolver' funcione sin pantalla
+    from tkinter import messagebox
+
+    try:
+        return mostrar_resultado(resolver_para_interfaz(datos_optimizacion, arranques))
 
     except Exception as e:
         # Manejar excepciones y mostrar mensaje de error
@@ -0,0 +1,245 @@
+"""
+Modelos no lineales polinómicos con términos cruzados.
+
+Además del formato separable (listas paralelas de coeficientes y exponentes, un término
+por variable), el objetivo y cada restricción pueden darse como una lista de monomios:
+
+    {"coeficiente": 2.0, "exponentes": {0: 1, 2: 2}}     ->  2 * x0 * x2 ** 2
+
+con 'monomios_objetivo' en lugar de 'coeficientes_objetivo'/'exponentes_objetivo' y
+'monomios' en lugar de 'coeficientes'/'exponentes' en la restricción. Si el objetivo es de
+monomios, 'num_variables' indica el número de variables. Los índices pueden ser cadenas,
+como en JSON.
+
+Internamente un polinomio es un array de coeficientes, una matriz CSR de exponentes
+(un monomio por fila, una variable por columna) y la salida (fila de restricción) a la
+que suma cada monomio. La evaluación y las derivadas se calculan sobre todos los monomios
+a la vez con operaciones de numpy, sin bucles de Python.
+"""
+import numpy as np
+from scipy import sparse
+
+
+def es_polinomico(datos_optimizacion):
+    """
+    Indica si el problema usa el formato de monomios en el objetivo o en alguna restricción.
+
+    :param datos_optimizacion: Diccionario con los datos del problema no lineal.
+    :return: True si hay monomios.
+    """
+    return ("monomios_objetivo" in datos_optimizacion
+            or any("monomios" in r for r in datos_optimizacion.get("restricciones", [])))
+
+
+def contar_variables(datos_optimizacion):
+    """
+    Obtiene el número de variables de un problema no lineal en cualquiera de los formatos.
+
+    :param datos_optimizacion: Diccionario con los datos del problema no lineal.
+    :return: Número de variables.
+    :raises ValueError: Si el objetivo es de monomios y no se indica 'num_variables'.
+    """
+    if "num_variables" in datos_optimizacion:
+        return int(datos_optimizacion["num_variables"])
+    if "coeficientes_objetivo" in datos_optimizacion:
+        return len(datos_optimizacion["coeficientes_objetivo"])
+    raise ValueError("Falta 'num_variables' en un problema con objetivo de monomios.")
+
+
+def entradas_monomios(parte, num_variables):
+    """
+    Convierte el objetivo o una restricción en arrays de monomios.
+
+    :param parte: Diccionario con 'monomios', o con 'coeficientes' y 'exponentes' separables.
+    :param num_variables: Número de variables del problema.
+    :return: Tupla (coeficientes, variables por monomio, columnas, exponentes) con un
+             coeficiente y una cantidad de variables por monomio y una columna y un
+             exponente por entrada.
+    :raises ValueError: Si los datos no son compatibles con el número de variables.
+    """
+    if "monomios" in parte:
+        monomios = parte["monomios"]
+        coeficientes = np.fromiter((m["coeficiente"] for m in monomios), dtype=float, count=len(monomios))
+        cantidades = np.fromiter((len(m["exponentes"]) for m in monomios), dtype=np.int64, count=len(monomios))
+        columnas = np.fromiter((int(i) for m in monomios for i in m["exponentes"]), dtype=np.int64,
+                               count=int(cantidades.sum()))
+        exponentes = np.fromiter((e for m in monomios for e in m["exponentes"].values()), dtype=float,
+                                 count=int(cantidades.sum()))
+    else:
+        coeficientes = np.asarray(parte["coeficientes"], dtype=float)
+        exponentes = np.asarray(parte["exponentes"], dtype=float)
+        if len(coeficientes) != num_variables or len(exponentes) != num_variables:
+            raise ValueError("El número de coeficientes o exponentes no coincide con el de variables.")
+        # Un monomio por término no nulo; con exponente 0 el monomio es constante
+        no_nulos = np.flatnonzero(coeficientes)
+        coeficientes = coeficientes[no_nulos]
+        cantidades = (exponentes[no_nulos] != 0).astype(np.int64)
+        columnas = no_nulos[cantidades == 1]
+        exponentes = exponentes[columnas]
+
+    if columnas.size and (columnas.min() < 0 or columnas.max() >= num_variables):
+        raise ValueError("Un monomio hace referencia a una variable inexistente.")
+    return coeficientes, cantidades, columnas, exponentes
+
+
+def construir_polinomio(partes, num_variables):
+    """
+    Construye la representación dispersa de una o varias funciones polinómicas.
+
+    :param partes: Lista con el objetivo o las restricciones (ver 'entradas_monomios');
+                   cada una es una salida del polinomio.
+    :param num_variables: Número de variables del problema.
+    :return: Diccionario con 'coeficientes' (uno por monomio), 'exponentes' (CSR de
+             monomios x variables), 'salidas' (índice de la parte de cada monomio),
+             'num_salidas' y los índices auxiliares que usan 'evaluar_polinomio' y
+             'derivar_polinomio'.
+    """
+    entradas = [entradas_monomios(parte, num_variables) for parte in partes]
+    coeficientes = np.concatenate([e[0] for e in entradas]) if entradas else np.zeros(0)
+    cantidades = np.concatenate([e[1] for e in entradas]) if entradas else np.zeros(0, dtype=np.int64)
+    salidas = np.repeat(np.arange(len(entradas)), [len(e[0]) for e in entradas])
+    punteros = np.concatenate([[0], np.cumsum(cantidades)])
+
+    exponentes = sparse.csr_matrix(
+        (np.concatenate([e[3] for e in entradas]) if entradas else np.zeros(0),
+         np.concatenate([e[2] for e in entradas]) if entradas else np.zeros(0, dtype=np.int64),
+         punteros),
+        shape=(len(coeficientes), num_variables))
+    # Una variable repetida en un monomio suma sus exponentes; los exponentes 0 sobran
+    exponentes.sum_duplicates()
+    exponentes.eliminate_zeros()
+
+    filas = np.repeat(np.arange(exponentes.shape[0]), np.diff(exponentes.indptr))
+
+    # Pares (p, q) de entradas del mismo monomio, para el hessiano: cada entrada p se repite
+    # tantas veces como variables tiene su monomio y se empareja con todas ellas
+    cantidades = np.diff(exponentes.indptr)[filas]
+    pares_p = np.repeat(np.arange(len(filas)), cantidades)
+    desplazamientos = np.arange(len(pares_p)) - np.repeat(np.cumsum(cantidades) - cantidades, cantidades)
+    pares_q = exponentes.indptr[filas[pares_p]] + desplazamientos
+
+    return {
+        "coeficientes": coeficientes,
+        "exponentes": exponentes,
+        "salidas": salidas,
+        "num_salidas": len(entradas),
+        "num_variables": num_variables,
+        # Monomio y salida de cada entrada no nula de la matriz
+        "filas": filas,
+        "salidas_entradas": salidas[filas],
+        # Inicio de cada monomio para np.ufunc.reduceat y monomios constantes
+        "inicios": exponentes.indptr[:-1],
+        "vacios": np.diff(exponentes.indptr) == 0,
+        "pares": (pares_p, pares_q),
+    }
+
+
+def reducir_por_monomio(ufunc, valores, polinomio, neutro):
+    """
+    Reduce los valores de las entradas de cada monomio (producto o suma).
+
+    :return: Array con un valor por monomio; los monomios constantes reciben 'neutro'.
+    """
+    # Se añade un elemento al final para que los índices de los monomios vacíos del final
+    # sean válidos; reduceat devuelve un valor cualquiera para los vacíos y se corrige
+    reducido = ufunc.reduceat(np.append(valores, neutro), polinomio["inicios"])
+    reducido[polinomio["vacios"]] = neutro
+    return reducido
+
+
+def evaluar_polinomio(polinomio, variables):
+    """
+    Evalúa todas las salidas del polinomio.
+
+    :param polinomio: Diccionario de 'construir_polinomio'.
+    :param variables: Punto de evaluación.
+    :return: Array con el valor de cada salida.
+    """
+    x = np.asarray(variables, dtype=float)
+    exponentes = polinomio["exponentes"]
+    factores = x[exponentes.indices] ** exponentes.data
+    monomios = reducir_por_monomio(np.multiply, factores, polinomio, 1.0)
+    # Sin monomios bincount devuelve enteros; SLSQP exige flotantes (objetivo nulo)
+    return np.bincount(polinomio["salidas"], weights=polinomio["coeficientes"] * monomios,
+                       minlength=polinomio["num_salidas"]).astype(float, copy=False)
+
+
+def derivar_polinomio(polinomio, variables, disperso=False):
+    """
+    Calcula el jacobiano del polinomio (una fila por salida, una columna por variable).
+
+    La derivada de un monomio respecto de x_j es e_j * x_j ** (e_j - 1) por el producto de
+    los demás factores. Ese producto se obtiene dividiendo el del monomio por el factor de
+    x_j, salvo cuando algún factor es cero: si solo lo es el de x_j se usa el producto de
+    los factores no nulos, y si hay dos o más ceros la derivada es nula.
+
+    :param polinomio: Diccionario de 'construir_polinomio'.
+    :param variables: Punto de evaluación.
+    :param disperso: Si es True devuelve una matriz CSR; si no, un array denso.
+    :return: Jacobiano de forma (num_salidas, num_variables).
+    """
+    x = np.asarray(variables, dtype=float)
+    exponentes = polinomio["exponentes"]
+    columnas = exponentes.indices
+    potencias = exponentes.data
+    filas = polinomio["filas"]
+
+    factores = x[columnas] ** potencias
+    nulos = factores == 0
+    producto_no_nulos = reducir_por_monomio(np.multiply, np.where(nulos, 1.0, factores), polinomio, 1.0)
+    num_nulos = reducir_por_monomio(np.add, nulos.astype(float), polinomio, 0.0)
+
+    producto = producto_no_nulos[filas]
+    ceros = num_nulos[filas]
+    otros = np.where(nulos,
+                     np.where(ceros == 1, producto, 0.0),
+                     np.where(ceros == 0, producto / np.where(nulos, 1.0, factores), 0.0))
+
+    pesos = polinomio["coeficientes"][filas] * potencias * x[columnas] ** (potencias - 1) * otros
+    forma = (polinomio["num_salidas"], polinomio["num_variables"])
+    salidas = polinomio["salidas_entradas"]
+    if disperso:
+        return sparse.csr_matrix((pesos, (salidas, columnas)), shape=forma)
+    return np.bincount(salidas * forma[1] + columnas, weights=pesos,
+                       minlength=forma[0] * forma[1]).astype(float, copy=False).reshape(forma)
+
+
+def hessiano_polinomio(polinomio, variables, pesos):
+    """
+    Calcula la suma ponderada de los hessianos de las salidas, sum_i pesos_i * H_i, como
+    matriz CSR. Igual que en 'derivar_polinomio', el producto de los factores restantes de
+    cada par de variables se obtiene sin dividir por factores nulos.
+
+    :param polinomio: Diccionario de 'construir_polinomio'.
+    :param variables: Punto de evaluación.
+    :param pesos: Peso de cada salida (multiplicadores de Lagrange, o [1] para el objetivo).
+    :return: Hessiano de forma (num_variables, num_variables).
+    """
+    x = np.asarray(variables, dtype=float)
+    exponentes = polinomio["exponentes"]
+    columnas = exponentes.indices
+    potencias = exponentes.data
+    filas = polinomio["filas"]
+    pares_p, pares_q = polinomio["pares"]
+
+    factores = x[columnas] ** potencias
+    nulos = factores == 0
+    seguros = np.where(nulos, 1.0, factores)
+    producto_no_nulos = reducir_por_monomio(np.multiply, seguros, polinomio, 1.0)
+    num_nulos = reducir_por_monomio(np.add, nulos.astype(float), polinomio, 0.0)
+
+    diagonal = pares_p == pares_q
+    # Factores nulos que quedan fuera del par y producto de los no nulos restantes
+    restantes = num_nulos[filas[pares_p]] - nulos[pares_p] - np.where(diagonal, 0, nulos[pares_q])
+    otros = producto_no_nulos[filas[pares_p]] / seguros[pares_p] / np.where(diagonal, 1.0, seguros[pares_q])
+    otros = np.where(restantes > 0, 0.0, otros)
+
+    primera = potencias * x[columnas] ** (potencias - 1)
+    # Con exponente 1 la derivada segunda es nula; se evita evaluar 0 ** -1
+    segunda = potencias * (potencias - 1) * x[columnas] ** np.where(potencias == 1, 0.0, potencias - 2)
+    derivadas = np.where(diagonal, segunda[pares_p], primera[pares_p] * primera[pares_q])
+
+    pesos_monomios = np.asarray(pesos, dtype=float)[polinomio["salidas"]] * polinomio["coeficientes"]
+    valores = pesos_monomios[filas[pares_p]] * derivadas * otros
+    forma = (polinomio["num_variables"], polinomio["num_variables"])
+    return sparse.csr_matrix((valores, (columnas[pares_p], columnas[pares_q])), shape=forma)
@@ -1,10 +1,14 @@
 import tkinter as tk
-from tkinter import messagebox
-from pl.optimizacion_pl import optimizar
+from tkinter import messagebox, filedialog
+from comun.cargador_modelos import cargar_modelo, densificar_restricciones
+from pl.optimizacion_pl import resolver_para_interfaz, mostrar_resultado
 from pl.graficar_pl import graficar_solucion
+from comun.tareas_tk import GestorTareas
+from comun.lienzo_tk import LienzoGrafico
 
 # Variables globales para almacenar las entradas de usuario
 entries_variables = []
+enteras_variables = []
 entries_restricciones = []
 operadores_restricciones = []
 
@@ -49,8 +53,9 @@ def crear_campos_variables():
     """
     Crea los campos de entrada para los coeficientes de las variables de la función objetivo.
     """
-    global entries_variables
+    global entries_variables, enteras_variables
     entries_variables = []
+    enteras_variables = []
 
     num_variables = datos_iniciales["num_variables"]
 
@@ -65,9 +70,14 @@ def crear_campos_variables():
         entry_var.grid(row=i+1, column=1, padx=5, pady=5)
         entries_variables.append(entry_var)
 
+        # Casilla para exigir que la variable tome valores enteros
+        entera = tk.BooleanVar(root, value=False)
+        tk.Checkbutton(root, text="Entera", variable=entera).grid(row=i+1, column=2, padx=5, pady=5)
+        enteras_variables.append(entera)
+
     # Botón para agregar restricciones
     btn_agregar_restricciones = tk.Button(root, text="Continuar", command=crear_campos_restricciones)
-    btn_agregar_restricciones.grid(row=num_variables+2, column=0, columnspan=2, pady=10)
+    btn_agregar_restricciones.grid(row=num_variables+2, column=0, columnspan=3, pady=10)
 
 def crear_campos_restricciones():
     """
@@ -78,12 +88,13 @@ def crear_campos_restricciones():
         num_variables = datos_iniciales["num_variables"]
         num_restricciones = datos_iniciales["num_restricciones"]
 
-        global coeficientes_objetivo
+        global coeficientes_objetivo, variables_enteras
         coeficientes_objetivo = []
 
         for i in range(num_variables):
             coef = float(entries_variables[i].get())
             coeficientes_objetivo.append(coef)
+        variables_enteras = [entera.get() for entera in enteras_variables]
 
         # Limpiar la ventana
         for widget in root.winfo_children():
@@ -124,6 +135,7 @@ def crear_campos_restricciones():
         # Botón para enviar datos y ejecutar la optimización
         btn_enviar = tk.Button(root, text="Optimizar", command=enviar_datos)
         btn_enviar.grid(row=num_restricciones*(num_variables+2)+1, column=0, columnspan=2, pady=10)
+        crear_barra_estado(num_restricciones*(num_variables+2)+2)
 
     except ValueError:
         # Mostrar mensaje de error si los datos son inválidos
@@ -138,8 +150,8 @@ def enviar_datos():
         num_restricciones = datos_iniciales["num_restricciones"]
         tipo_problema = datos_iniciales["tipo_problema"]
 
-        # Las listas coeficientes_objetivo ya fueron obtenidas
-        global coeficientes_objetivo
+        # Las listas coeficientes_objetivo y variables_enteras ya fueron obtenidas
+        global coeficientes_objetivo, variables_enteras
 
         # Recoger restricciones
         restricciones = []
@@ -163,22 +175,102 @@ def enviar_datos():
             "tipo_problema": tipo_problema,
             "restricciones": restricciones
         }
-
-        # Ejecutar la optimización
-        solucion_optima = optimizar(datos_optimizacion)
-
-        # Graficar la solución si existe
-        if solucion_optima is not None:
-            graficar_solucion(datos_optimizacion, solucion_optima)
-
-        # Mostrar mensaje de éxito
-        messagebox.showinfo("Éxito", "Optimización completada exitosamente.")
-        root.destroy()
+        if any(variables_enteras):
+            datos_optimizacion["enteras"] = variables_enteras
+
+        # Ejecutar la optimización en segundo plano para no bloquear la ventana
+        gestor_tareas.enviar(
+            resolver_para_interfaz, datos_optimizacion,
+            al_terminar=lambda resultado: mostrar_solucion(datos_optimizacion, resultado),
+            al_error=mostrar_error_optimizacion
+        )
 
     except ValueError:
         # Mostrar mensaje de error si hay valores inválidos
         messagebox.showerror("Error", "Por favor, ingrese datos válidos.")
 
+def cargar_desde_archivo():
+    """
+    Carga un modelo desde un archivo (JSON, JSON Lines, CSV o MPS) y lo optimiza
+    directamente, sin crear un campo por coeficiente ni aplicar el máximo de 9
+    variables y restricciones del formulario.
+    """
+    ruta = filedialog.askopenfilename(
+        title="Cargar modelo",
+        filetypes=[("Modelos", "*.json *.jsonl *.csv *.mps"), ("Todos los archivos", "*.*")]
+    )
+    if not ruta:
+        return
+
+    try:
+        clase, datos_optimizacion = cargar_modelo(ruta)
+    except (OSError, ValueError, KeyError) as e:
+        messagebox.showerror("Error", f"No se pudo cargar el modelo:\n{str(e)}")
+        return
+
+    if clase != "pl":
+        messagebox.showerror("Error", "El archivo no contiene un problema de programación lineal.")
+        return
+
+    # Ejecutar la optimización en segundo plano para no bloquear la ventana
+    gestor_tareas.enviar(
+        resolver_para_interfaz, datos_optimizacion,
+        al_terminar=lambda resultado: mostrar_solucion(datos_optimizacion, resultado),
+        al_error=mostrar_error_optimizacion
+    )
+
+def mostrar_solucion(datos_optimizacion, resultado):
+    """
+    Muestra el resultado de una optimización terminada y, si el problema tiene dos
+    variables, su gráfica. Se ejecuta en el hilo de Tk.
+
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param resultado: Diccionario de resultado del resolvedor.
+    :return: Variables óptimas si se encontró solución; None en caso contrario.
+    """
+    solucion_optima = mostrar_resultado(resultado)
+
+    # Graficar la solución si existe y el problema tiene dos variables
+    num_variables = len(datos_optimizacion["variables"])
+    if solucion_optima is not None and num_variables == 2:
+        graficar_solucion(densificar_restricciones(datos_optimizacion, num_variables), solucion_optima, lienzo)
+    return solucion_optima
+
+def mostrar_error_optimizacion(error):
+    """
+    Informa de un error ocurrido en segundo plano durante la optimización.
+    """
+    messagebox.showerror("Error", f"Ocurrió un error durante la optimización:\n{str(error)}")
+
+def crear_barra_estado(fila):
+    """
+    Crea la etiqueta con el número de problemas en cola y el botón para cancelarlos.
+
+    :param fila: Fila de la grilla en la que se ubican.
+    """
+    global etiqueta_estado
+    etiqueta_estado = tk.Label(root, text="")
+    etiqueta_estado.grid(row=fila, column=0, padx=5, pady=5)
+    tk.Button(root, text="Cancelar", command=gestor_tareas.cancelar_todas).grid(row=fila, column=1, padx=5, pady=5)
+    actualizar_estado(gestor_tareas.pendientes())
+
+def actualizar_estado(pendientes):
+    """
+    Muestra cuántos problemas se están resolviendo en segundo plano.
+    """
+    try:
+        etiqueta_estado.config(text=f"Resolviendo {pendientes} problema(s)..." if pendientes else "")
+    except (NameError, tk.TclError):
+        pass  # La etiqueta aún no existe o la ventana ya se cerró
+
+def cerrar_formulario():
+    """
+    Cancela los problemas en cola, cierra la gráfica y la ventana del formulario.
+    """
+    gestor_tareas.cerrar()
+    lienzo.cerrar()
+    root.destroy()
+
 def crear_formulario(parent):
     """
     Función para crear el formulario inicial de la interfaz gráfica.
@@ -186,6 +278,16 @@ def crear_formulario(parent):
     global root
     root = parent
 
+    # Gestor que resuelve los problemas en segundo plano sin bloquear la ventana
+    global gestor_tareas
+    gestor_tareas = GestorTareas(root)
+    gestor_tareas.al_cambiar = actualizar_estado
+
+    # Gráfica persistente: cada nueva solución se dibuja sobre la misma figura
+    global lienzo
+    lienzo = LienzoGrafico(root, "Gráfica de la solución")
+    root.protocol("WM_DELETE_WINDOW", cerrar_formulario)
+
     # Etiqueta y entrada para número de variables
     tk.Label(root, text="Número de variables (máximo 9):").grid(row=0, column=0, padx=5, pady=5)
     global entry_num_variables
@@ -209,6 +311,11 @@ def crear_formulario(parent):
     btn_continuar = tk.Button(root, text="Continuar", command=continuar)
     btn_continuar.grid(row=3, column=0, columnspan=2, pady=10)
 
+    # Botón para cargar un modelo completo desde un archivo
+    btn_cargar = tk.Button(root, text="Cargar modelo desde archivo", command=cargar_desde_archivo)
+    btn_cargar.grid(row=4, column=0, columnspan=2, pady=10)
+    crear_barra_estado(5)
+
 # Código para iniciar la aplicación
 if __name__ == "__main__":
     # Crear ventana principal
@@ -0,0 +1,252 @@
+from collections import deque
+import math
+import numpy as np
+
+# Tolerancia geométrica para decidir si un punto está sobre una recta
+EPSILON = 1e-9
+
+# Máximo de valores enteros que se recorren al calcular los puntos enteros de la región
+MAX_PUNTOS_ENTEROS = 10_000
+
+
+class Semiplano:
+    """
+    Semiplano a·x <= b representado por un punto de su recta borde y una dirección,
+    de forma que la región factible queda a la izquierda de la dirección.
+    """
+
+    def __init__(self, a, b, etiqueta):
+        """
+        :param a: Vector normal (a₁, a₂) distinto de cero.
+        :param b: Término independiente.
+        :param etiqueta: Índice de la restricción de origen o nombre del límite ('x1>=0', 'caja', ...).
+        """
+        norma = math.hypot(a[0], a[1])
+        self.a = (a[0] / norma, a[1] / norma)
+        self.b = b / norma
+        self.punto = (self.a[0] * self.b, self.a[1] * self.b)
+        self.direccion = (-self.a[1], self.a[0])
+        self.angulo = math.atan2(self.direccion[1], self.direccion[0])
+        self.etiqueta = etiqueta
+
+    def excluye(self, punto):
+        # El punto queda fuera si viola a·x <= b más allá de la tolerancia
+        return self.a[0] * punto[0] + self.a[1] * punto[1] - self.b > EPSILON
+
+
+def producto_cruz(u, v):
+    return u[0] * v[1] - u[1] * v[0]
+
+
+def interseccion(s, t):
+    """
+    Punto de corte de las rectas borde de dos semiplanos no paralelos.
+    """
+    denominador = producto_cruz(s.direccion, t.direccion)
+    alfa = producto_cruz((t.punto[0] - s.punto[0], t.punto[1] - s.punto[1]), t.direccion) / denominador
+    return (s.punto[0] + alfa * s.direccion[0], s.punto[1] + alfa * s.direccion[1])
+
+
+def interseccion_semiplanos(semiplanos):
+    """
+    Intersección de semiplanos en O(m log m): se ordenan por ángulo y se recorren con una
+    cola doble, descartando los que dejan de formar parte del borde.
+
+    :param semiplanos: Lista de objetos Semiplano; debe incluir una caja que acote la región.
+    :return: Tupla (vértices en sentido antihorario, semiplano del borde que sale de cada vértice);
+             listas vacías si la intersección es vacía o degenerada.
+    """
+    ordenados = sorted(semiplanos, key=lambda s: s.angulo)
+    cola = deque()
+
+    for semiplano in ordenados:
+        while len(cola) > 1 and semiplano.excluye(interseccion(cola[-1], cola[-2])):
+            cola.pop()
+        while len(cola) > 1 and semiplano.excluye(interseccion(cola[0], cola[1])):
+            cola.popleft()
+
+        # Semiplanos paralelos: se conserva el más restrictivo
+        if cola and abs(producto_cruz(semiplano.direccion, cola[-1].direccion)) < EPSILON:
+            if semiplano.direccion[0] * cola[-1].direccion[0] + semiplano.direccion[1] * cola[-1].direccion[1] < 0:
+                return [], []
+            if not semiplano.excluye(cola[-1].punto):
+                continue
+            cola.pop()
+        cola.append(semiplano)
+
+    while len(cola) > 2 and cola[0].excluye(interseccion(cola[-1], cola[-2])):
+        cola.pop()
+    while len(cola) > 2 and cola[-1].excluye(interseccion(cola[0], cola[1])):
+        cola.popleft()
+
+    if len(cola) < 3:
+        return [], []
+
+    bordes = list(cola)
+    vertices = [interseccion(bordes[i], bordes[(i + 1) % len(bordes)]) for i in range(len(bordes))]
+    return vertices, [bordes[(i + 1) % len(bordes)] for i in range(len(bordes))]
+
+
+def recortar_con_recta(vertices, a, b):
+    """
+    Interseca un polígono convexo con la recta a·x = b.
+
+    :param vertices: Vértices del polígono (o segmento, o punto) en orden.
+    :param a: Coeficientes de la recta.
+    :param b: Término independiente.
+    :return: Lista con 0, 1 o 2 puntos (vacío, punto o segmento).
+    """
+    escala = max(1.0, abs(b), math.hypot(a[0], a[1]))
+    valores = [a[0] * x + a[1] * y - b for x, y in vertices]
+    puntos = [v for v, f in zip(vertices, valores) if abs(f) <= EPSILON * escala]
+
+    cantidad = len(vertices)
+    if cantidad >= 2:
+        aristas = range(cantidad) if cantidad > 2 else range(1)
+        for i in aristas:
+            j = (i + 1) % cantidad
+            f_i, f_j = valores[i], valores[j]
+            if f_i * f_j < 0 and abs(f_i) > EPSILON * escala and abs(f_j) > EPSILON * escala:
+                t = f_i / (f_i - f_j)
+                puntos.append((vertices[i][0] + t * (vertices[j][0] - vertices[i][0]),
+                               vertices[i][1] + t * (vertices[j][1] - vertices[i][1])))
+
+    if not puntos:
+        return []
+
+    # Quedarse con los extremos a lo largo de la recta
+    direccion = (-a[1], a[0])
+    proyecciones = [p[0] * direccion[0] + p[1] * direccion[1] for p in puntos]
+    inicio = puntos[int(np.argmin(proyecciones))]
+    fin = puntos[int(np.argmax(proyecciones))]
+    if math.hypot(fin[0] - inicio[0], fin[1] - inicio[1]) <= EPSILON * escala:
+        return [inicio]
+    return [inicio, fin]
+
+
+def region_factible(restricciones, limites):
+    """
+    Calcula exactamente la región factible de un problema lineal de dos variables con
+    x₁, x₂ >= 0, recortada a la caja [0, limites[0]] x [0, limites[1]].
+
+    :param restricciones: Lista de restricciones con 'coeficientes' (2 valores), 'operador' y 'resultado'.
+    :param limites: Tupla con el valor máximo visible de x₁ y de x₂.
+    :return: Diccionario con 'vertices' (array k x 2 en sentido antihorario; un segmento o un punto
+             si hay igualdades), 'aristas' (etiqueta del borde que sale de cada vértice: índice de
+             restricción, 'x1>=0', 'x2>=0' o 'caja'), 'vacia' y 'acotada' (False si la región
+             toca la caja artificial, es decir, continúa fuera de la vista).
+    """
+    semiplanos = [
+        Semiplano((-1.0, 0.0), 0.0, 'x1>=0'),
+        Semiplano((0.0, -1.0), 0.0, 'x2>=0'),
+        Semiplano((1.0, 0.0), float(limites[0]), 'caja'),
+        Semiplano((0.0, 1.0), float(limites[1]), 'caja'),
+    ]
+    igualdades = []
+    vacia = {"vertices": np.empty((0, 2)), "aristas": [], "vacia": True, "acotada": True}
+
+    for i, restriccion in enumerate(restricciones):
+        a1, a2 = (float(v) for v in restriccion['coeficientes'])
+        resultado = float(restriccion['resultado'])
+        operador = restriccion['operador']
+
+        if a1 == 0 and a2 == 0:
+            # Fila sin variables: o se cumple siempre o hace vacía la región
+            cumple = {"<=": 0 <= resultado, ">=": 0 >= resultado, "=": resultado == 0}.get(operador, False)
+            if not cumple:
+                return vacia
+            continue
+
+        if operador == "<=":
+            semiplanos.append(Semiplano((a1, a2), resultado, i))
+        elif operador == ">=":
+            semiplanos.append(Semiplano((-a1, -a2), -resultado, i))
+        elif operador == "=":
+            igualdades.append(((a1, a2), resultado, i))
+        else:
+            raise ValueError(f"Operador de restricción no válido: {operador}")
+
+    vertices, bordes = interseccion_semiplanos(semiplanos)
+    aristas = [borde.etiqueta for borde in bordes]
+
+    # Cada igualdad reduce la región a su intersección con la recta correspondiente
+    for a, b, i in igualdades:
+        if not vertices:
+            break
+        vertices = recortar_con_recta(vertices, a, b)
+        aristas = [i] * len(vertices)
+
+    if not vertices:
+        return vacia
+
+    vertices = np.array(vertices, dtype=float)
+    toca_caja = (np.any(np.isclose(vertices[:, 0], limites[0])) or
+                 np.any(np.isclose(vertices[:, 1], limites[1])))
+    return {"vertices": vertices, "aristas": aristas, "vacia": False, "acotada": not toca_caja}
+
+
+def segmento_en_caja(a, b, limites):
+    """
+    Tramo de la recta a·x = b visible dentro de la caja [0, limites[0]] x [0, limites[1]].
+
+    :param a: Coeficientes de la recta (no ambos nulos).
+    :param b: Término independiente.
+    :param limites: Tupla con el valor máximo visible de x₁ y de x₂.
+    :return: Array 2 x 2 con los extremos, o None si la recta no cruza la caja.
+    """
+    caja = np.array([(0.0, 0.0), (limites[0], 0.0), (limites[0], limites[1]), (0.0, limites[1])])
+    puntos = recortar_con_recta([tuple(v) for v in caja], a, b)
+    if len(puntos) < 2:
+        return None
+    return np.array(puntos)
+
+
+def enteros_entre(inferior, superior):
+    """
+    Enteros del intervalo [inferior, superior], con tolerancia en los extremos.
+    """
+    return np.arange(math.ceil(inferior - EPSILON), math.floor(superior + EPSILON) + 1)
+
+
+def puntos_enteros(region, enteras, max_puntos=MAX_PUNTOS_ENTEROS):
+    """
+    Parte de la región factible que cumple la integralidad: los puntos de la retícula si
+    las dos variables son enteras, o los cortes con las rectas x_j = k si solo lo es una.
+
+    :param region: Diccionario de 'region_factible'.
+    :param enteras: Dos booleanos que indican qué variables son enteras.
+    :param max_puntos: Máximo de valores enteros a recorrer; si la región tiene más, no se
+                       calcula ninguno.
+    :return: Lista de arrays 1 x 2 (puntos) y 2 x 2 (segmentos); vacía si no hay ninguno.
+    """
+    if region["vacia"] or not any(enteras):
+        return []
+
+    vertices = [tuple(v) for v in region["vertices"]]
+    minimos = region["vertices"].min(axis=0)
+    maximos = region["vertices"].max(axis=0)
+
+    # Se recorren las rectas x_j = k de la primera variable entera
+    eje = 0 if enteras[0] else 1
+    otro = 1 - eje
+    valores = enteros_entre(minimos[eje], maximos[eje])
+    if len(valores) > max_puntos:
+        return []
+
+    normal = (1.0, 0.0) if eje == 0 else (0.0, 1.0)
+    partes = []
+    for k in valores:
+        corte = recortar_con_recta(vertices, normal, float(k))
+        if not corte:
+            continue
+        if not enteras[otro]:
+            partes.append(np.array(corte, dtype=float))
+            continue
+        coordenadas = [p[otro] for p in corte]
+        for m in enteros_entre(min(coordenadas), max(coordenadas)):
+            punto = np.zeros((1, 2))
+            punto[0, eje], punto[0, otro] = k, m
+            partes.append(punto)
+        if len(partes) > max_puntos:
+            return []
+    return partes
@@ -1,18 +1,51 @@
 import matplotlib.pyplot as plt
+from matplotlib.patches import Polygon
 import numpy as np
 from tkinter import messagebox
+from pl.geometria_pl import region_factible, segmento_en_caja, puntos_enteros
+from comun.lienzo_tk import actualizar_linea, actualizar_leyenda
+from comun.instrumentacion import medir
 
-def graficar_solucion(datos_optimizacion, solucion_optima):
+# Cantidad de isolíneas de la función objetivo que se dibujan además de la del óptimo
+NUM_ISOLINEAS = 6
+
+
+def calcular_limites(restricciones, solucion_optima):
+    """
+    Calcula la zona visible del gráfico: incluye el óptimo y todos los vértices de la
+    región factible, con un margen, y como mínimo llega a 10 en cada eje.
+
+    :param restricciones: Lista de restricciones del problema.
+    :param solucion_optima: Array con los valores óptimos de las variables.
+    :return: Tupla con el valor máximo visible de x₁ y de x₂.
+    """
+    limites = np.array([max(solucion_optima[0] * 1.5, 10), max(solucion_optima[1] * 1.5, 10)])
+
+    # Los vértices que no dependen de la caja son los de las restricciones reales
+    region = region_factible(restricciones, limites * 100)
+    if not region["vacia"]:
+        reales = [v for v, etiqueta in zip(region["vertices"], region["aristas"]) if etiqueta != 'caja']
+        if reales:
+            limites = np.maximum(limites, np.max(reales, axis=0) * 1.2)
+    return tuple(limites)
+
+
+def graficar_solucion(datos_optimizacion, solucion_optima, lienzo=None):
     """
     Función para graficar la solución de problemas de programación lineal.
     Solo es aplicable a problemas con dos variables.
 
+    La región factible se calcula exactamente como intersección de semiplanos y se dibuja
+    como un único polígono, junto con isolíneas de la función objetivo que pasan por el óptimo.
+    Si hay variables enteras ('enteras'), se marcan además los puntos enteros de la región.
+
     :param datos_optimizacion: Diccionario con los datos del problema.
     :param solucion_optima: Array con los valores óptimos de las variables.
+    :param lienzo: LienzoGrafico en el que dibujar reutilizando los artistas del dibujo
+                   anterior; si es None se abre una figura nueva con plt.show().
     """
     variables = datos_optimizacion["variables"]
     restricciones = datos_optimizacion["restricciones"]
-    tipo_problema = datos_optimizacion["tipo_problema"]
 
     num_variables = len(variables)
 
@@ -21,69 +54,110 @@ def graficar_solucion(datos_optimizacion, solucion_optima):
         messagebox.showinfo("Información", "La graficación solo está disponible para problemas con dos variables.")
         return
 
-    # Crear el rango de valores para las variables
-    x1_vals = np.linspace(0, max(solucion_optima[0]*1.5, 10), 400)
-    x2_vals = np.linspace(0, max(solucion_optima[1]*1.5, 10), 400)
-    X1, X2 = np.meshgrid(x1_vals, x2_vals)
-
-    # Definir la función objetivo
-    def funcion_objetivo(x1, x2):
-        return variables[0]*x1 + variables[1]*x2
-
-    # Calcular los valores de Z usando la función objetivo
-    Z = funcion_objetivo(X1, X2)
-
-    # Crear la gráfica
-    plt.figure()
-    contour = plt.contourf(X1, X2, Z, levels=50, cmap='viridis', alpha=0.7)
-    plt.colorbar(contour)
-    plt.xlabel('x₁')
-    plt.ylabel('x₂')
-    plt.title('Región Factible y Solución Óptima')
-
-    # Sombrear la región factible
-    for restriccion in restricciones:
-        coeficientes = restriccion['coeficientes']
-        operador = restriccion['operador']
-        resultado = restriccion['resultado']
-
-        # Crear una máscara para la restricción
-        if coeficientes[1] != 0:
-            x2_restriccion = (resultado - coeficientes[0]*x1_vals) / coeficientes[1]
-            if operador == "<=":
-                plt.fill_between(x1_vals, x2_restriccion, x2_vals[0], where=(x2_restriccion >= 0), color='grey', alpha=0.3)
-            elif operador == ">=":
-                plt.fill_between(x1_vals, x2_vals[-1], x2_restriccion, where=(x2_restriccion <= x2_vals[-1]), color='grey', alpha=0.3)
-        elif coeficientes[0] != 0:
-            x1_line = np.full_like(x2_vals, resultado / coeficientes[0])
-            if operador == "<=":
-                plt.fill_betweenx(x2_vals, x1_line, x1_vals[0], where=(x1_line >= 0), color='grey', alpha=0.3)
-            elif operador == ">=":
-                plt.fill_betweenx(x2_vals, x1_vals[-1], x1_line, where=(x1_line <= x1_vals[-1]), color='grey', alpha=0.3)
+    if solucion_optima is None or len(solucion_optima) != 2:
+        messagebox.showerror("Error", "Solución óptima no válida")
+        return
 
-    # Graficar las líneas de las restricciones
     for i, restriccion in enumerate(restricciones):
-        coeficientes = restriccion['coeficientes']
-        operador = restriccion['operador']
-        resultado = restriccion['resultado']
-
-        if coeficientes[1] != 0:
-            x2_restriccion = (resultado - coeficientes[0]*x1_vals) / coeficientes[1]
-            plt.plot(x1_vals, x2_restriccion, label=f'Restricción {i + 1}')
-        elif coeficientes[0] != 0:
-            x1_restriccion = resultado / coeficientes[0]
-            plt.axvline(x=x1_restriccion, label=f'Restricción {i + 1}')
-        else:
+        if restriccion['coeficientes'][0] == 0 and restriccion['coeficientes'][1] == 0:
             messagebox.showerror("Error", f"Coeficientes inválidos en la restricción {i + 1}")
             return
 
-    # Marcar la solución óptima
-    if solucion_optima is not None and len(solucion_optima) == 2:
-        plt.plot(solucion_optima[0], solucion_optima[1], 'ro', label="Solución Óptima")
-    else:
-        messagebox.showerror("Error", "Solución óptima no válida")
+    if lienzo is None:
+        # Crear la gráfica
+        with medir("graficacion"):
+            fig, ax = plt.subplots()
+            dibujar_solucion(ax, {}, datos_optimizacion, solucion_optima)
+        plt.show()
         return
 
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Con el mismo número de restricciones se reutilizan el polígono y todas las líneas
+    with medir("graficacion"):
+        if lienzo.preparar(("pl", len(restricciones))):
+            ax = lienzo.figura.axes[0]
+        else:
+            ax = lienzo.figura.add_subplot(111)
+        dibujar_solucion(ax, lienzo.artistas, datos_optimizacion, solucion_optima)
+    lienzo.dibujar()
+
+
+def dibujar_solucion(ax, artistas, datos_optimizacion, solucion_optima):
+    """
+    Dibuja la región factible, las restricciones, las isolíneas y el óptimo en 'ax'.
+    Los artistas que ya existen en 'artistas' se actualizan con set_data/set_xy en lugar
+    de crearse de nuevo.
+
+    :param ax: Ejes de matplotlib.
+    :param artistas: Diccionario con los artistas reutilizables (vacío la primera vez).
+    :param datos_optimizacion: Diccionario con los datos del problema.
+    :param solucion_optima: Array con los valores óptimos de las variables.
+    """
+    variables = datos_optimizacion["variables"]
+    restricciones = datos_optimizacion["restricciones"]
+
+    limites = calcular_limites(restricciones, solucion_optima)
+    region = region_factible(restricciones, limites)
+
+    ax.set_xlim(0, limites[0])
+    ax.set_ylim(0, limites[1])
+    if not artistas:
+        ax.set_xlabel('x₁')
+        ax.set_ylabel('x₂')
+        ax.set_title('Región Factible y Solución Óptima')
+        ax.grid(True)
+        artistas["region"] = ax.add_patch(Polygon(np.zeros((3, 2)), closed=True, color='grey', alpha=0.3))
+
+    # Sombrear la región factible (polígono, o segmento/punto si hay igualdades)
+    vertices = region["vertices"]
+    poligono = artistas["region"]
+    poligono.set_visible(len(vertices) >= 3)
+    if len(vertices) >= 3:
+        poligono.set_xy(vertices)
+        poligono.set_label('Región factible' if region["acotada"] else 'Región factible (no acotada)')
+    segmento = vertices if len(vertices) == 2 else np.empty((0, 2))
+    actualizar_linea(ax, artistas, "region_segmento", segmento[:, 0], segmento[:, 1],
+                     color='grey', linewidth=4, alpha=0.5, label='Región factible')
+
+    # Marcar los puntos enteros de la región (o los cortes x_j = k si solo una es entera)
+    partes = puntos_enteros(region, datos_optimizacion.get("enteras") or [False, False])
+    puntos = np.array([p[0] for p in partes if len(p) == 1]).reshape(-1, 2)
+    cortes = [np.vstack([p, [np.nan, np.nan]]) for p in partes if len(p) == 2]
+    cortes = np.vstack(cortes) if cortes else np.empty((0, 2))
+    actualizar_linea(ax, artistas, "enteros_puntos", puntos[:, 0], puntos[:, 1],
+                     color='black', marker='.', linestyle='', label='Puntos enteros factibles')
+    actualizar_linea(ax, artistas, "enteros_cortes", cortes[:, 0], cortes[:, 1],
+                     color='black', linewidth=2, label='Valores enteros factibles')
+
+    # Graficar las líneas de las restricciones
+    for i, restriccion in enumerate(restricciones):
+        segmento = tramo_visible(restriccion['coeficientes'], restriccion['resultado'], limites)
+        actualizar_linea(ax, artistas, ("restriccion", i), segmento[:, 0], segmento[:, 1],
+                         label=f'Restricción {i + 1}')
+
+    # Isolíneas de la función objetivo: la del óptimo resaltada y otras paralelas
+    valor_optimo = variables[0] * solucion_optima[0] + variables[1] * solucion_optima[1]
+    esquinas = np.array([(0, 0), (limites[0], 0), (0, limites[1]), limites])
+    valores_esquinas = esquinas @ np.asarray(variables, dtype=float)
+    hay_isolineas = valores_esquinas.max() > valores_esquinas.min()
+    niveles = np.linspace(valores_esquinas.min(), valores_esquinas.max(), NUM_ISOLINEAS + 2)[1:-1]
+    for k, nivel in enumerate(niveles):
+        segmento = tramo_visible(variables, nivel, limites) if hay_isolineas else np.empty((0, 2))
+        actualizar_linea(ax, artistas, ("isolinea", k), segmento[:, 0], segmento[:, 1],
+                         color='tab:blue', linestyle=':', alpha=0.5)
+    segmento = tramo_visible(variables, valor_optimo, limites) if hay_isolineas else np.empty((0, 2))
+    actualizar_linea(ax, artistas, "isolinea_optima", segmento[:, 0], segmento[:, 1],
+                     color='tab:blue', linestyle='--', label=f'Función objetivo = {valor_optimo:.2f}')
+
+    # Marcar la solución óptima
+    actualizar_linea(ax, artistas, "optimo", [solucion_optima[0]], [solucion_optima[1]],
+                     color='red', marker='o', linestyle='', label="Solución Óptima")
+
+    actualizar_leyenda(ax)
+
+
+def tramo_visible(a, b, limites):
+    """
+    Como 'segmento_en_caja', pero devuelve un array vacío (línea oculta) si la recta no cruza la caja.
+    """
+    segmento = segmento_en_caja(a, b, limites)
+    return np.empty((0, 2)) if segmento is None else segmento
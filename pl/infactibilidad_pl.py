@@ -0,0 +1,138 @@
+"""
+Diagnóstico de modelos lineales infactibles: localiza un subconjunto irreducible de
+restricciones en conflicto (IIS) con pocas llamadas a HiGHS.
+
+Primero se resuelve una vez el modelo elástico, en el que cada restricción puede violarse
+pagando su violación en el objetivo. Si la violación mínima es positiva, los duales no nulos
+de ese modelo forman un certificado de Farkas: las restricciones con dual no nulo ya son
+infactibles juntas, y suelen ser muy pocas. Sobre ellas se aplica la bisección de
+'comun.infactibilidad.buscar_conflicto' para dejar solo las imprescindibles.
+
+Con variables enteras cada comprobación se resuelve con milp. El modelo elástico es la
+relajación continua: si ella ya es infactible su certificado sirve igual; si no, la
+bisección parte de todas las restricciones.
+"""
+import numpy as np
+import time
+from scipy import sparse
+from scipy.optimize import linprog
+from comun.infactibilidad import buscar_conflicto
+from pl.optimizacion_pl import construir_modelo, resolver_milp
+
+# Violación total y dual por debajo de los cuales se consideran nulos
+TOLERANCIA = 1e-9
+
+
+def seleccionar_filas(matriz, b, filas):
+    """
+    Extrae un subconjunto de filas de una matriz densa o dispersa y de su resultado.
+
+    :param matriz: Matriz de restricciones (array denso, CSR o None).
+    :param b: Resultados de las filas.
+    :param filas: Lista de índices de fila.
+    :return: Tupla (matriz, b) con las filas elegidas, o (None, None) si no hay ninguna.
+    """
+    if not filas:
+        return None, None
+    return matriz[filas], b[filas]
+
+
+def crear_evaluador_factibilidad(modelo):
+    """
+    Crea una función que comprueba si un subconjunto de restricciones tiene solución. El
+    modelo se ensambla una sola vez y cada comprobación solo selecciona sus filas.
+
+    :param modelo: Modelo construido con 'construir_modelo'.
+    :return: Función que recibe índices de restricciones originales y devuelve True si son
+             factibles junto con la no negatividad de las variables.
+    """
+    c = np.zeros(len(modelo["c"]))
+
+    def es_factible(indices):
+        filas_ub = [modelo["filas"][i][1] for i in indices if modelo["filas"][i][0] == "ub"]
+        filas_eq = [modelo["filas"][i][1] for i in indices if modelo["filas"][i][0] == "eq"]
+        A_ub, b_ub = seleccionar_filas(modelo["A_ub"], modelo["b_ub"], filas_ub)
+        A_eq, b_eq = seleccionar_filas(modelo["A_eq"], modelo["b_eq"], filas_eq)
+        if modelo.get("integralidad") is not None:
+            res = resolver_milp(dict(modelo, c=c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq))
+        else:
+            res = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                          bounds=modelo["bounds"], method='highs')
+        # Solo un estado 2 demuestra la infactibilidad; un error numérico no la descarta
+        return res.status != 2
+
+    return es_factible
+
+
+def filtro_elastico(modelo):
+    """
+    Resuelve el modelo elástico, que minimiza la suma de las violaciones de las restricciones.
+
+    :param modelo: Modelo construido con 'construir_modelo'.
+    :return: Lista de índices de restricciones con dual no nulo si el modelo es infactible;
+             lista vacía si es factible; None si HiGHS no resolvió el modelo elástico.
+    """
+    num_variables = len(modelo["c"])
+    num_ub = 0 if modelo["A_ub"] is None else modelo["A_ub"].shape[0]
+    num_eq = 0 if modelo["A_eq"] is None else modelo["A_eq"].shape[0]
+
+    # Columnas [x, violación de '<=', exceso y defecto de '=']
+    A_ub = b_ub = A_eq = b_eq = None
+    if num_ub:
+        A_ub = sparse.hstack([sparse.csr_matrix(modelo["A_ub"]), -sparse.identity(num_ub),
+                              sparse.csr_matrix((num_ub, 2 * num_eq))], format="csr")
+        b_ub = modelo["b_ub"]
+    if num_eq:
+        identidad = sparse.identity(num_eq)
+        A_eq = sparse.hstack([sparse.csr_matrix(modelo["A_eq"]), sparse.csr_matrix((num_eq, num_ub)),
+                              identidad, -identidad], format="csr")
+        b_eq = modelo["b_eq"]
+
+    c = np.concatenate([np.zeros(num_variables), np.ones(num_ub + 2 * num_eq)])
+    res = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq,
+                  bounds=[(0, None)] * len(c), method='highs')
+    if res.status != 0:
+        return None
+    if res.fun <= TOLERANCIA:
+        return []
+
+    return [i for i, (tipo_fila, indice, _) in enumerate(modelo["filas"])
+            if abs((res.ineqlin if tipo_fila == "ub" else res.eqlin).marginals[indice]) > TOLERANCIA]
+
+
+def buscar_iis(datos_optimizacion):
+    """
+    Busca las restricciones de un problema lineal infactible que están en conflicto.
+
+    :param datos_optimizacion: Diccionario con los datos del problema, como en 'resolver'.
+    :return: Diccionario de 'buscar_conflicto': 'restricciones' con los índices (en el orden
+             de 'datos_optimizacion["restricciones"]') de un subconjunto mínimo infactible,
+             o None si el problema es factible; 'resoluciones' y 'tiempo' incluyen el
+             modelo elástico.
+    :raises ValueError: Si los datos no tienen el formato esperado.
+    """
+    inicio = time.perf_counter()
+    modelo = construir_modelo(datos_optimizacion)
+    num_restricciones = len(modelo["filas"])
+    es_factible = crear_evaluador_factibilidad(modelo)
+
+    candidatos = filtro_elastico(modelo)
+    if candidatos == [] and modelo.get("integralidad") is not None:
+        # La relajación continua es factible: no hay certificado para el problema entero
+        candidatos = None
+    elif candidatos == []:
+        return {"restricciones": None, "resoluciones": 1, "tiempo": time.perf_counter() - inicio}
+
+    resoluciones = 1
+    conflicto = None
+    if candidatos is not None:
+        conflicto = buscar_conflicto(num_restricciones, es_factible, candidatos)
+    if conflicto is None or conflicto["restricciones"] is None:
+        # Certificado no concluyente por tolerancias: buscar entre todas las restricciones
+        if conflicto is not None:
+            resoluciones += conflicto["resoluciones"]
+        conflicto = buscar_conflicto(num_restricciones, es_factible)
+
+    conflicto["resoluciones"] += resoluciones
+    conflicto["tiempo"] = time.perf_counter() - inicio
+    return conflicto
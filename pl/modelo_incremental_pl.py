@@ -0,0 +1,386 @@
+"""
+Modelo lineal editable para resolver de nuevo tras cambios pequeños.
+
+'ModeloIncremental' guarda la matriz de restricciones ya ensamblada (densa, con capacidad
+de reserva en filas y columnas) y la actualiza en el lugar al añadir, quitar o modificar
+restricciones, variables y coeficientes, sin reconstruir el modelo desde datos_optimizacion.
+
+linprog (HiGHS) no admite arrancar desde una base anterior, así que el reaprovechamiento se
+hace a nivel de solución: antes de llamar al resolvedor se comprueba si la solución y los
+duales anteriores siguen certificando el óptimo del modelo modificado (factibilidad primal
+y dual y holgura complementaria). Es lo habitual al añadir una restricción que la solución
+ya cumple, quitar una restricción no activa o cambiar coeficientes de filas o variables no
+activas; en ese caso se devuelve la solución sin resolver. Si no, se resuelve desde cero.
+"""
+import time
+import numpy as np
+
+from pl.optimizacion_pl import entradas_fila, resolver_modelo
+
+OPERADORES = ("<=", ">=", "=")
+
+# Tolerancia relativa de la comprobación del óptimo anterior (del orden de la de HiGHS)
+TOLERANCIA = 1e-7
+
+# Capacidad inicial reservada de filas y columnas
+CAPACIDAD_INICIAL = 16
+
+
+class ModeloIncremental:
+    """
+    Problema de programación lineal con variables no negativas que se edita fila a fila y
+    columna a columna. Los índices de restricciones y variables son posiciones: al eliminar
+    una, las siguientes se desplazan, igual que en la lista de datos_optimizacion.
+    """
+
+    def __init__(self, tipo_problema, variables):
+        """
+        :param tipo_problema: 'max' o 'min'.
+        :param variables: Coeficientes de la función objetivo.
+        :raises ValueError: Si el tipo de problema no es válido.
+        """
+        if tipo_problema not in ("max", "min"):
+            raise ValueError("Tipo de problema no válido. Debe ser 'max' o 'min'.")
+        self.tipo_problema = tipo_problema
+        self.num_variables = len(variables)
+        self.num_restricciones = 0
+
+        capacidad = max(CAPACIDAD_INICIAL, self.num_variables)
+        self.objetivo = np.zeros(capacidad)
+        self.objetivo[:self.num_variables] = np.asarray(variables, dtype=float)
+        self.matriz = np.zeros((CAPACIDAD_INICIAL, capacidad))
+        self.resultados = np.zeros(CAPACIDAD_INICIAL)
+        self.operadores = np.empty(CAPACIDAD_INICIAL, dtype=object)
+
+        # Solución y duales de la última resolución óptima (duales en la forma de minimización
+        # y con el signo de cada fila sin voltear); None si no hay solución válida
+        self.solucion = None
+        self.duales = None
+
+    @classmethod
+    def desde_datos(cls, datos_optimizacion):
+        """
+        Crea un modelo editable a partir de datos_optimizacion.
+
+        :param datos_optimizacion: Diccionario con 'tipo_problema', 'variables' y 'restricciones'.
+        :return: Instancia de ModeloIncremental.
+        :raises ValueError: Si los datos no tienen el formato esperado.
+        """
+        if not all(k in datos_optimizacion for k in ["tipo_problema", "variables", "restricciones"]):
+            raise ValueError("Faltan datos en la entrada.")
+        if any(datos_optimizacion.get("enteras") or []):
+            # El certificado de optimalidad con duales solo vale para el problema continuo
+            raise ValueError("El modelo incremental no admite variables enteras.")
+        modelo = cls(datos_optimizacion["tipo_problema"], datos_optimizacion["variables"])
+        restricciones = datos_optimizacion["restricciones"]
+        modelo.reservar(len(restricciones), modelo.num_variables)
+        for restriccion in restricciones:
+            if not all(k in restriccion for k in ["coeficientes", "operador", "resultado"]):
+                raise ValueError("Formato de restricción no válido.")
+            modelo.agregar_restriccion(restriccion["coeficientes"], restriccion["operador"], restriccion["resultado"])
+        return modelo
+
+    def como_datos(self):
+        """
+        :return: Diccionario datos_optimizacion equivalente al modelo actual.
+        """
+        return {
+            "tipo_problema": self.tipo_problema,
+            "variables": self.objetivo[:self.num_variables].tolist(),
+            "restricciones": [
+                {"coeficientes": self.matriz[i, :self.num_variables].tolist(),
+                 "operador": self.operadores[i],
+                 "resultado": float(self.resultados[i])}
+                for i in range(self.num_restricciones)
+            ],
+        }
+
+    def reservar(self, filas, columnas):
+        """
+        Amplía la capacidad de la matriz (al doble, como mínimo) si no caben las filas o
+        columnas pedidas, de modo que añadir una a una cueste O(1) amortizado en copias.
+        """
+        capacidad_filas, capacidad_columnas = self.matriz.shape
+        if filas <= capacidad_filas and columnas <= capacidad_columnas:
+            return
+        nuevas_filas = max(filas, 2 * capacidad_filas) if filas > capacidad_filas else capacidad_filas
+        nuevas_columnas = max(columnas, 2 * capacidad_columnas) if columnas > capacidad_columnas else capacidad_columnas
+
+        matriz = np.zeros((nuevas_filas, nuevas_columnas))
+        matriz[:self.num_restricciones, :self.num_variables] = self.matriz[:self.num_restricciones, :self.num_variables]
+        self.matriz = matriz
+        if nuevas_filas > capacidad_filas:
+            self.resultados = np.resize(self.resultados, nuevas_filas)
+            operadores = np.empty(nuevas_filas, dtype=object)
+            operadores[:self.num_restricciones] = self.operadores[:self.num_restricciones]
+            self.operadores = operadores
+        if nuevas_columnas > capacidad_columnas:
+            objetivo = np.zeros(nuevas_columnas)
+            objetivo[:self.num_variables] = self.objetivo[:self.num_variables]
+            self.objetivo = objetivo
+
+    def validar_restriccion(self, indice):
+        # Los índices negativos no se aceptan: se desplazarían al editar
+        if not 0 <= indice < self.num_restricciones:
+            raise IndexError(f"No existe la restricción {indice}.")
+
+    def validar_variable(self, indice):
+        # Igual que 'validar_restriccion', para las columnas
+        if not 0 <= indice < self.num_variables:
+            raise IndexError(f"No existe la variable {indice}.")
+
+    # --- Restricciones ---
+
+    def agregar_restriccion(self, coeficientes, operador, resultado):
+        """
+        Añade una restricción al final.
+
+        :param coeficientes: Lista densa o diccionario {índice de variable: coeficiente}.
+        :param operador: '<=', '>=' o '='.
+        :param resultado: Término independiente.
+        :return: Índice de la nueva restricción.
+        :raises ValueError: Si la restricción no es válida.
+        """
+        if operador not in OPERADORES:
+            raise ValueError(f"Operador de restricción no válido: {operador}")
+        if not isinstance(resultado, (int, float)):
+            raise ValueError("El resultado de la restricción debe ser un número.")
+        indices, valores = entradas_fila(coeficientes, self.num_variables)
+
+        self.reservar(self.num_restricciones + 1, self.num_variables)
+        fila = self.num_restricciones
+        self.matriz[fila, :self.num_variables] = 0.0
+        np.add.at(self.matriz[fila], indices, valores)
+        self.resultados[fila] = resultado
+        self.operadores[fila] = operador
+        self.num_restricciones += 1
+        if self.duales is not None:
+            self.duales = np.append(self.duales, 0.0)
+        return fila
+
+    def eliminar_restriccion(self, indice):
+        """
+        Elimina una restricción; las siguientes pasan a ocupar su posición.
+        """
+        self.validar_restriccion(indice)
+        m = self.num_restricciones
+        # Desplazar las filas siguientes una posición (copia de bloque en el mismo array)
+        self.matriz[indice:m - 1, :self.num_variables] = self.matriz[indice + 1:m, :self.num_variables]
+        self.resultados[indice:m - 1] = self.resultados[indice + 1:m]
+        self.operadores[indice:m - 1] = self.operadores[indice + 1:m]
+        self.num_restricciones -= 1
+        if self.duales is not None:
+            self.duales = np.delete(self.duales, indice)
+
+    def modificar_restriccion(self, indice, coeficientes=None, operador=None, resultado=None):
+        """
+        Cambia los coeficientes, el operador o el resultado de una restricción; los
+        argumentos que se dejan en None no cambian.
+        """
+        self.validar_restriccion(indice)
+        if operador is not None:
+            if operador not in OPERADORES:
+                raise ValueError(f"Operador de restricción no válido: {operador}")
+            if operador != self.operadores[indice] and self.duales is not None and self.duales[indice] != 0:
+                # El dual anterior tiene el signo del operador anterior y ya no certifica el óptimo
+                self.solucion = None
+                self.duales = None
+            self.operadores[indice] = operador
+        if resultado is not None:
+            if not isinstance(resultado, (int, float)):
+                raise ValueError("El resultado de la restricción debe ser un número.")
+            self.resultados[indice] = resultado
+        if coeficientes is not None:
+            indices, valores = entradas_fila(coeficientes, self.num_variables)
+            self.matriz[indice, :self.num_variables] = 0.0
+            np.add.at(self.matriz[indice], indices, valores)
+
+    def modificar_coeficiente(self, restriccion, variable, valor):
+        """
+        Cambia un único coeficiente de la matriz de restricciones.
+        """
+        self.validar_restriccion(restriccion)
+        self.validar_variable(variable)
+        self.matriz[restriccion, variable] = valor
+
+    # --- Variables ---
+
+    def agregar_variable(self, coeficiente_objetivo, coeficientes=None):
+        """
+        Añade una variable (columna) al final.
+
+        :param coeficiente_objetivo: Coeficiente en la función objetivo.
+        :param coeficientes: Coeficientes en cada restricción, como lista densa o diccionario
+                             {índice de restricción: coeficiente}; None los deja en 0.
+        :return: Índice de la nueva variable.
+        """
+        self.reservar(self.num_restricciones, self.num_variables + 1)
+        columna = self.num_variables
+        self.matriz[:self.num_restricciones, columna] = 0.0
+        if coeficientes is not None:
+            if isinstance(coeficientes, dict):
+                for fila, valor in coeficientes.items():
+                    self.validar_restriccion(int(fila))
+                    self.matriz[int(fila), columna] = valor
+            else:
+                if len(coeficientes) != self.num_restricciones:
+                    raise ValueError("El número de coeficientes de la variable no coincide con el de restricciones.")
+                self.matriz[:self.num_restricciones, columna] = coeficientes
+        self.objetivo[columna] = coeficiente_objetivo
+        self.num_variables += 1
+        if self.solucion is not None:
+            self.solucion = np.append(self.solucion, 0.0)
+        return columna
+
+    def eliminar_variable(self, indice):
+        """
+        Elimina una variable; las siguientes pasan a ocupar su posición.
+        """
+        self.validar_variable(indice)
+        n = self.num_variables
+        self.matriz[:self.num_restricciones, indice:n - 1] = self.matriz[:self.num_restricciones, indice + 1:n]
+        self.objetivo[indice:n - 1] = self.objetivo[indice + 1:n]
+        self.num_variables -= 1
+        if self.solucion is not None:
+            # Sin la variable, la solución anterior solo sirve si valía 0
+            valor = self.solucion[indice]
+            self.solucion = np.delete(self.solucion, indice)
+            if valor != 0:
+                self.solucion = None
+                self.duales = None
+
+    def modificar_objetivo(self, variable, valor):
+        """
+        Cambia el coeficiente de una variable en la función objetivo.
+        """
+        self.validar_variable(variable)
+        self.objetivo[variable] = valor
+
+    # --- Resolución ---
+
+    def vistas(self):
+        """
+        :return: Tupla (objetivo, matriz, resultados, operadores) con las partes usadas de
+                 los arrays (vistas, sin copiar).
+        """
+        m, n = self.num_restricciones, self.num_variables
+        return self.objetivo[:n], self.matriz[:m, :n], self.resultados[:m], self.operadores[:m]
+
+    def construir(self):
+        """
+        Construye el modelo con el formato de 'pl.optimizacion_pl.construir_modelo'.
+
+        :return: Diccionario con c, A_ub, b_ub, A_eq, b_eq, bounds, filas y tipo_problema.
+        """
+        objetivo, matriz, resultados, operadores = self.vistas()
+        signos = np.where(operadores == ">=", -1.0, 1.0)
+        es_igualdad = operadores == "="
+        filas_ub = np.flatnonzero(~es_igualdad)
+        filas_eq = np.flatnonzero(es_igualdad)
+        # Posición de cada restricción dentro de su grupo
+        posiciones = np.empty(self.num_restricciones, dtype=np.int64)
+        posiciones[filas_ub] = np.arange(len(filas_ub))
+        posiciones[filas_eq] = np.arange(len(filas_eq))
+
+        return {
+            "tipo_problema": self.tipo_problema,
+            "c": -objetivo if self.tipo_problema == "max" else objetivo.copy(),
+            "A_ub": signos[filas_ub, None] * matriz[filas_ub] if len(filas_ub) else None,
+            "b_ub": signos[filas_ub] * resultados[filas_ub] if len(filas_ub) else None,
+            "A_eq": matriz[filas_eq] if len(filas_eq) else None,
+            "b_eq": resultados[filas_eq] if len(filas_eq) else None,
+            "bounds": [(0, None)] * self.num_variables,
+            "filas": [("eq" if es_igualdad[i] else "ub", int(posiciones[i]), int(signos[i]))
+                      for i in range(self.num_restricciones)],
+        }
+
+    def holguras(self, actividad):
+        """
+        :param actividad: Producto de la matriz por la solución.
+        :return: Holgura de cada restricción con el convenio de 'resolver' (b - Ax en '<='
+                 y '=', Ax - b en '>=').
+        """
+        _, _, resultados, operadores = self.vistas()
+        return np.where(operadores == ">=", actividad - resultados, resultados - actividad)
+
+    def optimo_vigente(self):
+        """
+        Comprueba si la solución y los duales guardados siguen siendo óptimos para el modelo
+        actual: x >= 0 factible, duales con el signo de cada operador, costes reducidos
+        no negativos (en minimización) y holgura complementaria.
+
+        :return: Tupla (vigente, actividad) con el producto matriz-solución ya calculado.
+        """
+        if self.solucion is None or self.duales is None:
+            return False, None
+        objetivo, matriz, resultados, operadores = self.vistas()
+        x, y = self.solucion, self.duales
+        costes = -objetivo if self.tipo_problema == "max" else objetivo
+
+        actividad = matriz @ x
+        holguras = self.holguras(actividad)
+        escala_primal = TOLERANCIA * (1 + np.abs(resultados))
+        es_igualdad = operadores == "="
+        factible = np.all(np.where(es_igualdad, np.abs(holguras), -holguras) <= escala_primal)
+
+        # En minimización los multiplicadores de '<=' son <= 0 y los de '>=' son >= 0
+        signo_dual = np.where(operadores == "<=", -1.0, np.where(operadores == ">=", 1.0, 0.0))
+        escala_dual = TOLERANCIA * (1 + np.max(np.abs(costes), initial=0.0))
+        duales_validos = np.all(np.where(es_igualdad, True, signo_dual * y >= -escala_dual))
+        reducidos = costes - matriz.T @ y
+        complementaria = (np.all(np.abs(y * np.where(es_igualdad, 0.0, holguras)) <= escala_dual * (1 + np.abs(resultados)))
+                          and np.all(np.abs(x * reducidos) <= escala_dual * (1 + np.abs(x))))
+        vigente = bool(factible and duales_validos and np.all(reducidos >= -escala_dual) and complementaria)
+        return vigente, actividad
+
+    def resolver(self):
+        """
+        Resuelve el modelo actual, reutilizando la solución anterior si sigue siendo óptima.
+
+        :return: Diccionario con el formato de 'pl.optimizacion_pl.resolver' y además
+                 'reutilizada' (True si no hizo falta llamar al resolvedor).
+        """
+        inicio = time.perf_counter()
+        signo_objetivo = -1.0 if self.tipo_problema == "max" else 1.0
+
+        vigente, actividad = self.optimo_vigente()
+        if vigente:
+            objetivo = self.vistas()[0]
+            resultado = {
+                "estado": "optimo",
+                "exito": True,
+                "mensaje": "La solución anterior sigue siendo óptima tras la modificación.",
+                "valor_optimo": float(objetivo @ self.solucion),
+                "variables": self.solucion.copy(),
+                "duales": signo_objetivo * self.duales,
+                "holguras": self.holguras(actividad),
+                "iteraciones": 0,
+                "reutilizada": True,
+            }
+            resultado["tiempo"] = time.perf_counter() - inicio
+            return resultado
+
+        resultado = {
+            "estado": "error",
+            "exito": False,
+            "mensaje": "",
+            "valor_optimo": None,
+            "variables": None,
+            "duales": None,
+            "holguras": None,
+            "iteraciones": 0,
+        }
+        try:
+            resultado.update(resolver_modelo(self.construir()))
+        except ValueError as e:
+            resultado["mensaje"] = str(e)
+
+        if resultado["exito"]:
+            self.solucion = np.array(resultado["variables"], dtype=float)
+            self.duales = signo_objetivo * np.asarray(resultado["duales"], dtype=float)
+        else:
+            self.solucion = None
+            self.duales = None
+        resultado["reutilizada"] = False
+        resultado["tiempo"] = time.perf_counter() - inicio
+        return resultado
@@ -1,112 +1,505 @@
-from scipy.optimize import linprog
-from tkinter import messagebox
+from scipy.optimize import linprog, milp, LinearConstraint, Bounds
+from scipy import sparse
+from concurrent.futures import ProcessPoolExecutor
+from comun.cache_optimizacion import CacheOptimizacion, resolver_en_cache
+from comun.infactibilidad import describir_conflicto
+from comun.instrumentacion import medir
 import numpy as np
+import time
 
+# Traducción de los códigos de estado de linprog a estados legibles
+ESTADOS_LINPROG = {
+    0: "optimo",
+    1: "limite_iteraciones",
+    2: "infactible",
+    3: "no_acotado",
+    4: "error_numerico",
+}
 
-def optimizar(datos_optimizacion):
+# Traducción de los códigos de estado de milp; 1 es el límite de tiempo que se le impone
+ESTADOS_MILP = {
+    0: "optimo",
+    1: "limite_tiempo",
+    2: "infactible",
+    3: "no_acotado",
+    4: "error_numerico",
+}
+
+# Segundos que se deja a HiGHS en los problemas con variables enteras antes de devolver la
+# mejor solución encontrada; None no impone límite
+TIEMPO_LIMITE_MILP = 60.0
+
+# Número de entradas (filas x columnas) a partir del cual se ensambla la matriz dispersa
+UMBRAL_DISPERSO = 1_000_000
+
+# Caché usada por 'optimizar'; puede reemplazarse por una con nivel en disco o por None
+cache_resultados = CacheOptimizacion(tamano_maximo=256)
+
+
+def entradas_fila(coeficientes, num_variables):
     """
-    Función que resuelve un problema de programación lineal utilizando scipy.optimize.linprog.
+    Obtiene los coeficientes distintos de cero de una fila de restricción.
+
+    :param coeficientes: Lista densa de coeficientes o diccionario {índice de variable: coeficiente}.
+    :param num_variables: Número de variables del problema.
+    :return: Tupla (índices, valores) como arrays de numpy.
+    :raises ValueError: Si la fila no es compatible con el número de variables.
+    """
+    if isinstance(coeficientes, dict):
+        indices = np.fromiter((int(k) for k in coeficientes.keys()), dtype=np.int64, count=len(coeficientes))
+        valores = np.fromiter(coeficientes.values(), dtype=float, count=len(coeficientes))
+        if indices.size and (indices.min() < 0 or indices.max() >= num_variables):
+            raise ValueError("La restricción hace referencia a una variable inexistente.")
+    else:
+        if len(coeficientes) != num_variables:
+            raise ValueError("El número de coeficientes de la restricción no coincide con el de variables.")
+        valores = np.asarray(coeficientes, dtype=float)
+        indices = np.flatnonzero(valores)
+        valores = valores[indices]
+    return indices, valores
+
+
+def ensamblar_matriz(indices_filas, num_variables, disperso):
+    """
+    Ensambla una matriz de restricciones a partir de los coeficientes de cada fila.
+
+    :param indices_filas: Lista de tuplas (índices, valores) ya multiplicadas por su signo.
+    :param num_variables: Número de columnas de la matriz.
+    :param disperso: Si es True se devuelve una matriz CSR de scipy.sparse; si no, un array denso.
+    :return: Matriz de restricciones, o None si no hay filas.
+    """
+    if not indices_filas:
+        return None
+
+    num_filas = len(indices_filas)
+    cantidades = np.fromiter((len(i) for i, _ in indices_filas), dtype=np.int64, count=num_filas)
+    filas = np.repeat(np.arange(num_filas), cantidades)
+    columnas = np.concatenate([i for i, _ in indices_filas])
+    valores = np.concatenate([v for _, v in indices_filas])
+
+    if disperso:
+        return sparse.csr_matrix((valores, (filas, columnas)), shape=(num_filas, num_variables))
+
+    matriz = np.zeros((num_filas, num_variables))
+    # Se acumula para que las entradas repetidas de una fila dispersa se sumen, igual que en CSR
+    np.add.at(matriz, (filas, columnas), valores)
+    return matriz
+
+
+def construir_modelo(datos_optimizacion, disperso=None):
+    """
+    Valida los datos del problema y construye las matrices que recibe linprog.
 
     :param datos_optimizacion: Diccionario con los datos necesarios para la optimización.
-    :return: Variables óptimas si se encuentra solución; None en caso contrario.
+                               Los coeficientes de cada restricción pueden ser una lista
+                               densa o un diccionario {índice de variable: coeficiente}.
+                               'enteras', opcional, indica con un booleano por variable
+                               cuáles deben tomar valores enteros.
+    :param disperso: True para ensamblar A_ub y A_eq como matrices dispersas, False para
+                     arrays densos; None elige según el tamaño del modelo.
+    :return: Diccionario con c, A_ub, b_ub, A_eq, b_eq, bounds, el mapeo de cada
+             restricción original a su fila ('ub' o 'eq', índice de fila, signo) e
+             'integralidad' (1 para las variables enteras y 0 para las continuas, o None
+             si no hay enteras).
+    :raises ValueError: Si los datos no tienen el formato esperado.
     """
-    try:
-        # Validar la existencia de los campos necesarios
-        if not all(k in datos_optimizacion for k in ["tipo_problema", "variables", "restricciones"]):
-            messagebox.showerror("Error", "Faltan datos en la entrada.")
-            return None
-
-        tipo_problema = datos_optimizacion["tipo_problema"]
-        variables = datos_optimizacion["variables"]
-        restricciones_datos = datos_optimizacion["restricciones"]
-
-        # Validar el tipo de problema
-        if tipo_problema not in ['max', 'min']:
-            messagebox.showerror("Error", "Tipo de problema no válido. Debe ser 'max' o 'min'.")
-            return None
-
-        # Crear la matriz A_ub, vector b_ub, A_eq, b_eq para las restricciones
-        A_ub = []
-        b_ub = []
-        A_eq = []
-        b_eq = []
-
-        for restriccion in restricciones_datos:
-            # Verificar que la restricción tenga los campos necesarios
-            if not all(k in restriccion for k in ["coeficientes", "operador", "resultado"]):
-                messagebox.showerror("Error", "Formato de restricción no válido.")
-                return None
-
-            coeficientes = restriccion["coeficientes"]
-            operador = restriccion["operador"]
-            resultado_restriccion = restriccion["resultado"]
-
-            # Validar que el resultado de la restricción sea un número
-            if not isinstance(resultado_restriccion, (int, float)):
-                messagebox.showerror("Error", "El resultado de la restricción debe ser un número.")
-                return None
-
-            # Manejar las restricciones según el operador
-            if operador == "<=":
-                A_ub.append(coeficientes)
-                b_ub.append(resultado_restriccion)
-            elif operador == ">=":
-                # Multiplicar por -1 para convertir en <=
-                A_ub.append([-1 * coef for coef in coeficientes])
-                b_ub.append(-resultado_restriccion)
-            elif operador == "=":
-                A_eq.append(coeficientes)
-                b_eq.append(resultado_restriccion)
-            else:
-                messagebox.showerror("Error", f"Operador de restricción no válido: {operador}")
-                return None
-
-        # Definir la función objetivo
-        if tipo_problema == 'max':
-            c = [-x for x in variables]  # Negar los coeficientes para maximizar
+    # Validar la existencia de los campos necesarios
+    if not all(k in datos_optimizacion for k in ["tipo_problema", "variables", "restricciones"]):
+        raise ValueError("Faltan datos en la entrada.")
+
+    tipo_problema = datos_optimizacion["tipo_problema"]
+    variables = datos_optimizacion["variables"]
+    restricciones_datos = datos_optimizacion["restricciones"]
+
+    # Validar el tipo de problema
+    if tipo_problema not in ['max', 'min']:
+        raise ValueError("Tipo de problema no válido. Debe ser 'max' o 'min'.")
+
+    num_variables = len(variables)
+
+    # Marcar las variables enteras; sin ninguna el problema se resuelve como lineal continuo
+    integralidad = None
+    enteras = datos_optimizacion.get("enteras")
+    if enteras is not None:
+        if len(enteras) != num_variables:
+            raise ValueError("'enteras' debe tener un valor por variable.")
+        if any(enteras):
+            integralidad = np.array([1 if entera else 0 for entera in enteras], dtype=np.uint8)
+
+    # Coeficientes no nulos de cada fila de A_ub y A_eq, con sus resultados
+    filas_ub = []
+    b_ub = []
+    filas_eq = []
+    b_eq = []
+    filas = []
+
+    for restriccion in restricciones_datos:
+        # Verificar que la restricción tenga los campos necesarios
+        if not all(k in restriccion for k in ["coeficientes", "operador", "resultado"]):
+            raise ValueError("Formato de restricción no válido.")
+
+        operador = restriccion["operador"]
+        resultado_restriccion = restriccion["resultado"]
+
+        # Validar que el resultado de la restricción sea un número
+        if not isinstance(resultado_restriccion, (int, float)):
+            raise ValueError("El resultado de la restricción debe ser un número.")
+
+        indices, valores = entradas_fila(restriccion["coeficientes"], num_variables)
+
+        # Manejar las restricciones según el operador
+        if operador == "<=":
+            filas.append(("ub", len(filas_ub), 1))
+            filas_ub.append((indices, valores))
+            b_ub.append(resultado_restriccion)
+        elif operador == ">=":
+            # Multiplicar por -1 para convertir en <= (solo sobre los valores no nulos)
+            filas.append(("ub", len(filas_ub), -1))
+            filas_ub.append((indices, -valores))
+            b_ub.append(-resultado_restriccion)
+        elif operador == "=":
+            filas.append(("eq", len(filas_eq), 1))
+            filas_eq.append((indices, valores))
+            b_eq.append(resultado_restriccion)
         else:
-            c = variables
+            raise ValueError(f"Operador de restricción no válido: {operador}")
+
+    # Elegir la representación: la densa ocupa filas x columnas, la dispersa solo los no nulos
+    if disperso is None:
+        disperso = len(filas) * num_variables > UMBRAL_DISPERSO
+
+    # Definir la función objetivo
+    c = np.asarray(variables, dtype=float)
+    if tipo_problema == 'max':
+        c = -c  # Negar los coeficientes para maximizar
+
+    # Definir límites para las variables (por defecto, no negativas)
+    bounds = [(0, None) for _ in range(num_variables)]
+
+    return {
+        "tipo_problema": tipo_problema,
+        "c": c,
+        "A_ub": ensamblar_matriz(filas_ub, num_variables, disperso),
+        "b_ub": np.array(b_ub, dtype=float) if b_ub else None,
+        "A_eq": ensamblar_matriz(filas_eq, num_variables, disperso),
+        "b_eq": np.array(b_eq, dtype=float) if b_eq else None,
+        "bounds": bounds,
+        "filas": filas,
+        "integralidad": integralidad,
+    }
+
+
+def resolver_linprog(modelo):
+    """
+    Llama a linprog (HiGHS) con las matrices del modelo.
+
+    :param modelo: Diccionario con el formato de 'construir_modelo'.
+    :return: Resultado de linprog.
+    """
+    return linprog(
+        modelo["c"],
+        A_ub=modelo["A_ub"],
+        b_ub=modelo["b_ub"],
+        A_eq=modelo["A_eq"],
+        b_eq=modelo["b_eq"],
+        bounds=modelo["bounds"],
+        method='highs'
+    )
+
+
+def resolver_milp(modelo, tiempo_limite=TIEMPO_LIMITE_MILP):
+    """
+    Llama a milp (ramificación y acotación de HiGHS) con las matrices del modelo.
+
+    :param modelo: Diccionario con el formato de 'construir_modelo'.
+    :param tiempo_limite: Segundos máximos de resolución; None no impone límite.
+    :return: Resultado de milp.
+    """
+    restricciones = []
+    if modelo["A_ub"] is not None:
+        restricciones.append(LinearConstraint(modelo["A_ub"], -np.inf, modelo["b_ub"]))
+    if modelo["A_eq"] is not None:
+        restricciones.append(LinearConstraint(modelo["A_eq"], modelo["b_eq"], modelo["b_eq"]))
+
+    inferiores = [-np.inf if inferior is None else inferior for inferior, _ in modelo["bounds"]]
+    superiores = [np.inf if superior is None else superior for _, superior in modelo["bounds"]]
+    opciones = {"disp": False}
+    if tiempo_limite is not None:
+        opciones["time_limit"] = tiempo_limite
+
+    return milp(
+        modelo["c"],
+        constraints=restricciones or None,
+        integrality=modelo["integralidad"],
+        bounds=Bounds(inferiores, superiores),
+        options=opciones
+    )
+
+
+def distinguir_no_acotado(modelo, tiempo_limite=TIEMPO_LIMITE_MILP):
+    """
+    Decide si un problema entero que HiGHS declara "no acotado o infactible" es una cosa
+    u otra, resolviéndolo con objetivo nulo: si así tiene solución, es no acotado.
+
+    :param modelo: Diccionario con el formato de 'construir_modelo', con 'integralidad'.
+    :param tiempo_limite: Segundos máximos de la comprobación.
+    :return: 'no_acotado', 'infactible' o 'error_numerico' si la comprobación no concluye.
+    """
+    res = resolver_milp(dict(modelo, c=np.zeros(len(modelo["c"]))), tiempo_limite)
+    return {0: "no_acotado", 2: "infactible"}.get(res.status, "error_numerico")
+
+
+def resolver_modelo_entero(modelo, tiempo_limite=TIEMPO_LIMITE_MILP):
+    """
+    Resuelve con milp un modelo con variables enteras y traduce la respuesta. Los problemas
+    enteros no tienen duales, así que 'duales' es None.
+
+    :param modelo: Diccionario con el formato de 'construir_modelo', con 'integralidad'.
+    :param tiempo_limite: Segundos máximos de resolución; None no impone límite.
+    :return: Diccionario de resultado con el formato de 'resolver' (sin 'tiempo'). Si se
+             agota el tiempo con una solución entera ya encontrada, 'exito' es False pero
+             'variables' y 'valor_optimo' contienen la mejor hallada.
+    """
+    with medir("resolucion"):
+        inicio = time.perf_counter()
+        res = resolver_milp(modelo, tiempo_limite)
+        duracion = time.perf_counter() - inicio
+
+    estado = ESTADOS_MILP.get(res.status, "error")
+    if res.status == 4 and res.x is None and "unbounded or infeasible" in res.message:
+        estado = distinguir_no_acotado(modelo, tiempo_limite)
+
+    signo_objetivo = -1 if modelo["tipo_problema"] == 'max' else 1
+    nodos = getattr(res, "mip_node_count", None)
+    cota = getattr(res, "mip_dual_bound", None)
+    resultado = {
+        "estado": estado,
+        "exito": bool(res.success),
+        "mensaje": res.message,
+        "valor_optimo": None,
+        "variables": None,
+        "duales": None,
+        "holguras": None,
+        "iteraciones": 0,
+        # Distancia relativa entre la mejor solución y la mejor cota de la relajación
+        "gap": None if getattr(res, "mip_gap", None) is None else float(res.mip_gap),
+        "cota": None if cota is None else float(signo_objetivo * cota),
+        "nodos": None if nodos is None else int(nodos),
+        "nodos_por_segundo": None if nodos is None else nodos / max(duracion, 1e-9),
+    }
+
+    if res.x is not None:
+        x = np.asarray(res.x, dtype=float) + 0.0  # HiGHS puede devolver -0.0
+        resultado["valor_optimo"] = float(signo_objetivo * res.fun)
+        resultado["variables"] = x
 
-        num_variables = len(variables)
+        # Holguras en el orden de las restricciones originales, como las de linprog
+        holguras_ub = modelo["b_ub"] - modelo["A_ub"] @ x if modelo["A_ub"] is not None else None
+        holguras_eq = modelo["b_eq"] - modelo["A_eq"] @ x if modelo["A_eq"] is not None else None
+        resultado["holguras"] = np.array(
+            [(holguras_ub if tipo_fila == "ub" else holguras_eq)[indice]
+             for tipo_fila, indice, _ in modelo["filas"]], dtype=float)
 
-        # Definir límites para las variables (por defecto, no negativas)
-        bounds = [(0, None) for _ in range(num_variables)]
+    return resultado
 
-        # Convertir listas a arrays de numpy para evitar advertencias en linprog
-        A_ub = np.array(A_ub) if A_ub else None
-        b_ub = np.array(b_ub) if b_ub else None
-        A_eq = np.array(A_eq) if A_eq else None
-        b_eq = np.array(b_eq) if b_eq else None
 
+def resolver_modelo(modelo, presolve=False, tiempo_limite=TIEMPO_LIMITE_MILP):
+    """
+    Resuelve con linprog un modelo ya construido y traduce la respuesta.
+
+    :param modelo: Diccionario con el formato de 'construir_modelo'.
+    :param presolve: Si es True, el modelo se reduce y escala antes con 'pl.presolve_pl' y
+                     el resultado incluye 'presolve' con lo que se eliminó. No se aplica a
+                     los modelos con variables enteras, porque el escalado de columnas no
+                     conserva la integralidad; milp ya hace su propio preprocesado.
+    :param tiempo_limite: Segundos máximos para los modelos con variables enteras; ver
+                          'resolver_modelo_entero'.
+    :return: Diccionario de resultado con el formato de 'resolver' (sin 'tiempo').
+    :raises ValueError: Si linprog rechaza los datos.
+    """
+    if modelo.get("integralidad") is not None:
+        return resolver_modelo_entero(modelo, tiempo_limite)
+
+    resultado = {
+        "estado": "error",
+        "exito": False,
+        "mensaje": "",
+        "valor_optimo": None,
+        "variables": None,
+        "duales": None,
+        "holguras": None,
+        "iteraciones": 0,
+    }
+
+    if presolve:
+        from pl.presolve_pl import preprocesar, postprocesar
+        with medir("presolve"):
+            reducido, registro = preprocesar(modelo)
+        resultado["presolve"] = registro["informe"]
+        if reducido is None:
+            res = registro["resultado"]
+        else:
+            with medir("resolucion"):
+                # Si no queda ninguna variable no hace falta llamar a linprog
+                res = resolver_linprog(reducido) if len(reducido["c"]) else None
+            res = postprocesar(res, registro, modelo)
+    else:
         # Resolver el problema con linprog
-        res = linprog(
-            c,
-            A_ub=A_ub,
-            b_ub=b_ub,
-            A_eq=A_eq,
-            b_eq=b_eq,
-            bounds=bounds,
-            method='highs'
+        with medir("resolucion"):
+            res = resolver_linprog(modelo)
+
+    resultado["estado"] = ESTADOS_LINPROG.get(res.status, "error")
+    resultado["exito"] = bool(res.success)
+    resultado["mensaje"] = res.message
+    resultado["iteraciones"] = int(getattr(res, "nit", 0))
+
+    if res.success:
+        signo_objetivo = -1 if modelo["tipo_problema"] == 'max' else 1
+
+        # Obtener el valor óptimo original (considerando si era maximización)
+        resultado["valor_optimo"] = float(signo_objetivo * res.fun)
+        resultado["variables"] = np.asarray(res.x, dtype=float)
+
+        # Devolver duales y holguras en el orden de las restricciones originales,
+        # deshaciendo el cambio de signo de la maximización y de las filas '>='
+        duales = []
+        holguras = []
+        for tipo_fila, indice, signo_fila in modelo["filas"]:
+            grupo = res.ineqlin if tipo_fila == "ub" else res.eqlin
+            duales.append(signo_objetivo * signo_fila * grupo.marginals[indice])
+            holguras.append(grupo.residual[indice])
+        resultado["duales"] = np.array(duales, dtype=float)
+        resultado["holguras"] = np.array(holguras, dtype=float)
+
+    return resultado
+
+
+def resolver(datos_optimizacion, disperso=None, presolve=False, tiempo_limite=TIEMPO_LIMITE_MILP):
+    """
+    Resuelve un problema de programación lineal sin interactuar con la interfaz gráfica.
+
+    :param datos_optimizacion: Diccionario con los datos necesarios para la optimización.
+    :param disperso: Representación de las matrices; ver 'construir_modelo'.
+    :param presolve: Reducir y escalar el modelo antes de resolverlo; ver 'resolver_modelo'.
+    :param tiempo_limite: Segundos máximos si hay variables enteras; None no impone límite.
+    :return: Diccionario con 'estado', 'exito', 'mensaje', 'valor_optimo', 'variables'
+             (precisión completa), 'duales' y 'holguras' (una entrada por restricción,
+             en el orden original), 'iteraciones' y 'tiempo' en segundos. Con variables
+             enteras incluye además 'gap', 'cota', 'nodos' y 'nodos_por_segundo'.
+    """
+    inicio = time.perf_counter()
+    resultado = {
+        "estado": "error",
+        "exito": False,
+        "mensaje": "",
+        "valor_optimo": None,
+        "variables": None,
+        "duales": None,
+        "holguras": None,
+        "iteraciones": 0,
+        "tiempo": 0.0,
+    }
+
+    try:
+        with medir("construccion"):
+            modelo = construir_modelo(datos_optimizacion, disperso)
+        resultado.update(resolver_modelo(modelo, presolve, tiempo_limite))
+    except ValueError as e:
+        resultado["mensaje"] = str(e)
+
+    resultado["tiempo"] = time.perf_counter() - inicio
+    return resultado
+
+
+def resolver_lote(lista_datos, procesos=None):
+    """
+    Resuelve una colección de problemas de programación lineal.
+
+    :param lista_datos: Iterable de diccionarios con el mismo formato que acepta 'resolver'.
+    :param procesos: Número de procesos a utilizar; None o 1 resuelve en el proceso actual.
+    :return: Lista de resultados de 'resolver', en el mismo orden que la entrada.
+    """
+    lista_datos = list(lista_datos)
+
+    if procesos is None or procesos <= 1 or len(lista_datos) <= 1:
+        return [resolver(datos) for datos in lista_datos]
+
+    # Agrupar los problemas en bloques para amortizar el costo de comunicación entre procesos
+    tamano_bloque = max(1, len(lista_datos) // (procesos * 4))
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        return list(executor.map(resolver, lista_datos, chunksize=tamano_bloque))
+
+
+def resolver_para_interfaz(datos_optimizacion):
+    """
+    Resuelve el problema con la caché que usa la interfaz gráfica. No muestra mensajes,
+    por lo que puede ejecutarse en un hilo de trabajo.
+
+    :param datos_optimizacion: Diccionario con los datos necesarios para la optimización.
+    :return: Diccionario de resultado de 'resolver'; si el problema es infactible incluye
+             'conflicto', con los índices de un subconjunto mínimo de restricciones en
+             conflicto ('pl.infactibilidad_pl.buscar_iis').
+    """
+    resultado = resolver_en_cache("pl", datos_optimizacion, resolver, cache_resultados)
+    if resultado["estado"] == "infactible":
+        # Se calcula fuera de la caché: sus índices dependen del orden de las restricciones
+        from pl.infactibilidad_pl import buscar_iis
+        resultado["conflicto"] = buscar_iis(datos_optimizacion)["restricciones"]
+    return resultado
+
+
+def mostrar_resultado(resultado):
+    """
+    Muestra el resultado de una optimización en un cuadro de diálogo.
+    Debe llamarse desde el hilo de Tk.
+
+    :param resultado: Diccionario de resultado de 'resolver'.
+    :return: Variables óptimas redondeadas si se encontró solución; None en caso contrario.
+    """
+    from tkinter import messagebox
+
+    # Comprobar si la solución es exitosa
+    if resultado["exito"]:
+        # Redondear los resultados para presentación
+        variables_optimas = np.round(resultado["variables"], decimals=4)
+        valor_optimo = np.round(resultado["valor_optimo"], decimals=4)
+
+        # Mostrar mensaje con el valor óptimo y las variables óptimas
+        messagebox.showinfo(
+            "Solución óptima",
+            f"Valor óptimo: {valor_optimo}\nVariables óptimas: {variables_optimas}"
         )
+        return variables_optimas  # Retorna la solución óptima para graficarla
+    elif resultado["variables"] is not None:
+        # Problema entero detenido por tiempo: se muestra la mejor solución encontrada
+        variables_optimas = np.round(resultado["variables"], decimals=4)
+        valor = np.round(resultado["valor_optimo"], decimals=4)
+        messagebox.showwarning(
+            "Solución no demostrada óptima",
+            f"Se agotó el tiempo con un gap de {resultado['gap']:.2%}.\n"
+            f"Mejor valor: {valor}\nVariables: {variables_optimas}"
+        )
+        return variables_optimas
+    elif resultado["estado"] == "error":
+        messagebox.showerror("Error", resultado["mensaje"])
+        return None
+    else:
+        messagebox.showerror("Error", describir_conflicto(resultado))
+        return None
 
-        # Comprobar si la solución es exitosa
-        if res.success:
-            # Obtener el valor óptimo original (considerando si era maximización)
-            valor_optimo = -res.fun if tipo_problema == 'max' else res.fun
-
-            # Redondear los resultados para presentación
-            variables_optimas = np.round(res.x, decimals=4)
-            valor_optimo = np.round(valor_optimo, decimals=4)
-
-            # Mostrar mensaje con el valor óptimo y las variables óptimas
-            messagebox.showinfo(
-                "Solución óptima",
-                f"Valor óptimo: {valor_optimo}\nVariables óptimas: {variables_optimas}"
-            )
-            return variables_optimas  # Retorna la solución óptima para graficarla
-        else:
-            messagebox.showerror("Error", "No se encontró una solución óptima.")
-            return None
+
+def optimizar(datos_optimizacion):
+    """
+    Función que resuelve un problema de programación lineal utilizando scipy.optimize.linprog.
+
+    :param datos_optimizacion: Diccionario con los datos necesarios para la optimización.
+    :return: Variables óptimas si se encuentra solución; None en caso contrario.
+    """
+    # La interfaz gráfica solo se importa aquí para que 'resolver' funcione sin pantalla
+    from tkinter import messagebox
+
+    try:
+        return mostrar_resultado(resolver_para_interfaz(datos_optimizacion))
 
     except Exception as e:
         messagebox.showerror("Error", f"Ocurrió un error durante la optimización:\n{str(e)}")
@@ -0,0 +1,367 @@
+"""
+Preprocesado (presolve) y escalado de modelos lineales antes de linprog, con el paso inverso
+(postsolve) que devuelve la solución, los duales y las holguras del modelo original.
+
+Sobre el modelo de 'construir_modelo' se repiten, hasta que no cambia nada:
+
+- filas vacías: se eliminan (o el problema es infactible si el resultado no las cumple);
+- filas con una sola variable: se convierten en cotas de la variable;
+- variables fijas (cota inferior igual a la superior) y columnas vacías: se sustituyen;
+- filas redundantes: '<=' que se cumplen con cualquier valor dentro de las cotas;
+- filas duplicadas (proporcionales): se conserva la más restrictiva.
+
+Después se escala la matriz por filas y columnas con la media geométrica de cada una,
+redondeada a potencias de 2 para no introducir error de redondeo.
+
+Los duales de las filas eliminadas se reconstruyen en orden inverso: las filas convertidas
+en cotas reciben el dual de la cota activa (o el coste reducido de la variable si quedó
+fija), y las demás filas eliminadas tienen dual 0.
+"""
+import numpy as np
+from scipy import sparse
+from scipy.optimize import OptimizeResult
+
+# Tolerancia de factibilidad y de comparación de coeficientes
+TOLERANCIA = 1e-9
+
+# Máximo de pasadas de reducción y de iteraciones del escalado
+MAX_PASADAS = 20
+ITERACIONES_ESCALADO = 4
+
+
+def apilar_modelo(modelo):
+    """
+    Une A_ub y A_eq en una sola matriz CSR.
+
+    :param modelo: Diccionario de 'construir_modelo'.
+    :return: Tupla (matriz, resultados, es_igualdad).
+    """
+    num_variables = len(modelo["c"])
+    bloques, resultados, igualdades = [], [], []
+    for clave_a, clave_b, es_eq in (("A_ub", "b_ub", False), ("A_eq", "b_eq", True)):
+        if modelo[clave_a] is not None:
+            bloques.append(sparse.csr_matrix(modelo[clave_a], dtype=float))
+            resultados.append(np.asarray(modelo[clave_b], dtype=float))
+            igualdades.append(np.full(len(resultados[-1]), es_eq))
+    if not bloques:
+        return sparse.csr_matrix((0, num_variables)), np.zeros(0), np.zeros(0, dtype=bool)
+    matriz = sparse.vstack(bloques, format="csr")
+    matriz.eliminate_zeros()
+    return matriz, np.concatenate(resultados), np.concatenate(igualdades)
+
+
+def rango_coeficientes(matriz):
+    """
+    :return: Cociente entre el mayor y el menor coeficiente no nulo en valor absoluto (1 si no hay).
+    """
+    valores = np.abs(matriz.data[matriz.data != 0])
+    return float(valores.max() / valores.min()) if valores.size else 1.0
+
+
+def factores_media_geometrica(matriz, eje):
+    """
+    Calcula el factor 1 / sqrt(max |a| * min |a|) de cada fila (eje 1) o columna (eje 0),
+    redondeado a potencia de 2; las filas o columnas vacías reciben 1.
+    """
+    absoluta = abs(matriz).tocsr() if eje == 1 else abs(matriz).tocsc()
+    vacias = np.diff(absoluta.indptr) == 0
+    maximos = absoluta.max(axis=eje).toarray().ravel()
+    # Mínimo de los no nulos: máximo de los inversos
+    inversa = absoluta.copy()
+    inversa.data = 1.0 / inversa.data
+    minimos = 1.0 / np.where(vacias, 1.0, inversa.max(axis=eje).toarray().ravel())
+    factores = 1.0 / np.sqrt(np.where(vacias, 1.0, maximos * minimos))
+    return np.exp2(np.round(np.log2(factores)))
+
+
+def error_presolve(estado, mensaje):
+    """
+    Crea el resultado de linprog de un problema que el preprocesado ya resolvió como
+    infactible (2).
+    """
+    return OptimizeResult(status=estado, success=False, message=f"Preprocesado: {mensaje}", nit=0,
+                          fun=None, x=None)
+
+
+def preprocesar(modelo, escalar=True):
+    """
+    Reduce y escala un modelo lineal.
+
+    :param modelo: Diccionario de 'construir_modelo' (matrices densas o dispersas).
+    :param escalar: Si es True se aplica el escalado por media geométrica.
+    :return: Tupla (modelo reducido con el formato de 'construir_modelo', registro para
+             'postprocesar'). Si el preprocesado ya determina el resultado, el modelo
+             reducido es None y el registro contiene 'resultado' con el de linprog.
+    """
+    matriz_original, resultados_original, igualdad_original = apilar_modelo(modelo)
+    costes = np.asarray(modelo["c"], dtype=float)
+    num_filas, num_variables = matriz_original.shape
+
+    inferiores = np.array([0.0 if l is None else l for l, _ in modelo["bounds"]], dtype=float)
+    superiores = np.array([np.inf if u is None else u for _, u in modelo["bounds"]], dtype=float)
+    # Fila original (y su coeficiente) que define la cota inferior y superior de cada variable
+    fuente_inferior = [None] * num_variables
+    fuente_superior = [None] * num_variables
+
+    matriz = matriz_original.copy()
+    resultados = resultados_original.copy()
+    es_igualdad = igualdad_original.copy()
+    filas = np.arange(num_filas)
+    columnas = np.arange(num_variables)
+    valores_fijos = np.full(num_variables, np.nan)
+    # Pila de variables fijadas (índice original, fuentes de sus cotas) para el postsolve
+    fijadas = []
+    informe = {
+        "filas_originales": num_filas,
+        "variables_originales": num_variables,
+        "filas_vacias": 0,
+        "filas_singleton": 0,
+        "filas_redundantes": 0,
+        "filas_duplicadas": 0,
+        "variables_fijas": 0,
+        "columnas_vacias": 0,
+    }
+    registro = {"informe": informe, "num_filas": num_filas, "num_variables": num_variables,
+                "matriz": matriz_original, "resultados": resultados_original, "es_igualdad": igualdad_original,
+                "costes": costes}
+
+    def tolerancia(valor):
+        return TOLERANCIA * (1 + abs(valor))
+
+    for _ in range(MAX_PASADAS):
+        quitar_filas = np.zeros(len(filas), dtype=bool)
+        cambio = False
+        cantidades = np.diff(matriz.indptr)
+
+        # Filas vacías: 0 <= b o 0 = b
+        for i in np.flatnonzero(cantidades == 0):
+            b = resultados[i]
+            if (es_igualdad[i] and abs(b) > tolerancia(b)) or (not es_igualdad[i] and b < -tolerancia(b)):
+                registro["resultado"] = error_presolve(2, f"la restricción {filas[i]} no tiene variables y no se cumple.")
+                return None, registro
+            quitar_filas[i] = True
+            informe["filas_vacias"] += 1
+
+        # Filas con una sola variable: a * x_j <= b (o = b) pasa a ser una cota de x_j
+        for i in np.flatnonzero(cantidades == 1):
+            posicion = matriz.indptr[i]
+            j = matriz.indices[posicion]
+            a = matriz.data[posicion]
+            origen = columnas[j]
+            cota = resultados[i] / a
+            if es_igualdad[i] or a > 0:
+                if cota < superiores[origen]:
+                    superiores[origen] = cota
+                    fuente_superior[origen] = (filas[i], a)
+            if es_igualdad[i] or a < 0:
+                if cota > inferiores[origen]:
+                    inferiores[origen] = cota
+                    fuente_inferior[origen] = (filas[i], a)
+            if inferiores[origen] > superiores[origen] + tolerancia(superiores[origen]):
+                registro["resultado"] = error_presolve(2, f"las cotas de la variable {origen} son incompatibles.")
+                return None, registro
+            quitar_filas[i] = True
+            informe["filas_singleton"] += 1
+
+        # Filas '<=' redundantes: su máximo posible dentro de las cotas no supera b
+        positiva = matriz.multiply(matriz > 0).tocsr()
+        negativa = matriz.multiply(matriz < 0).tocsr()
+        # Sin ceros explícitos, para que 0 * inf no dé NaN en los productos
+        positiva.eliminate_zeros()
+        negativa.eliminate_zeros()
+        inferiores_activas = inferiores[columnas]
+        superiores_activas = superiores[columnas]
+        with np.errstate(invalid="ignore"):
+            maximo = positiva @ superiores_activas + negativa @ inferiores_activas
+            minimo = positiva @ inferiores_activas + negativa @ superiores_activas
+        for i in np.flatnonzero(~quitar_filas):
+            b = resultados[i]
+            if minimo[i] > b + tolerancia(b) or (es_igualdad[i] and maximo[i] < b - tolerancia(b)):
+                registro["resultado"] = error_presolve(2, f"la restricción {filas[i]} no puede cumplirse con las cotas de sus variables.")
+                return None, registro
+            if not es_igualdad[i] and maximo[i] <= b + tolerancia(b):
+                quitar_filas[i] = True
+                informe["filas_redundantes"] += 1
+
+        # Filas duplicadas: se normaliza cada fila por su primer coeficiente y se agrupan por
+        # dos proyecciones aleatorias; cada grupo candidato se comprueba exactamente
+        activas = np.flatnonzero(~quitar_filas & (cantidades > 0))
+        if len(activas) > 1:
+            primeros = matriz.data[matriz.indptr[activas]]
+            escala = np.where(es_igualdad[activas], 1.0 / primeros, 1.0 / np.abs(primeros))
+            normalizada = sparse.diags(escala) @ matriz[activas]
+            generador = np.random.default_rng(0)
+            proyecciones = normalizada @ generador.standard_normal((len(columnas), 2))
+            claves = np.column_stack([np.round(proyecciones, 9), cantidades[activas], es_igualdad[activas]])
+            _, grupos, repeticiones = np.unique(claves, axis=0, return_inverse=True, return_counts=True)
+            grupos = grupos.ravel()
+            for grupo in np.flatnonzero(repeticiones > 1):
+                miembros = np.flatnonzero(grupos == grupo)
+                referencia = normalizada[miembros[0]]
+                iguales = [m for m in miembros
+                           if abs(normalizada[m] - referencia).sum() <= TOLERANCIA * (1 + abs(referencia).sum())]
+                if len(iguales) < 2:
+                    continue
+                lados = np.array([resultados[activas[m]] * escala[m] for m in iguales])
+                if es_igualdad[activas[iguales[0]]]:
+                    if np.ptp(lados) > tolerancia(lados.max()):
+                        registro["resultado"] = error_presolve(2, "dos restricciones de igualdad proporcionales son incompatibles.")
+                        return None, registro
+                    conservar = 0
+                else:
+                    conservar = int(np.argmin(lados))
+                for posicion, m in enumerate(iguales):
+                    if posicion != conservar:
+                        quitar_filas[activas[m]] = True
+                        informe["filas_duplicadas"] += 1
+
+        if quitar_filas.any():
+            cambio = True
+            matriz = matriz[~quitar_filas]
+            resultados = resultados[~quitar_filas]
+            es_igualdad = es_igualdad[~quitar_filas]
+            filas = filas[~quitar_filas]
+
+        # Variables fijas y columnas vacías
+        costes_activos = costes[columnas]
+        vacias = matriz.getnnz(axis=0) == 0
+        fijas = superiores[columnas] - inferiores[columnas] <= TOLERANCIA * (1 + np.abs(inferiores[columnas]))
+        # Una columna vacía que mejora el objetivo sin cota superior hace el problema no acotado
+        # solo si el resto es factible; se deja en el modelo reducido para que lo decida HiGHS
+        sin_limite = vacias & ~fijas & (costes_activos < 0) & np.isinf(superiores[columnas])
+        quitar_columnas = (fijas | vacias) & ~sin_limite
+        for j in np.flatnonzero(quitar_columnas):
+            origen = columnas[j]
+            if fijas[j]:
+                valor = inferiores[origen]
+                informe["variables_fijas"] += 1
+            else:
+                # Columna vacía: la variable va a la cota que más favorece el objetivo (mínimo)
+                if costes_activos[j] < 0:
+                    valor = superiores[origen]
+                else:
+                    valor = inferiores[origen]
+                informe["columnas_vacias"] += 1
+            valores_fijos[origen] = valor
+            fijadas.append((origen, fuente_inferior[origen], fuente_superior[origen]))
+
+        if quitar_columnas.any():
+            cambio = True
+            columna_fija = matriz[:, np.flatnonzero(quitar_columnas)]
+            resultados = resultados - columna_fija @ valores_fijos[columnas[quitar_columnas]]
+            matriz = matriz[:, np.flatnonzero(~quitar_columnas)].tocsr()
+            columnas = columnas[~quitar_columnas]
+
+        matriz.eliminate_zeros()
+        if not cambio:
+            break
+
+    informe["filas_finales"] = len(filas)
+    informe["variables_finales"] = len(columnas)
+    informe["rango_coeficientes_inicial"] = rango_coeficientes(matriz)
+
+    escala_filas = np.ones(len(filas))
+    escala_columnas = np.ones(len(columnas))
+    if escalar and matriz.nnz:
+        escalada = matriz
+        for _ in range(ITERACIONES_ESCALADO):
+            factores = factores_media_geometrica(escalada, 1)
+            escalada = sparse.diags(factores) @ escalada
+            escala_filas *= factores
+            factores = factores_media_geometrica(escalada, 0)
+            escalada = (escalada @ sparse.diags(factores)).tocsr()
+            escala_columnas *= factores
+        # Con el redondeo a potencias de 2 una matriz ya bien escalada puede empeorar
+        if rango_coeficientes(escalada) < informe["rango_coeficientes_inicial"]:
+            matriz = escalada
+        else:
+            escala_filas[:] = 1.0
+            escala_columnas[:] = 1.0
+    informe["rango_coeficientes_final"] = rango_coeficientes(matriz)
+
+    resultados = escala_filas * resultados
+    ub = np.flatnonzero(~es_igualdad)
+    eq = np.flatnonzero(es_igualdad)
+    reducido = {
+        "tipo_problema": modelo["tipo_problema"],
+        "c": escala_columnas * costes[columnas],
+        "A_ub": matriz[ub] if len(ub) else None,
+        "b_ub": resultados[ub] if len(ub) else None,
+        "A_eq": matriz[eq] if len(eq) else None,
+        "b_eq": resultados[eq] if len(eq) else None,
+        # x = escala * x' y las cotas de x' se dividen por la escala
+        "bounds": np.column_stack([inferiores[columnas] / escala_columnas, superiores[columnas] / escala_columnas]),
+        "filas": None,
+    }
+    registro.update({
+        "filas": filas, "columnas": columnas, "ub": ub, "eq": eq,
+        "escala_filas": escala_filas, "escala_columnas": escala_columnas,
+        "valores_fijos": valores_fijos, "fijadas": fijadas,
+        "fuente_inferior": fuente_inferior, "fuente_superior": fuente_superior,
+    })
+    return reducido, registro
+
+
+def postprocesar(res, registro, modelo):
+    """
+    Lleva el resultado de linprog sobre el modelo reducido al modelo original.
+
+    :param res: Resultado de linprog para el modelo reducido (o None si no quedó nada que resolver).
+    :param registro: Registro de 'preprocesar'.
+    :param modelo: Modelo original de 'construir_modelo'.
+    :return: OptimizeResult con 'x', 'fun', 'ineqlin' y 'eqlin' del modelo original.
+    """
+    if res is not None and not res.success:
+        return res
+
+    num_variables = registro["num_variables"]
+    columnas = registro["columnas"]
+    matriz = registro["matriz"]
+    costes = registro["costes"]
+
+    x = registro["valores_fijos"].copy()
+    duales = np.zeros(registro["num_filas"])
+    if res is not None:
+        x[columnas] = registro["escala_columnas"] * res.x
+        # y = escala_fila * y' y los multiplicadores de las cotas se dividen por la escala de x
+        reducidos = np.zeros(len(registro["filas"]))
+        if len(registro["ub"]):
+            reducidos[registro["ub"]] = res.ineqlin.marginals
+        if len(registro["eq"]):
+            reducidos[registro["eq"]] = res.eqlin.marginals
+        duales[registro["filas"]] = registro["escala_filas"] * reducidos
+        marginales_inferiores = res.lower.marginals / registro["escala_columnas"]
+        marginales_superiores = res.upper.marginals / registro["escala_columnas"]
+        for k, origen in enumerate(columnas):
+            # Una fila convertida en cota hereda el multiplicador de la cota: b = a * cota
+            if registro["fuente_inferior"][origen] is not None and marginales_inferiores[k] != 0:
+                fila, a = registro["fuente_inferior"][origen]
+                duales[fila] = marginales_inferiores[k] / a
+            if registro["fuente_superior"][origen] is not None and marginales_superiores[k] != 0:
+                fila, a = registro["fuente_superior"][origen]
+                duales[fila] = marginales_superiores[k] / a
+
+    # Variables fijadas, en orden inverso: su coste reducido pasa a la fila de la cota activa
+    columnas_matriz = matriz.tocsc()
+    for origen, fuente_inferior, fuente_superior in reversed(registro["fijadas"]):
+        inicio, fin = columnas_matriz.indptr[origen], columnas_matriz.indptr[origen + 1]
+        reducido = costes[origen] - columnas_matriz.data[inicio:fin] @ duales[columnas_matriz.indices[inicio:fin]]
+        fuente = fuente_superior if reducido < 0 else fuente_inferior if reducido > 0 else None
+        if fuente is not None:
+            fila, a = fuente
+            duales[fila] += reducido / a
+
+    actividad = matriz @ x
+    holguras = registro["resultados"] - actividad
+    es_igualdad = registro["es_igualdad"]
+    num_ub = int((~es_igualdad).sum())
+    informe = registro["informe"]
+    return OptimizeResult(
+        status=0, success=True,
+        message=res.message if res is not None else "Preprocesado: todas las variables quedaron fijadas.",
+        nit=int(getattr(res, "nit", 0)) if res is not None else 0,
+        fun=float(costes @ x), x=x[:num_variables],
+        ineqlin=OptimizeResult(marginals=duales[:num_ub], residual=holguras[:num_ub]),
+        eqlin=OptimizeResult(marginals=duales[num_ub:], residual=holguras[num_ub:]),
+        presolve=informe,
+    )
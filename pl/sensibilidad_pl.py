@@ -0,0 +1,224 @@
+from scipy.optimize import linprog
+from pl.optimizacion_pl import construir_modelo
+import numpy as np
+
+
+def modelo_linprog(modelo):
+    """
+    Extrae del modelo los argumentos de restricciones y límites que recibe linprog.
+
+    :param modelo: Modelo construido con 'construir_modelo'.
+    :return: Diccionario con A_ub, b_ub, A_eq, b_eq y bounds.
+    """
+    return {clave: modelo[clave] for clave in ["A_ub", "b_ub", "A_eq", "b_eq", "bounds"]}
+
+
+def crear_evaluador_rhs(modelo, indice_restriccion):
+    """
+    Crea una función que resuelve el modelo variando el resultado de una restricción.
+
+    :param modelo: Modelo construido con 'construir_modelo'.
+    :param indice_restriccion: Índice de la restricción original cuyo resultado se varía.
+    :return: Función t -> (valor óptimo, dual de la restricción) o None si no hay solución.
+    """
+    tipo_fila, indice, signo_fila = modelo["filas"][indice_restriccion]
+    clave_b = "b_ub" if tipo_fila == "ub" else "b_eq"
+    signo_objetivo = -1 if modelo["tipo_problema"] == 'max' else 1
+    argumentos = modelo_linprog(modelo)
+    b = argumentos[clave_b] = modelo[clave_b].copy()
+
+    def evaluar(t):
+        b[indice] = signo_fila * t
+        res = linprog(modelo["c"], method='highs', **argumentos)
+        if not res.success:
+            return None
+        grupo = res.ineqlin if tipo_fila == "ub" else res.eqlin
+        # La pendiente del valor óptimo respecto al resultado es el dual de la restricción
+        return signo_objetivo * res.fun, signo_objetivo * signo_fila * grupo.marginals[indice]
+
+    return evaluar
+
+
+def crear_evaluador_objetivo(modelo, indice_variable):
+    """
+    Crea una función que resuelve el modelo variando un coeficiente de la función objetivo.
+
+    :param modelo: Modelo construido con 'construir_modelo'.
+    :param indice_variable: Índice de la variable cuyo coeficiente se varía.
+    :return: Función t -> (valor óptimo, valor de la variable) o None si no hay solución.
+    """
+    signo_objetivo = -1 if modelo["tipo_problema"] == 'max' else 1
+    c = modelo["c"].copy()
+    argumentos = modelo_linprog(modelo)
+
+    def evaluar(t):
+        c[indice_variable] = signo_objetivo * t
+        res = linprog(c, method='highs', **argumentos)
+        if not res.success:
+            return None
+        # La pendiente del valor óptimo respecto al coeficiente es el valor de la variable
+        return signo_objetivo * res.fun, res.x[indice_variable]
+
+    return evaluar
+
+
+def buscar_dominio(evaluador, valores):
+    """
+    Encuentra el tramo de valores en el que el problema tiene solución. El conjunto de
+    parámetros con solución es un intervalo, por lo que basta con búsquedas binarias.
+
+    :param evaluador: Función creada con 'crear_evaluador_rhs' o 'crear_evaluador_objetivo'.
+    :param valores: Array ordenado de valores del parámetro.
+    :return: Tupla (índice inicial, índice final, evaluaciones conocidas) o None si no hay solución.
+    """
+    conocidos = {}
+
+    def evaluar(i):
+        if i not in conocidos:
+            conocidos[i] = evaluador(valores[i])
+        return conocidos[i]
+
+    n = len(valores)
+    # Buscar un valor con solución probando primero los extremos y luego puntos medios
+    candidatos = [0, n - 1]
+    paso = n // 2
+    while paso >= 1:
+        candidatos.extend(range(paso, n, 2 * paso))
+        paso //= 2
+    inicio = next((i for i in candidatos if evaluar(i) is not None), None)
+    if inicio is None:
+        return None
+
+    # Búsqueda binaria de los bordes del intervalo con solución
+    bajo, alto = 0, inicio
+    while bajo < alto:
+        medio = (bajo + alto) // 2
+        if evaluar(medio) is None:
+            bajo = medio + 1
+        else:
+            alto = medio
+    primero = bajo
+
+    bajo, alto = inicio, n - 1
+    while bajo < alto:
+        medio = (bajo + alto + 1) // 2
+        if evaluar(medio) is None:
+            alto = medio - 1
+        else:
+            bajo = medio
+    ultimo = bajo
+
+    return primero, ultimo, {valores[i]: r for i, r in conocidos.items() if r is not None}
+
+
+def barrido(evaluador, valores, tolerancia=1e-9):
+    """
+    Calcula la curva lineal por tramos del valor óptimo en función de un parámetro.
+
+    Entre dos puntos resueltos, las pendientes (duales) definen dos rectas; si se cortan,
+    solo se vuelve a resolver en el punto de corte. Si el valor allí coincide con las
+    rectas, ese punto es un quiebre; si no, se repite en cada mitad. Así el número de
+    resoluciones depende del número de quiebres y no del número de valores pedidos.
+
+    :param evaluador: Función creada con 'crear_evaluador_rhs' o 'crear_evaluador_objetivo'.
+    :param valores: Valores del parámetro en los que se quiere el valor óptimo.
+    :param tolerancia: Tolerancia relativa para comparar valores y pendientes.
+    :return: Diccionario con 'valores', 'valores_optimos' (NaN donde no hay solución),
+             'curva' (parámetros y valores de los vértices de la curva), 'puntos_quiebre'
+             y 'resoluciones'.
+    """
+    valores = np.asarray(valores, dtype=float)
+    ordenados = np.unique(valores)
+    resultado = {
+        "valores": valores,
+        "valores_optimos": np.full(valores.shape, np.nan),
+        "curva": (np.array([]), np.array([])),
+        "puntos_quiebre": [],
+        "resoluciones": 0,
+    }
+
+    resoluciones = 0
+
+    def contar(evaluador_original):
+        def evaluar(t):
+            nonlocal resoluciones
+            resoluciones += 1
+            return evaluador_original(t)
+        return evaluar
+
+    evaluador = contar(evaluador)
+    dominio = buscar_dominio(evaluador, ordenados)
+    if dominio is None:
+        resultado["resoluciones"] = resoluciones
+        return resultado
+
+    primero, ultimo, puntos = dominio
+    t_inicio, t_fin = ordenados[primero], ordenados[ultimo]
+    puntos = {t: r for t, r in puntos.items() if t_inicio <= t <= t_fin}
+    quiebres = []
+
+    def iguales(a, b):
+        return abs(a - b) <= tolerancia * (1 + abs(a) + abs(b))
+
+    # Pila de intervalos pendientes de revisar
+    pendientes = [(t_inicio, t_fin)]
+    while pendientes:
+        t_a, t_b = pendientes.pop()
+        if t_b <= t_a:
+            continue
+        z_a, s_a = puntos[t_a]
+        z_b, s_b = puntos[t_b]
+        if iguales(s_a, s_b):
+            continue  # Un solo tramo lineal entre ambos puntos
+
+        # Intersección de las rectas tangentes en t_a y t_b
+        t_corte = (z_b - z_a + s_a * t_a - s_b * t_b) / (s_a - s_b)
+        if not (t_a < t_corte < t_b) or iguales(t_corte, t_a) or iguales(t_corte, t_b):
+            quiebres.append(t_a if abs(t_corte - t_a) < abs(t_corte - t_b) else t_b)
+            continue
+
+        evaluacion = evaluador(t_corte)
+        if evaluacion is None:
+            continue
+        puntos[t_corte] = evaluacion
+        if iguales(evaluacion[0], z_a + s_a * (t_corte - t_a)):
+            quiebres.append(t_corte)
+        else:
+            pendientes.append((t_a, t_corte))
+            pendientes.append((t_corte, t_b))
+
+    # La curva es lineal entre puntos consecutivos, así que se interpola sobre ellos
+    t_curva = np.array(sorted(puntos))
+    z_curva = np.array([puntos[t][0] for t in t_curva])
+    dentro = (valores >= t_inicio) & (valores <= t_fin)
+    resultado["valores_optimos"][dentro] = np.interp(valores[dentro], t_curva, z_curva)
+    resultado["curva"] = (t_curva, z_curva)
+    resultado["puntos_quiebre"] = sorted(float(t) for t in set(quiebres))
+    resultado["resoluciones"] = resoluciones
+    return resultado
+
+
+def barrido_rhs(datos_optimizacion, indice_restriccion, valores):
+    """
+    Calcula el valor óptimo para una serie de valores del resultado de una restricción.
+
+    :param datos_optimizacion: Diccionario con los datos del problema lineal.
+    :param indice_restriccion: Índice de la restricción cuyo resultado se varía.
+    :param valores: Valores que toma el resultado de la restricción.
+    :return: Diccionario descrito en 'barrido'.
+    """
+    modelo = construir_modelo(datos_optimizacion)
+    return barrido(crear_evaluador_rhs(modelo, indice_restriccion), valores)
+
+
+def barrido_objetivo(datos_optimizacion, indice_variable, valores):
+    """
+    Calcula el valor óptimo para una serie de valores de un coeficiente de la función objetivo.
+
+    :param datos_optimizacion: Diccionario con los datos del problema lineal.
+    :param indice_variable: Índice de la variable cuyo coeficiente se varía.
+    :param valores: Valores que toma el coeficiente.
+    :return: Diccionario descrito en 'barrido'.
+    """
+    modelo = construir_modelo(datos_optimizacion)
+    return barrido(crear_evaluador_objetivo(modelo, indice_variable), valores)
@@ -0,0 +1,176 @@
+"""
+Generadores de problemas aleatorios reproducibles para las pruebas de rendimiento.
+
+Todos los problemas son factibles por construcción: se elige un punto interior x0 y cada
+término independiente se fija a partir del valor de la restricción en x0 con una holgura.
+"""
+import numpy as np
+
+
+def generar_pl(num_variables, num_restricciones=None, no_nulos_por_fila=None, semilla=0):
+    """
+    Genera un problema lineal de maximización factible y acotado.
+
+    La primera restricción es sum(x_i) <= cota, que acota la región; el resto mezcla
+    filas '<=' y '>=' con coeficientes no negativos.
+
+    :param num_variables: Número de variables.
+    :param num_restricciones: Número de restricciones; por defecto num_variables // 2 + 1.
+    :param no_nulos_por_fila: Coeficientes no nulos de cada fila (salvo la primera). Si es
+                              None el problema es denso (listas de coeficientes); si no, las
+                              filas son diccionarios {índice: coeficiente}, el formato
+                              disperso de 'pl.optimizacion_pl'.
+    :param semilla: Semilla del generador.
+    :return: Diccionario datos_optimizacion de programación lineal.
+    """
+    rng = np.random.default_rng(semilla)
+    if num_restricciones is None:
+        num_restricciones = num_variables // 2 + 1
+    x0 = rng.uniform(0.5, 1.5, num_variables)
+
+    restricciones = [{
+        "coeficientes": [1.0] * num_variables if no_nulos_por_fila is None else {i: 1.0 for i in range(num_variables)},
+        "operador": "<=",
+        "resultado": float(x0.sum() * 2),
+    }]
+
+    for k in range(1, num_restricciones):
+        if no_nulos_por_fila is None:
+            indices = np.arange(num_variables)
+        else:
+            cantidad = min(no_nulos_por_fila, num_variables)
+            indices = np.sort(rng.choice(num_variables, size=cantidad, replace=False))
+        valores = rng.uniform(0.1, 1.0, len(indices))
+        actividad = float(valores @ x0[indices])
+
+        # Dos de cada tres filas son '<=', el resto '>='; x0 las cumple con holgura
+        if k % 3:
+            operador, resultado = "<=", actividad * rng.uniform(1.05, 1.5)
+        else:
+            operador, resultado = ">=", actividad * rng.uniform(0.5, 0.95)
+
+        if no_nulos_por_fila is None:
+            coeficientes = valores.tolist()
+        else:
+            coeficientes = {int(i): float(v) for i, v in zip(indices, valores)}
+        restricciones.append({"coeficientes": coeficientes, "operador": operador, "resultado": float(resultado)})
+
+    return {
+        "variables": rng.uniform(0.1, 1.0, num_variables).tolist(),
+        "tipo_problema": "max",
+        "restricciones": restricciones,
+    }
+
+
+def generar_npl(num_variables, num_restricciones=None, convexo=True, semilla=0):
+    """
+    Genera un problema no lineal separable sum(c_i * x_i ** e_i) con exponentes de 1 a 3.
+
+    Convexo: minimización con c_i > 0 (convexa en x >= 0), una fila lineal sum(x_i) >= b que
+    evita la solución trivial x = 0 y filas '<=' de coeficientes no negativos (región convexa).
+    No convexo: maximización de la misma forma de función (convexa, así que el máximo está en
+    la frontera y puede haber varios óptimos locales) sobre filas '<=' que acotan la región.
+
+    :param num_variables: Número de variables.
+    :param num_restricciones: Número de restricciones; por defecto max(2, num_variables // 2).
+    :param convexo: Tipo de problema a generar.
+    :param semilla: Semilla del generador.
+    :return: Diccionario datos_optimizacion de programación no lineal.
+    """
+    rng = np.random.default_rng(semilla)
+    if num_restricciones is None:
+        num_restricciones = max(2, num_variables // 2)
+    x0 = rng.uniform(0.5, 1.5, num_variables)
+
+    restricciones = []
+    if convexo:
+        restricciones.append({
+            "coeficientes": [1.0] * num_variables,
+            "exponentes": [1] * num_variables,
+            "operador": ">=",
+            "resultado": float(x0.sum() * 0.8),
+        })
+    else:
+        # Fila que acota todas las variables para que el máximo exista
+        restricciones.append({
+            "coeficientes": [1.0] * num_variables,
+            "exponentes": [2] * num_variables,
+            "operador": "<=",
+            "resultado": float((x0 ** 2).sum() * 1.5),
+        })
+
+    while len(restricciones) < num_restricciones:
+        coeficientes = rng.uniform(0.0, 1.0, num_variables) * (rng.random(num_variables) < 0.5)
+        exponentes = rng.integers(1, 4, num_variables)
+        actividad = float(coeficientes @ x0 ** exponentes)
+        restricciones.append({
+            "coeficientes": coeficientes.tolist(),
+            "exponentes": exponentes.tolist(),
+            "operador": "<=",
+            "resultado": actividad * float(rng.uniform(1.1, 2.0)) + 0.1,
+        })
+
+    return {
+        "coeficientes_objetivo": rng.uniform(0.1, 1.0, num_variables).tolist(),
+        "exponentes_objetivo": rng.integers(1, 4, num_variables).tolist(),
+        "tipo_problema": "min" if convexo else "max",
+        "restricciones": restricciones,
+    }
+
+
+def generar_polinomico(num_variables, num_restricciones=None, monomios_por_fila=6, semilla=0):
+    """
+    Genera un problema no lineal con términos cruzados en el formato de monomios de
+    'npl.polinomios_npl': minimización de un cuadrado por variable más 2 * num_variables
+    monomios de 1 a 3 variables con exponentes 1 o 2, todos con coeficientes positivos.
+
+    Una fila sum(x_i) >= b evita la solución trivial x = 0 y el resto son filas '<=' de
+    pocos monomios con coeficientes no negativos, que x0 cumple con holgura.
+
+    :param num_variables: Número de variables.
+    :param num_restricciones: Número de restricciones; por defecto max(2, num_variables // 2).
+    :param monomios_por_fila: Monomios de cada restricción '<='.
+    :param semilla: Semilla del generador.
+    :return: Diccionario datos_optimizacion de programación no lineal.
+    """
+    rng = np.random.default_rng(semilla)
+    if num_restricciones is None:
+        num_restricciones = max(2, num_variables // 2)
+    x0 = rng.uniform(0.5, 1.5, num_variables)
+
+    def monomios(cantidad):
+        lista = []
+        for _ in range(cantidad):
+            grado = int(rng.integers(1, min(3, num_variables) + 1))
+            variables = rng.choice(num_variables, size=grado, replace=False)
+            exponentes = {int(i): int(rng.integers(1, 3)) for i in variables}
+            lista.append({"coeficiente": float(rng.uniform(0.1, 1.0)), "exponentes": exponentes})
+        return lista
+
+    def valor(lista):
+        return sum(m["coeficiente"] * np.prod([x0[i] ** e for i, e in m["exponentes"].items()]) for m in lista)
+
+    restricciones = [{
+        "coeficientes": [1.0] * num_variables,
+        "exponentes": [1] * num_variables,
+        "operador": ">=",
+        "resultado": float(x0.sum() * 0.8),
+    }]
+    while len(restricciones) < num_restricciones:
+        fila = monomios(monomios_por_fila)
+        restricciones.append({
+            "monomios": fila,
+            "operador": "<=",
+            "resultado": float(valor(fila) * rng.uniform(1.1, 2.0) + 0.1),
+        })
+
+    # Un cuadrado por variable para que el mínimo no se anule concentrando x en los términos cruzados
+    cuadrados = [{"coeficiente": float(c), "exponentes": {i: 2}}
+                 for i, c in enumerate(rng.uniform(0.1, 1.0, num_variables))]
+
+    return {
+        "num_variables": num_variables,
+        "monomios_objetivo": cuadrados + monomios(2 * num_variables),
+        "tipo_problema": "min",
+        "restricciones": restricciones,
+    }
@@ -0,0 +1,238 @@
+"""
+Pruebas de rendimiento de los resolvedores lineal y no lineal.
+
+Uso:
+    python -m rendimiento.suite --salida resultados.json
+    python -m rendimiento.suite --salida nuevo.json --base resultados.json
+
+Se miden las funciones 'resolver' (el núcleo sin interfaz de 'optimizar'), sin caché.
+Con --base se comparan los resultados con una ejecución guardada y el código de salida es 1
+si algún caso empeora en tiempo, estado o valor objetivo.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import scipy
+
+from pl.optimizacion_pl import resolver as resolver_pl
+from npl.optimizacion_npl import resolver as resolver_npl
+from npl.polinomios_npl import contar_variables
+from rendimiento.generadores import generar_pl, generar_npl, generar_polinomico
+
+# Tamaños por defecto; los densos se limitan porque la matriz crece con n²
+TAMANOS_PL_DENSO = [2, 10, 100, 1000]
+TAMANOS_PL_DISPERSO = [100, 1000, 10000]
+TAMANOS_NPL = [2, 10, 50, 200]
+TAMANOS_NPL_POLINOMICO = [10, 100, 300]
+# Coeficientes no nulos por fila de los problemas lineales dispersos
+NO_NULOS_POR_FILA = 10
+
+# Versión del formato del archivo de resultados
+VERSION_FORMATO = 1
+
+
+def crear_casos(rapido=False, clases=("pl", "npl")):
+    """
+    Define los casos de la suite.
+
+    :param rapido: Si es True se usan solo los tamaños pequeños.
+    :param clases: Clases de problema a incluir ('pl', 'npl').
+    :return: Lista de diccionarios con 'nombre', 'clase' y 'datos'.
+    """
+    def recortar(tamanos):
+        return [n for n in tamanos if n <= 100] if rapido else tamanos
+
+    casos = []
+    if "pl" in clases:
+        for n in recortar(TAMANOS_PL_DENSO):
+            casos.append({"nombre": f"pl_denso_{n}", "clase": "pl", "datos": generar_pl(n, semilla=n)})
+        for n in recortar(TAMANOS_PL_DISPERSO):
+            casos.append({"nombre": f"pl_disperso_{n}", "clase": "pl",
+                          "datos": generar_pl(n, no_nulos_por_fila=NO_NULOS_POR_FILA, semilla=n)})
+    if "npl" in clases:
+        for n in recortar(TAMANOS_NPL):
+            for convexo in (True, False):
+                tipo = "convexo" if convexo else "no_convexo"
+                casos.append({"nombre": f"npl_{tipo}_{n}", "clase": "npl",
+                              "datos": generar_npl(n, convexo=convexo, semilla=n)})
+        for n in recortar(TAMANOS_NPL_POLINOMICO):
+            casos.append({"nombre": f"npl_polinomico_{n}", "clase": "npl",
+                          "datos": generar_polinomico(n, semilla=n)})
+    return casos
+
+
+def ejecutar_caso(caso, repeticiones=3):
+    """
+    Mide un caso: tiempo (mediana de las repeticiones), evaluaciones, iteraciones, memoria
+    pico y valor objetivo.
+
+    La memoria se mide en una ejecución aparte con tracemalloc, que enlentece Python y no
+    ve la memoria interna de HiGHS o SLSQP, pero sí los arrays de numpy del modelo.
+
+    :param caso: Diccionario de 'crear_casos'.
+    :param repeticiones: Número de ejecuciones cronometradas.
+    :return: Diccionario con las métricas del caso.
+    """
+    resolver = resolver_pl if caso["clase"] == "pl" else resolver_npl
+    datos = caso["datos"]
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = resolver(datos)
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        resolver(datos)
+        memoria_pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    num_variables = len(datos["variables"]) if caso["clase"] == "pl" else contar_variables(datos)
+    return {
+        "nombre": caso["nombre"],
+        "clase": caso["clase"],
+        "tipo_problema": datos["tipo_problema"],
+        "num_variables": num_variables,
+        "num_restricciones": len(datos["restricciones"]),
+        "estado": resultado["estado"],
+        "valor_optimo": resultado["valor_optimo"],
+        "tiempo": float(np.median(tiempos)),
+        "tiempos": tiempos,
+        "iteraciones": resultado["iteraciones"],
+        "evaluaciones": resultado.get("evaluaciones"),
+        "metodo": resultado.get("metodo"),
+        "memoria_pico": int(memoria_pico),
+    }
+
+
+def ejecutar_suite(casos, repeticiones=3, informar=None):
+    """
+    Ejecuta todos los casos.
+
+    :param casos: Lista de 'crear_casos'.
+    :param repeticiones: Número de ejecuciones cronometradas por caso.
+    :param informar: Función opcional que recibe el resultado de cada caso al terminar.
+    :return: Diccionario con 'version', 'fecha', 'entorno' y 'casos'.
+    """
+    resultados = []
+    for caso in casos:
+        resultado = ejecutar_caso(caso, repeticiones)
+        resultados.append(resultado)
+        if informar is not None:
+            informar(resultado)
+
+    return {
+        "version": VERSION_FORMATO,
+        "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "scipy": scipy.__version__,
+            "plataforma": platform.platform(),
+        },
+        "casos": resultados,
+    }
+
+
+def comparar(actual, base, tolerancia_tiempo=0.25, tolerancia_objetivo=1e-6, tiempo_minimo=5e-3):
+    """
+    Compara una ejecución con otra guardada como referencia.
+
+    Un caso es una regresión si deja de ser óptimo, si su valor objetivo empeora más que
+    'tolerancia_objetivo' (relativa) o si su tiempo crece más que 'tolerancia_tiempo'
+    (relativa). Los tiempos por debajo de 'tiempo_minimo' segundos se consideran ruido.
+
+    :param actual: Resultados de 'ejecutar_suite'.
+    :param base: Resultados de referencia con el mismo formato.
+    :return: Lista de diccionarios por caso común con 'nombre', 'tiempo_base',
+             'tiempo_actual', 'razon_tiempo', 'regresion' y 'motivos'.
+    """
+    casos_base = {caso["nombre"]: caso for caso in base["casos"]}
+    comparacion = []
+
+    for caso in actual["casos"]:
+        referencia = casos_base.get(caso["nombre"])
+        if referencia is None:
+            continue
+
+        motivos = []
+        if referencia["estado"] == "optimo" and caso["estado"] != "optimo":
+            motivos.append(f"estado {referencia['estado']} -> {caso['estado']}")
+
+        if caso["valor_optimo"] is not None and referencia["valor_optimo"] is not None:
+            signo = 1 if caso["tipo_problema"] == "max" else -1
+            perdida = signo * (referencia["valor_optimo"] - caso["valor_optimo"])
+            if perdida > tolerancia_objetivo * (1 + abs(referencia["valor_optimo"])):
+                motivos.append(f"objetivo {referencia['valor_optimo']:.6g} -> {caso['valor_optimo']:.6g}")
+
+        razon = max(caso["tiempo"], tiempo_minimo) / max(referencia["tiempo"], tiempo_minimo)
+        if razon > 1 + tolerancia_tiempo:
+            motivos.append(f"tiempo x{razon:.2f}")
+
+        comparacion.append({
+            "nombre": caso["nombre"],
+            "tiempo_base": referencia["tiempo"],
+            "tiempo_actual": caso["tiempo"],
+            "razon_tiempo": razon,
+            "regresion": bool(motivos),
+            "motivos": motivos,
+        })
+
+    return comparacion
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada de la línea de comandos.
+
+    :param argumentos: Lista de argumentos; por defecto se usan los de sys.argv.
+    :return: Código de salida (1 si hay regresiones respecto de la base).
+    """
+    analizador = argparse.ArgumentParser(prog="python -m rendimiento.suite",
+                                         description="Pruebas de rendimiento de los resolvedores.")
+    analizador.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    analizador.add_argument("--base", help="Resultados de referencia con los que comparar")
+    analizador.add_argument("--repeticiones", type=int, default=3, help="Ejecuciones cronometradas por caso")
+    analizador.add_argument("--rapido", action="store_true", help="Solo los tamaños pequeños (hasta 100 variables)")
+    analizador.add_argument("--clase", choices=["pl", "npl"], help="Ejecutar solo una clase de problema")
+    analizador.add_argument("--tolerancia-tiempo", type=float, default=0.25,
+                            help="Aumento relativo de tiempo tolerado frente a la base")
+    opciones = analizador.parse_args(argumentos)
+
+    clases = (opciones.clase,) if opciones.clase else ("pl", "npl")
+
+    def informar(resultado):
+        print(f"{resultado['nombre']:<24} {resultado['estado']:<18} {resultado['tiempo'] * 1000:10.2f} ms "
+              f"{resultado['memoria_pico'] / 1024:10.0f} KiB  objetivo={resultado['valor_optimo']}")
+
+    resultados = ejecutar_suite(crear_casos(opciones.rapido, clases), opciones.repeticiones, informar)
+
+    if opciones.salida:
+        with open(opciones.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+
+    if not opciones.base:
+        return 0
+
+    with open(opciones.base, encoding="utf-8") as archivo:
+        base = json.load(archivo)
+    comparacion = comparar(resultados, base, tolerancia_tiempo=opciones.tolerancia_tiempo)
+
+    print()
+    for fila in comparacion:
+        marca = "REGRESIÓN" if fila["regresion"] else "ok"
+        print(f"{fila['nombre']:<24} {fila['tiempo_base'] * 1000:10.2f} ms -> {fila['tiempo_actual'] * 1000:10.2f} ms "
+              f"(x{fila['razon_tiempo']:.2f}) {marca} {'; '.join(fila['motivos'])}")
+    return 1 if any(fila["regresion"] for fila in comparacion) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
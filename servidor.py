@@ -0,0 +1,323 @@
+"""
+Servicio local de resolución compartido entre clientes.
+
+Uso: python -m servidor [--direccion 127.0.0.1:47300 | --direccion /tmp/optimizacion.sock]
+                        [--trabajadores 4] [--cache 1024]
+
+El servidor (asyncio) mantiene un grupo de procesos que ya importaron scipy y los
+resolvedores, así que cada petición paga solo la resolución y no el arranque del intérprete.
+El protocolo es JSON Lines: cada línea que envía el cliente es una petición
+
+    {"id": 1, "datos": {...datos_optimizacion...}, "clase": "pl", "arranques": 1, "metodo": "auto"}
+
+('clase', 'arranques' y 'metodo' son opcionales) y el servidor responde con una línea
+
+    {"id": 1, "resultado": {...}, "compartido": false}
+
+por petición, en el orden en que terminan y no en el de llegada. Las peticiones idénticas
+(la misma clave de 'comun.cache_optimizacion') que llegan mientras otra se está resolviendo
+esperan a esa resolución en lugar de repetirla ('compartido' es True), y los resultados
+terminados se guardan en una caché en memoria. La línea {"tipo": "estado"} devuelve los
+contadores del servidor.
+
+scipy solo se importa en los procesos de trabajo, de modo que el cliente de este módulo
+('solicitar') es ligero.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from comun.cache_optimizacion import CacheOptimizacion, ajustar_duales, clave_problema, se_puede_guardar
+from comun.cargador_modelos import detectar_clase
+from consola import convertir_a_json, obtener_resolvedor
+
+DIRECCION_PREDETERMINADA = "127.0.0.1:47300"
+
+# Tamaño máximo de una línea del protocolo (un modelo grande puede ocupar varios MB)
+LIMITE_LINEA = 256 * 1024 * 1024
+
+
+def interpretar_direccion(direccion):
+    """
+    Interpreta la dirección del servicio.
+
+    :param direccion: 'host:puerto' o ruta de un socket Unix (contiene '/' o empieza por 'unix:').
+    :return: Tupla ('unix', ruta) o ('tcp', (host, puerto)).
+    :raises ValueError: Si la dirección no tiene un formato válido.
+    """
+    if direccion.startswith("unix:"):
+        return "unix", direccion[len("unix:"):]
+    if "/" in direccion:
+        return "unix", direccion
+    host, separador, puerto = direccion.rpartition(":")
+    if not separador or not puerto.isdigit():
+        raise ValueError(f"Dirección no válida: {direccion!r}")
+    return "tcp", (host or "127.0.0.1", int(puerto))
+
+
+def precargar():
+    """
+    Importa los resolvedores en un proceso de trabajo para que la primera petición no pague
+    la importación de scipy.
+    """
+    import pl.optimizacion_pl  # noqa: F401
+    import npl.optimizacion_npl  # noqa: F401
+    import npl.multiarranque_npl  # noqa: F401
+
+
+def resolver_en_trabajador(clase, datos_optimizacion, arranques, metodo, presolve=False, tiempo_limite=None):
+    """
+    Resuelve un problema en un proceso de trabajo.
+
+    :return: Diccionario de resultado del resolvedor.
+    """
+    return obtener_resolvedor(clase, arranques, metodo, presolve, tiempo_limite)(datos_optimizacion)
+
+
+def resultado_error(mensaje):
+    """
+    Crea el resultado de una petición que no se pudo resolver.
+
+    :param mensaje: Descripción del error.
+    :return: Diccionario de resultado con estado 'error'.
+    """
+    return {"estado": "error", "exito": False, "mensaje": mensaje, "valor_optimo": None, "variables": None}
+
+
+class ServidorOptimizacion:
+    """
+    Atiende peticiones de resolución con un grupo de procesos precargados, compartiendo
+    las resoluciones en curso entre peticiones idénticas.
+    """
+
+    def __init__(self, max_trabajadores=None, tamano_cache=1024):
+        """
+        :param max_trabajadores: Número de procesos de trabajo; None usa el número de CPU.
+        :param tamano_cache: Resultados terminados que se conservan; 0 desactiva la caché.
+        """
+        self.max_trabajadores = max_trabajadores or os.cpu_count() or 1
+        self.cache = CacheOptimizacion(tamano_cache) if tamano_cache else None
+        self.executor = None
+        # Clave del problema -> (futuro de la resolución, signos de la petición que la inició)
+        self.en_curso = {}
+        self.contadores = {"peticiones": 0, "resoluciones": 0, "compartidas": 0, "desde_cache": 0, "errores": 0}
+
+    async def iniciar(self):
+        """
+        Crea el grupo de procesos y espera a que todos hayan importado los resolvedores.
+        """
+        self.executor = ProcessPoolExecutor(max_workers=self.max_trabajadores, initializer=precargar)
+        bucle = asyncio.get_running_loop()
+        # Una tarea vacía por trabajador obliga a crear todos los procesos ahora
+        await asyncio.gather(*(bucle.run_in_executor(self.executor, precargar)
+                               for _ in range(self.max_trabajadores)))
+
+    def cerrar(self):
+        """
+        Detiene el grupo de procesos.
+        """
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def estado(self):
+        """
+        :return: Diccionario con los contadores del servidor y las resoluciones en curso.
+        """
+        estado = dict(self.contadores)
+        estado["en_curso"] = len(self.en_curso)
+        estado["trabajadores"] = self.max_trabajadores
+        return estado
+
+    async def resolver(self, peticion):
+        """
+        Resuelve una petición, reutilizando la caché o una resolución idéntica en curso.
+
+        :param peticion: Diccionario con 'datos' y opcionalmente 'clase', 'arranques', 'metodo',
+                         'presolve' y 'tiempo_limite'.
+        :return: Tupla (resultado, compartido).
+        """
+        self.contadores["peticiones"] += 1
+        try:
+            datos = peticion["datos"]
+            clase = peticion.get("clase") or detectar_clase(datos)
+            arranques = int(peticion.get("arranques", 1))
+            metodo = peticion.get("metodo", "auto")
+            presolve = bool(peticion.get("presolve", False))
+            tiempo_limite = peticion.get("tiempo_limite")
+            if tiempo_limite is not None:
+                tiempo_limite = float(tiempo_limite)
+            # Las opciones por defecto no forman parte de la clave, igual que en la interfaz
+            opciones = {}
+            if arranques > 1:
+                opciones["num_puntos"] = arranques
+            if metodo != "auto":
+                opciones["metodo"] = metodo
+            if presolve:
+                opciones["presolve"] = True
+            if tiempo_limite is not None:
+                opciones["tiempo_limite"] = tiempo_limite
+            clave, signos = clave_problema(clase, datos, **opciones)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            self.contadores["errores"] += 1
+            return resultado_error(f"Petición no válida: {e}"), False
+
+        if self.cache is not None:
+            resultado = self.cache.obtener(clave)
+            if resultado is not None:
+                self.contadores["desde_cache"] += 1
+                resultado = ajustar_duales(resultado, signos)
+                resultado["desde_cache"] = True
+                return resultado, False
+
+        compartido = clave in self.en_curso
+        if compartido:
+            futuro, signos_origen = self.en_curso[clave]
+            self.contadores["compartidas"] += 1
+        else:
+            bucle = asyncio.get_running_loop()
+            futuro = bucle.run_in_executor(self.executor, resolver_en_trabajador, clase, datos, arranques, metodo,
+                                            presolve, tiempo_limite)
+            signos_origen = signos
+            self.en_curso[clave] = (futuro, signos)
+            self.contadores["resoluciones"] += 1
+            futuro.add_done_callback(lambda _: self.en_curso.pop(clave, None))
+
+        try:
+            # shield: si un cliente se desconecta, los demás que esperan el mismo futuro siguen
+            resultado = await asyncio.shield(futuro)
+        except Exception as e:
+            self.contadores["errores"] += 1
+            return resultado_error(f"Error al resolver: {e}"), compartido
+
+        # Cada petición recibe su propia copia, con los duales en el signo de sus restricciones
+        resultado = ajustar_duales(ajustar_duales(dict(resultado), signos_origen), signos)
+        if not compartido and self.cache is not None and se_puede_guardar(resultado):
+            self.cache.guardar(clave, ajustar_duales(dict(resultado), signos))
+        resultado["desde_cache"] = False
+        return resultado, compartido
+
+    async def responder(self, linea, escritor):
+        """
+        Atiende una línea del protocolo y escribe su respuesta.
+        """
+        try:
+            peticion = json.loads(linea)
+            if not isinstance(peticion, dict):
+                raise ValueError("La petición debe ser un objeto JSON.")
+        except ValueError as e:
+            respuesta = {"id": None, "resultado": resultado_error(f"JSON no válido: {e}"), "compartido": False}
+        else:
+            if peticion.get("tipo") == "estado":
+                respuesta = {"id": peticion.get("id"), "estado": self.estado()}
+            else:
+                resultado, compartido = await self.resolver(peticion)
+                respuesta = {"id": peticion.get("id"), "resultado": resultado, "compartido": compartido}
+
+        escritor.write(json.dumps(convertir_a_json(respuesta), ensure_ascii=False).encode("utf-8") + b"\n")
+        await escritor.drain()
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión: cada línea se resuelve en paralelo con las demás y su respuesta
+        se envía en cuanto termina. La conexión se cierra cuando el cliente deja de enviar y
+        todas sus peticiones han respondido.
+        """
+        tareas = set()
+        try:
+            while linea := await lector.readline():
+                if linea.strip():
+                    tareas.add(asyncio.create_task(self.responder(linea, escritor)))
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            for tarea in tareas:
+                tarea.cancel()
+        finally:
+            escritor.close()
+
+    async def servir(self, direccion=DIRECCION_PREDETERMINADA, al_iniciar=None):
+        """
+        Inicia los procesos de trabajo y atiende conexiones hasta que se cancele la tarea.
+
+        :param direccion: Dirección del servicio (ver 'interpretar_direccion').
+        :param al_iniciar: Función opcional que se llama cuando el servidor ya acepta conexiones.
+        """
+        tipo, destino = interpretar_direccion(direccion)
+        await self.iniciar()
+        try:
+            if tipo == "unix":
+                if os.path.exists(destino):
+                    os.unlink(destino)
+                servidor = await asyncio.start_unix_server(self.atender, path=destino, limit=LIMITE_LINEA)
+            else:
+                servidor = await asyncio.start_server(self.atender, *destino, limit=LIMITE_LINEA)
+            async with servidor:
+                if al_iniciar is not None:
+                    al_iniciar()
+                await servidor.serve_forever()
+        finally:
+            self.cerrar()
+            if tipo == "unix" and os.path.exists(destino):
+                os.unlink(destino)
+
+
+def solicitar(peticiones, direccion=DIRECCION_PREDETERMINADA, tiempo_espera=None):
+    """
+    Envía peticiones al servicio y devuelve las respuestas a medida que llegan.
+
+    :param peticiones: Iterable de peticiones (diccionarios con 'id' y 'datos'; ver el módulo).
+    :param direccion: Dirección del servicio (ver 'interpretar_direccion').
+    :param tiempo_espera: Segundos máximos de espera por cada respuesta; None espera sin límite.
+    :return: Generador de respuestas en el orden en que terminan.
+    :raises OSError: Si no se puede conectar con el servicio.
+    """
+    tipo, destino = interpretar_direccion(direccion)
+    familia = socket.AF_UNIX if tipo == "unix" else socket.AF_INET
+    with socket.socket(familia, socket.SOCK_STREAM) as conexion:
+        conexion.settimeout(tiempo_espera)
+        conexion.connect(destino)
+        for peticion in peticiones:
+            conexion.sendall(json.dumps(convertir_a_json(peticion), ensure_ascii=False).encode("utf-8") + b"\n")
+        # Cerrar la escritura indica al servidor que no habrá más peticiones
+        conexion.shutdown(socket.SHUT_WR)
+        with conexion.makefile("rb") as lector:
+            for linea in lector:
+                yield json.loads(linea)
+
+
+def main(argumentos=None):
+    """
+    Punto de entrada del servicio.
+
+    :param argumentos: Lista de argumentos; por defecto se usan los de sys.argv.
+    :return: Código de salida.
+    """
+    analizador = argparse.ArgumentParser(
+        prog="python -m servidor",
+        description="Servicio local de resolución de modelos lineales y no lineales (JSON Lines)."
+    )
+    analizador.add_argument("--direccion", default=DIRECCION_PREDETERMINADA,
+                            help="'host:puerto' o ruta de un socket Unix")
+    analizador.add_argument("--trabajadores", type=int, default=None,
+                            help="Procesos de trabajo precargados; por defecto, uno por CPU")
+    analizador.add_argument("--cache", type=int, default=1024,
+                            help="Resultados que se conservan en memoria; 0 desactiva la caché")
+    opciones = analizador.parse_args(argumentos)
+
+    servidor = ServidorOptimizacion(opciones.trabajadores, opciones.cache)
+    try:
+        asyncio.run(servidor.servir(
+            opciones.direccion,
+            al_iniciar=lambda: print(f"Servicio escuchando en {opciones.direccion}", file=sys.stderr, flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())